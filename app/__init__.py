@@ -13,6 +13,13 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
     
+    # orjson-backed JSON (stdlib fallback); serializes dates/times as ISO 8601
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    # request.get_json() also decodes application/msgpack bodies
+    from app.utils.msgpack_support import MsgpackRequest
+    app.request_class = MsgpackRequest
+    
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
@@ -30,7 +37,7 @@ def create_app(config_name=None):
     })
     
     # Register blueprints
-    from app.api import auth_bp, users_bp, profile_bp, media_bp, meetings_bp, departments_bp
+    from app.api import auth_bp, users_bp, profile_bp, media_bp, meetings_bp, departments_bp, uploads_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(users_bp)
@@ -38,6 +45,19 @@ def create_app(config_name=None):
     app.register_blueprint(media_bp)
     app.register_blueprint(meetings_bp)
     app.register_blueprint(departments_bp)
+    app.register_blueprint(uploads_bp)
+    
+    # gzip/brotli response compression
+    from app.utils.compression import init_compression
+    init_compression(app)
+    
+    # Drop cached reference data when it is written
+    from app.services.reference_cache import ReferenceCache
+    ReferenceCache.init_app(app)
+    
+    # Delete released media only once the releasing transaction commits
+    from app.services.file_service import FileService
+    FileService.init_app(app)
     
     # Register error handlers
     from app.utils.error_handlers import register_error_handlers
@@ -47,6 +67,54 @@ def create_app(config_name=None):
     os.makedirs(app.config['PROFILE_PICS_FOLDER'], exist_ok=True)
     os.makedirs(app.config['AGENDAS_FOLDER'], exist_ok=True)
     
+    # CLI: process the calendar sync queue without a Celery worker
+    @app.cli.command("calendar-sync")
+    def calendar_sync_command():
+        """Process pending Google Calendar sync jobs."""
+        from app.services.calendar_sync_service import CalendarSyncService
+
+        stats = CalendarSyncService.process_pending()
+        print(f"Processed {stats['processed']} job(s): {stats['succeeded']} succeeded, {stats['failed']} failed")
+
+    @app.cli.command("calendar-reconcile")
+    def calendar_reconcile_command():
+        """Detect and repair drift between meetings and Google Calendar."""
+        from app.services.calendar_sync_service import CalendarSyncService
+
+        stats = CalendarSyncService.reconcile()
+        print(
+            f"Checked {stats['events']} changed event(s): {stats['stale']} stale, "
+            f"{stats['missing']} missing, {stats['orphaned']} orphaned, {stats['unsynced']} unsynced"
+        )
+
+    @app.cli.command("index-agendas")
+    def index_agendas_command():
+        """Extract previews and search text for agendas uploaded before indexing existed."""
+        from app.models import AgendaText, Meeting
+        from app.services.file_service import FileService
+
+        paths = [
+            path for (path,) in db.session.query(Meeting.agenda)
+            .outerjoin(AgendaText, AgendaText.path == Meeting.agenda)
+            .filter(Meeting.agenda.isnot(None), AgendaText.id.is_(None))
+            .distinct()
+        ]
+        futures = [f for f in (FileService.process_agenda(path) for path in paths) if f]
+        for future in futures:
+            future.exception()  # Wait; failures are logged by the finishing thread
+        print(f"Indexed {len(paths)} agenda(s)")
+
+    @app.cli.command("media-gc")
+    def media_gc_command():
+        """Quarantine unreferenced media files and purge expired quarantine."""
+        from app.services.media_gc_service import MediaGCService
+
+        stats = MediaGCService.run()
+        print(
+            f"Scanned {stats['scanned']} file(s): {stats['quarantined']} quarantined, "
+            f"{stats['purged']} purged, {stats['restored']} restored"
+        )
+
     # Shell context for flask shell command
     @app.shell_context_processor
     def make_shell_context():
@@ -55,6 +123,11 @@ def create_app(config_name=None):
             User,
             UserProfile,
             Meeting,
+            CalendarSyncJob,
+            CalendarSyncState,
+            StoredFile,
+            AgendaText,
+            UploadSession,
             Faculty,
             AcademicDepartment,
             AdminCategory,
@@ -66,6 +139,11 @@ def create_app(config_name=None):
             "User": User,
             "UserProfile": UserProfile,
             "Meeting": Meeting,
+            "CalendarSyncJob": CalendarSyncJob,
+            "CalendarSyncState": CalendarSyncState,
+            "StoredFile": StoredFile,
+            "AgendaText": AgendaText,
+            "UploadSession": UploadSession,
             "Faculty": Faculty,
             "AcademicDepartment": AcademicDepartment,
             "AdminCategory": AdminCategory,
@@ -6,6 +6,7 @@ from .profile import profile_bp
 from .media import media_bp
 from .meetings import meetings_bp
 from .departments import departments_bp
+from .uploads import uploads_bp
 
 __all__ = [
     "auth_bp",
@@ -14,5 +15,6 @@ __all__ = [
     "media_bp",
     "meetings_bp",
     "departments_bp",
+    "uploads_bp",
 ]
 
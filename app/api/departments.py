@@ -1,5 +1,6 @@
 # app/api/departments.py
 from flask import Blueprint, request
+from sqlalchemy.orm import contains_eager, joinedload
 from app.models.department import (
     Faculty,
     AcademicDepartment,
@@ -7,59 +8,166 @@ from app.models.department import (
     AdministrativeDepartment,
     Title
 )
-from app.utils.decorators import jwt_required_with_user
-from app.utils.response import success_response
+from app.services.department_service import DepartmentService
+from app.services.reference_cache import ReferenceCache
+from app.utils.decorators import jwt_required_active, jwt_required_with_user
+from app.utils.response import success_response, error_response, keyset_response
 
 departments_bp = Blueprint('departments', __name__, url_prefix='/api/departments')
 
+# Reference data is the same for every user, so these routes only check
+# that the token's user is still active (one primary-key lookup) and answer
+# from ReferenceCache: a repeat request with If-None-Match gets a 304
+# without any other query while the entry is cached.
+
 @departments_bp.route('/faculties', methods=['GET'])
-@jwt_required_with_user
+@jwt_required_active
 def list_faculties():
     """List all faculties"""
-    faculties = Faculty.query.all()
-    return success_response([faculty.to_dict() for faculty in faculties])
+    def build():
+        return [faculty.to_dict() for faculty in Faculty.query.order_by(Faculty.id)]
+    
+    return ReferenceCache.response('faculties', build)
 
 
 @departments_bp.route('/academic-departments', methods=['GET'])
-@jwt_required_with_user
+@jwt_required_active
 def list_academic_departments():
     """List all academic departments"""
     faculty_id = request.args.get('faculty_id', type=int)
     
-    query = AcademicDepartment.query
-    if faculty_id:
-        query = query.filter_by(faculty_id=faculty_id)
+    def build():
+        query = AcademicDepartment.query.options(joinedload(AcademicDepartment.faculty))
+        if faculty_id:
+            query = query.filter_by(faculty_id=faculty_id)
+        return [dept.to_dict() for dept in query.order_by(AcademicDepartment.id)]
     
-    departments = query.all()
-    return success_response([dept.to_dict() for dept in departments])
+    return ReferenceCache.response(f'academic_departments:{faculty_id or ""}', build)
 
 
 @departments_bp.route('/admin-categories', methods=['GET'])
-@jwt_required_with_user
+@jwt_required_active
 def list_admin_categories():
     """List all admin categories"""
-    categories = AdminCategory.query.all()
-    return success_response([cat.to_dict() for cat in categories])
+    def build():
+        return [cat.to_dict() for cat in AdminCategory.query.order_by(AdminCategory.id)]
+    
+    return ReferenceCache.response('admin_categories', build)
 
 
 @departments_bp.route('/administrative-departments', methods=['GET'])
-@jwt_required_with_user
+@jwt_required_active
 def list_administrative_departments():
     """List all administrative departments"""
     category_id = request.args.get('category_id', type=int)
     
-    query = AdministrativeDepartment.query
-    if category_id:
-        query = query.filter_by(category_id=category_id)
+    def build():
+        query = AdministrativeDepartment.query.options(joinedload(AdministrativeDepartment.category))
+        if category_id:
+            query = query.filter_by(category_id=category_id)
+        return [dept.to_dict() for dept in query.order_by(AdministrativeDepartment.id)]
     
-    departments = query.all()
-    return success_response([dept.to_dict() for dept in departments])
+    return ReferenceCache.response(f'administrative_departments:{category_id or ""}', build)
 
 
 @departments_bp.route('/titles', methods=['GET'])
-@jwt_required_with_user
+@jwt_required_active
 def list_titles():
     """List all titles"""
-    titles = Title.query.all()
-    return success_response([title.to_dict() for title in titles])
+    def build():
+        return [title.to_dict() for title in Title.query.order_by(Title.id)]
+    
+    return ReferenceCache.response('titles', build)
+
+
+@departments_bp.route('/bootstrap', methods=['GET'])
+@jwt_required_active
+def bootstrap():
+    """
+    All reference data in one response, for client startup
+    
+    Response:
+        {
+            "faculties": [{id, name, departments: [...], department_count}],
+            "admin_categories": [{id, name, departments: [...], department_count}],
+            "titles": [{id, name}]
+        }
+    """
+    def build():
+        # One joined query per tree, plus titles
+        faculties = (
+            Faculty.query
+            .outerjoin(Faculty.departments)
+            .options(contains_eager(Faculty.departments))
+            .order_by(Faculty.id, AcademicDepartment.id)
+            .populate_existing()
+        )
+        categories = (
+            AdminCategory.query
+            .outerjoin(AdminCategory.departments)
+            .options(contains_eager(AdminCategory.departments))
+            .order_by(AdminCategory.id, AdministrativeDepartment.id)
+            .populate_existing()
+        )
+        return {
+            'faculties': [f.to_dict(include_departments=True) for f in faculties.all()],
+            'admin_categories': [c.to_dict(include_departments=True) for c in categories.all()],
+            'titles': [title.to_dict() for title in Title.query.order_by(Title.id)],
+        }
+    
+    return ReferenceCache.response('bootstrap', build)
+
 
+@departments_bp.route('/<kind>/member-counts', methods=['GET'])
+@jwt_required_with_user
+def department_member_counts(kind):
+    """
+    Number of members per department
+    
+    URL: /api/departments/academic/member-counts
+    URL: /api/departments/administrative/member-counts
+    
+    Response:
+        {"<department_id>": <count>, ...}  (departments without members omitted)
+    """
+    try:
+        counts = DepartmentService.member_counts(kind)
+    except ValueError as e:
+        return error_response(str(e), code="INVALID_KIND", status=400)
+    
+    return success_response(counts)
+
+
+@departments_bp.route('/<kind>/<int:department_id>/members', methods=['GET'])
+@jwt_required_with_user
+def list_department_members(kind, department_id):
+    """
+    List the users of an academic or administrative department
+    
+    URL: /api/departments/academic/3/members
+    URL: /api/departments/administrative/1/members
+    
+    Query Parameters:
+        ?per_page=20 (max 100)
+        &after=<next_cursor from the previous page>
+    """
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    after = request.args.get('after', 0, type=int)
+    
+    try:
+        department = DepartmentService.get_department(kind, department_id)
+    except ValueError as e:
+        return error_response(str(e), code="INVALID_KIND", status=400)
+    
+    if not department:
+        return error_response("Department not found", code="NOT_FOUND", status=404)
+    
+    users, next_cursor = DepartmentService.members_page(kind, department_id, after=after, per_page=per_page)
+    total = DepartmentService.member_counts(kind, [department_id]).get(department_id, 0)
+    
+    return keyset_response(
+        items=[user.to_dict() for user in users],
+        per_page=per_page,
+        next_cursor=next_cursor,
+        total=total
+    )
@@ -1,28 +1,190 @@
 # app/api/media.py
-from flask import Blueprint, send_from_directory, abort, current_app
+from flask import Blueprint, send_file, send_from_directory, abort, current_app, redirect, request
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+from app.services.file_service import FileService
+from app.services.storage import CHUNK_SIZE, get_storage
 from app.utils.decorators import jwt_required_with_user
+from app.utils.response import error_response
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import mimetypes
 import os
+import re
+import time
 
 media_bp = Blueprint('media', __name__, url_prefix='/media')
 
-@media_bp.route('/<path:filepath>')
-@jwt_required_with_user
-def serve_media(filepath):
+# Files named by content hash or random hex never change once written
+IMMUTABLE_NAME_RE = re.compile(r'^[0-9a-f]{32,64}(_[a-z0-9]+)?\.[a-z0-9]+$')
+
+
+def _signed_max_age(expires_at):
+    """Seconds a signed URL stays valid (0 once expired)"""
+    return max(0, expires_at - int(time.time()))
+
+
+def _shareable(filepath, expires_at):
     """
-    Serve uploaded files with authentication
-    
-    URL: /media/profile_pics/abc123.jpg
-    URL: /media/agendas/agenda_42_def456.pdf
-    
-    Security:
-        - Requires authentication
-        - Prevents directory traversal
-        - Only serves from allowed directories
+    Whether shared caches (proxies, CDNs) may store the response
+
+    Only signed profile pictures: agendas are private meeting documents
+    and stay in the requesting browser's cache, signed or not.
+    """
+    return expires_at is not None and filepath.startswith('profile_pics/')
+
+
+def _apply_cache_headers(response, filename, expires_at=None, shared=False):
+    """
+    Long-lived caching for immutable names, revalidation for the rest
+
+    Signed URLs (expires_at set) are never cached past the signature's
+    expiry; shared marks the response public (see _shareable).
+    """
+    if IMMUTABLE_NAME_RE.match(filename):
+        response.cache_control.no_cache = None  # send_file defaults to no-cache
+        if expires_at is None:
+            response.cache_control.max_age = current_app.config['MEDIA_IMMUTABLE_MAX_AGE']
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.max_age = min(
+                _signed_max_age(expires_at), current_app.config['MEDIA_IMMUTABLE_MAX_AGE']
+            )
+    else:
+        response.cache_control.no_cache = True
+    response.cache_control.public = shared
+    response.cache_control.private = not shared
+    return response
+
+
+def _accel_redirect(directory, filename, filepath):
+    """
+    Let the front proxy (nginx X-Accel-Redirect) stream the file
+
+    Python only authorizes and answers conditional requests; the proxy
+    serves the body and handles Range requests itself.
+    """
+    full_path = safe_join(directory, filename)
+    if full_path is None:
+        abort(404, description="File not found")
+
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        abort(404, description="File not found")
+
+    response = current_app.response_class(
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    )
+    response.headers['X-Accel-Redirect'] = current_app.config['MEDIA_ACCEL_REDIRECT_PREFIX'].rstrip('/') + '/' + filepath
+    response.last_modified = int(stat.st_mtime)
+    response.set_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    return response.make_conditional(request)
+
+
+def _send_resized(filepath, raw_width):
+    """Send a profile picture scaled to ?w=, from the resize cache"""
+    try:
+        width = int(raw_width)
+    except ValueError:
+        width = 0
+    if not 0 < width <= current_app.config['IMAGE_RESIZE_MAX_WIDTH']:
+        abort(400, description=f"w must be between 1 and {current_app.config['IMAGE_RESIZE_MAX_WIDTH']}")
+
+    try:
+        path = FileService.get_resized_image(filepath, width)
+    except ValueError as e:
+        abort(422, description=str(e))
+    except FuturesTimeoutError:
+        abort(503, description="Image is still being resized, retry shortly")
+
+    if path is None:
+        abort(404, description="File not found")
+
+    if current_app.config['MEDIA_ACCEL_REDIRECT_PREFIX']:
+        relative = os.path.relpath(path, current_app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+        return _accel_redirect(os.path.dirname(path), os.path.basename(path), relative)
+
+    return send_file(path, conditional=True, etag=True)
+
+
+def _stream_remote(storage, filepath):
+    """
+    Stream a stored file straight from the backend
+
+    Conditional requests are answered from its metadata alone; the body
+    is relayed chunk by chunk, so the first bytes go out before the whole
+    file has been fetched and nothing is written to disk.
+    """
+    stored = storage.stat(filepath)
+    if stored is None:
+        abort(404, description="File not found")
+
+    response = current_app.response_class(
+        mimetype=mimetypes.guess_type(filepath)[0] or 'application/octet-stream'
+    )
+    response.last_modified = int(stored.modified)
+    response.set_etag(f"{int(stored.modified * 1e9):x}-{stored.size:x}")
+    response = response.make_conditional(request)
+    if response.status_code == 304:
+        return response
+
+    try:
+        body = storage.open(filepath)
+    except FileNotFoundError:
+        abort(404, description="File not found")
+
+    response.response = wrap_file(request.environ, body, CHUNK_SIZE)
+    response.content_length = stored.size
+    # Already-compressed media: keep the compression hook away from the stream
+    response.direct_passthrough = True
+    return response
+
+
+def _send_remote(storage, filepath, expires_at=None):
+    """
+    Send a file kept in remote storage
+
+    Redirects to a presigned bucket URL (S3_PRESIGNED_DOWNLOADS) so the
+    bytes never pass through the app. Otherwise sends the copy from the
+    local read-through cache when there is one, and streams the object
+    from the bucket when there isn't (range requests fill the cache first).
+    """
+    if current_app.config['S3_PRESIGNED_DOWNLOADS']:
+        ttl = current_app.config['MEDIA_URL_TTL']
+        url = storage.presigned_url(filepath, ttl)
+        if url:
+            response = redirect(url)
+            # Cache the redirect for less time than the presigned URL (and
+            # our own signed URL) lives
+            max_age = ttl // 2
+            if expires_at is not None:
+                max_age = min(max_age, _signed_max_age(expires_at))
+            shared = _shareable(filepath, expires_at)
+            response.cache_control.max_age = max_age
+            response.cache_control.public = shared
+            response.cache_control.private = not shared
+            return response
+
+    path = storage.cached_path(filepath)
+    if path is None:
+        if request.range is None:
+            return _stream_remote(storage, filepath)
+        path = storage.local_path(filepath)
+    if path is None:
+        abort(404, description="File not found")
+    return send_file(path, conditional=True, etag=True)
+
+
+def _send_media(filepath, expires_at=None):
+    """
+    Resolve a media path to its folder and send it
+
+    expires_at: Expiry of the signed URL the request came with, if any
     """
     # Security: Prevent directory traversal
     if '..' in filepath or filepath.startswith('/'):
         abort(400, description="Invalid file path")
-    
+
     # Determine subfolder and filename
     if filepath.startswith('profile_pics/'):
         directory = current_app.config['PROFILE_PICS_FOLDER']
@@ -32,12 +194,62 @@ def serve_media(filepath):
         filename = filepath.replace('agendas/', '')
     else:
         abort(404, description="File not found")
-    
-    # Check if file exists
-    full_path = os.path.join(directory, filename)
-    if not os.path.exists(full_path):
-        abort(404, description="File not found")
-    
-    # Serve file
-    return send_from_directory(directory, filename)
 
+    storage = get_storage()
+    if 'w' in request.args and filepath.startswith('profile_pics/'):
+        response = _send_resized(filepath, request.args['w'])
+    elif not storage.is_local:
+        response = _send_remote(storage, filepath, expires_at=expires_at)
+        if response.status_code in (301, 302, 303, 307, 308):
+            return response
+    elif current_app.config['MEDIA_ACCEL_REDIRECT_PREFIX']:
+        response = _accel_redirect(directory, filename, filepath)
+    else:
+        # Serve file (404s if missing; handles If-None-Match, If-Modified-Since and Range)
+        response = send_from_directory(directory, filename, conditional=True, etag=True)
+
+    return _apply_cache_headers(
+        response, filename, expires_at=expires_at, shared=_shareable(filepath, expires_at)
+    )
+
+
+@jwt_required_with_user
+def _serve_authenticated(filepath):
+    return _send_media(filepath)
+
+
+@media_bp.route('/<path:filepath>')
+def serve_media(filepath):
+    """
+    Serve uploaded files
+
+    URL: /media/profile_pics/abc123.jpg?expires=<ts>&sig=<hmac>
+    URL: /media/profile_pics/abc123.jpg?w=128  (resized on demand, cached on disk)
+    URL: /media/agendas/<sha256>.pdf  (with Authorization header)
+
+    Security:
+        - Signed URLs (from FileService.get_file_url) are checked
+          statelessly: no JWT and no database access
+        - The signature covers the path and expiry only: any ?w= width up
+          to IMAGE_RESIZE_MAX_WIDTH may be requested with the same URL
+        - Unsigned requests require authentication
+        - Prevents directory traversal
+        - Only serves from allowed directories
+
+    Caching:
+        - ETag / Last-Modified with 304 responses
+        - Byte-range requests (206) for large PDFs
+        - Long-lived Cache-Control for immutable (hex-named) files, private;
+          signed URLs are only cacheable until they expire, and only signed
+          profile pictures are public (agendas stay private)
+        - Optional offload to the proxy via X-Sendfile (USE_X_SENDFILE) or
+          X-Accel-Redirect (MEDIA_ACCEL_REDIRECT_PREFIX)
+        - With STORAGE_BACKEND=s3, a redirect to a presigned bucket URL
+          (or the local read-through cache when S3_PRESIGNED_DOWNLOADS is off)
+    """
+    if 'sig' in request.args:
+        if not FileService.verify_media_signature(filepath, request.args.get('expires'), request.args['sig']):
+            return error_response("Invalid or expired media URL", code="INVALID_MEDIA_SIGNATURE", status=403)
+        return _send_media(filepath, expires_at=int(request.args['expires']))
+
+    return _serve_authenticated(filepath)
@@ -1,13 +1,17 @@
 # app/api/meetings.py
-from flask import Blueprint, request, g
+from flask import Blueprint, current_app, request, g
+from app.models.calendar_sync import CalendarSyncJob
 from app.models.meeting import Meeting
 from app.models.user import User
 from app.extensions import db
 from app.utils.decorators import jwt_required_with_user, role_required
-from app.utils.response import success_response, error_response, paginated_response, created_response
+from app.utils.response import success_response, error_response, paginated_response, created_response, streaming_paginated_response
 from app.services.meeting_service import MeetingService
+from app.services.calendar_sync_service import CalendarSyncService
+from app.services.agenda_search_service import AgendaSearchService
 from datetime import datetime, date
 from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
 
 meetings_bp = Blueprint('meetings', __name__, url_prefix='/api/meetings')
 
@@ -21,6 +25,7 @@ def list_meetings():
         ?page=1
         &per_page=20
         &search=board
+        &search_agenda=budget review
         &date_from=2024-01-01
         &date_to=2024-12-31
         &attendee_id=5
@@ -31,6 +36,7 @@ def list_meetings():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     search = request.args.get('search', '')
+    search_agenda = request.args.get('search_agenda', '')
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
     attendee_id = request.args.get('attendee_id', type=int)
@@ -44,6 +50,10 @@ def list_meetings():
     if search:
         query = query.filter(Meeting.title.ilike(f'%{search}%'))
     
+    # Full-text search in agenda contents
+    if search_agenda:
+        query = AgendaSearchService.filter_meetings(query, search_agenda)
+    
     # Date filters
     if date_from:
         try:
@@ -72,6 +82,17 @@ def list_meetings():
     
     # Sorting
     query = query.order_by(Meeting.date.desc(), Meeting.time.desc())
+    query = query.options(selectinload(Meeting.attendees).selectinload(User.profile))
+    
+    # Large pages (exports) are streamed from the cursor
+    if per_page >= current_app.config['STREAM_PER_PAGE_THRESHOLD']:
+        return streaming_paginated_response(
+            query,
+            lambda meeting: meeting.to_dict(),
+            page=page,
+            per_page=per_page,
+            total=query.order_by(None).count()
+        )
     
     # Paginate
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -108,6 +129,7 @@ def create_meeting():
         time: "14:00"
         attendee_ids: [1, 3, 5]
         agenda: <file>
+        agenda_upload_id: <id of a completed /api/uploads session> (instead of agenda)
     """
     # Get form data
     title = request.form.get('title')
@@ -154,7 +176,9 @@ def create_meeting():
         'title': title,
         'date': meeting_date,
         'time': meeting_time,
-        'attendee_ids': attendee_ids
+        'attendee_ids': attendee_ids,
+        'agenda_upload_id': request.form.get('agenda_upload_id'),
+        'uploaded_by': g.current_user.id
     }
     
     # Create meeting using service
@@ -183,6 +207,7 @@ def update_meeting(meeting_id):
         time: "15:00"
         attendee_ids: [1, 2, 3, 5]
         agenda: <file> (optional)
+        agenda_upload_id: <id of a completed /api/uploads session> (optional)
     """
     meeting = Meeting.query.get(meeting_id)
     
@@ -222,6 +247,10 @@ def update_meeting(meeting_id):
         except ValueError:
             return error_response("Invalid attendee IDs", status=400)
     
+    if request.form.get('agenda_upload_id'):
+        data['agenda_upload_id'] = request.form['agenda_upload_id']
+        data['uploaded_by'] = g.current_user.id
+    
     # Update meeting using service
     try:
         updated_meeting = MeetingService.update_meeting(meeting_id, data, request.files)
@@ -322,6 +351,7 @@ def add_attendees(meeting_id):
         if user not in meeting.attendees:
             meeting.attendees.append(user)
     
+    CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
     db.session.commit()
     
     return success_response(
@@ -346,6 +376,7 @@ def remove_attendee(meeting_id, user_id):
     
     if user in meeting.attendees:
         meeting.attendees.remove(user)
+        CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
         db.session.commit()
         return success_response(message="Attendee removed from meeting")
     else:
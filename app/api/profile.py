@@ -1,5 +1,5 @@
 # app/api/profile.py
-from flask import Blueprint, request, g, url_for
+from flask import Blueprint, request, g
 from app.utils.decorators import jwt_required_with_user
 from app.utils.response import success_response, error_response
 from app.services.file_service import FileService
@@ -75,25 +75,34 @@ def upload_profile_picture():
     
     file = request.files['profile_picture']
     
-    # Delete old picture if exists
-    if user.profile.profile_picture:
-        FileService.delete_file(user.profile.profile_picture)
+    old_picture = user.profile.profile_picture
+    old_variants = user.profile.profile_picture_variants
     
-    # Save new picture
+    # Save new picture (original only; variants are rendered in the background)
     relative_path, error = FileService.save_profile_picture(file, user.id)
     
     if error:
         return error_response(error, status=400)
     
     user.profile.profile_picture = relative_path
+    user.profile.profile_picture_variants = None
     db.session.commit()
     
+    # Delete old picture if exists
+    if old_picture:
+        FileService.delete_profile_picture_files(old_picture, old_variants)
+        db.session.commit()
+    
+    future = FileService.process_profile_picture(user.id, relative_path)
+    
     # Return URL
-    picture_url = url_for('media.serve_media', filepath=relative_path, _external=True)
+    picture_url = FileService.get_file_url(user.profile.profile_picture)
     
     return success_response({
         'profile_picture': picture_url,
-        'relative_path': relative_path
+        'relative_path': user.profile.profile_picture,
+        'variants': user.profile.profile_picture_variants,
+        'processing': future is not None
     }, "Profile picture uploaded successfully")
 
 
@@ -106,10 +115,14 @@ def delete_profile_picture():
     if not user.profile.profile_picture:
         return error_response("No profile picture to delete", status=400)
     
-    # Delete file
-    FileService.delete_file(user.profile.profile_picture)
+    # Delete file and its variants
+    FileService.delete_profile_picture_files(
+        user.profile.profile_picture,
+        user.profile.profile_picture_variants
+    )
     
     user.profile.profile_picture = None
+    user.profile.profile_picture_variants = None
     db.session.commit()
     
     return success_response(message="Profile picture deleted successfully")
@@ -0,0 +1,117 @@
+# app/api/uploads.py
+from flask import Blueprint, request, g, current_app
+from app.utils.decorators import role_required
+from app.utils.response import success_response, error_response, created_response
+from app.services.upload_service import UploadService, UploadConflict
+
+uploads_bp = Blueprint('uploads', __name__, url_prefix='/api/uploads')
+
+
+@uploads_bp.route('', methods=['POST'])
+@role_required('admin', 'dean', 'secretary')
+def create_upload():
+    """
+    Start a resumable chunked upload
+    
+    Request Body:
+        {
+            "filename": "agenda.pdf",
+            "size": 10485760,
+            "purpose": "agenda"
+        }
+    
+    Then PUT chunks to /api/uploads/<upload_id>?offset=<n> and
+    POST /api/uploads/<upload_id>/complete. Pass the upload_id as
+    agenda_upload_id when creating or updating a meeting.
+    """
+    data = request.get_json() or {}
+    
+    try:
+        size = int(data.get('size', 0))
+    except (TypeError, ValueError):
+        return error_response("size must be an integer", status=400)
+    
+    try:
+        session = UploadService.create_session(
+            g.current_user.id,
+            data.get('filename', ''),
+            size,
+            data.get('purpose', 'agenda')
+        )
+    except ValueError as e:
+        return error_response(str(e), status=400)
+    
+    payload = session.to_dict()
+    payload['chunk_size'] = current_app.config['UPLOAD_CHUNK_SIZE']
+    return created_response(payload, "Upload started")
+
+
+@uploads_bp.route('/<upload_id>', methods=['GET'])
+@role_required('admin', 'dean', 'secretary')
+def get_upload(upload_id):
+    """Upload status; offset is where the next chunk must start"""
+    session = UploadService.get_session(upload_id, g.current_user.id)
+    if not session:
+        return error_response("Upload not found", status=404)
+    return success_response(session.to_dict())
+
+
+@uploads_bp.route('/<upload_id>', methods=['PUT', 'PATCH'])
+@role_required('admin', 'dean', 'secretary')
+def append_upload(upload_id):
+    """
+    Append a chunk
+    
+    Query Parameters:
+        ?offset=<bytes already uploaded>
+    
+    Request: raw bytes (application/octet-stream)
+    
+    A mismatched offset returns 409 with the server's offset to resume from.
+    """
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return error_response("offset query parameter is required", status=400)
+    
+    session = UploadService.get_session(upload_id, g.current_user.id, for_update=True)
+    if not session:
+        return error_response("Upload not found", status=404)
+    
+    try:
+        session = UploadService.append_chunk(session, offset, request.stream)
+    except UploadConflict as e:
+        response, status = error_response(str(e), code="OFFSET_MISMATCH", status=409)
+        response.headers['Upload-Offset'] = str(e.offset)
+        return response, status
+    except ValueError as e:
+        return error_response(str(e), status=400)
+    
+    return success_response(session.to_dict())
+
+
+@uploads_bp.route('/<upload_id>/complete', methods=['POST'])
+@role_required('admin', 'dean', 'secretary')
+def complete_upload(upload_id):
+    """Validate the assembled file so it can be attached by upload_id"""
+    session = UploadService.get_session(upload_id, g.current_user.id, for_update=True)
+    if not session:
+        return error_response("Upload not found", status=404)
+    
+    try:
+        session = UploadService.complete(session)
+    except ValueError as e:
+        return error_response(str(e), status=400)
+    
+    return success_response(session.to_dict(), "Upload complete")
+
+
+@uploads_bp.route('/<upload_id>', methods=['DELETE'])
+@role_required('admin', 'dean', 'secretary')
+def cancel_upload(upload_id):
+    """Abort an upload and delete its data"""
+    session = UploadService.get_session(upload_id, g.current_user.id)
+    if not session:
+        return error_response("Upload not found", status=404)
+    
+    UploadService.discard(session)
+    return success_response(message="Upload cancelled")
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-from flask import Blueprint, request, g
+from flask import Blueprint, current_app, request, g
 from sqlalchemy import or_
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 
 from app.extensions import db
+from app.models.department import AcademicDepartment, AdministrativeDepartment
 from app.models.user import User, UserProfile
+from app.services.file_service import FileService
 from app.utils.decorators import jwt_required_with_user, admin_required
 from app.utils.response import (
     success_response,
     error_response,
     paginated_response,
     created_response,
+    streaming_paginated_response,
 )
 
 users_bp = Blueprint("users", __name__, url_prefix="/api/users")
@@ -32,7 +36,13 @@ def list_users():
     order = request.args.get("order", "asc")
 
     # Build query
-    query = User.query.join(UserProfile)
+    query = User.query.join(UserProfile).options(
+        contains_eager(User.profile).options(
+            selectinload(UserProfile.titles),
+            joinedload(UserProfile.academic_department).joinedload(AcademicDepartment.faculty),
+            joinedload(UserProfile.administrative_department).joinedload(AdministrativeDepartment.category),
+        ),
+    )
 
     # Apply filters
     if search:
@@ -58,6 +68,16 @@ def list_users():
     else:
         query = query.order_by(sort_column.asc())
 
+    # Large pages (exports) are streamed from the cursor
+    if per_page >= current_app.config["STREAM_PER_PAGE_THRESHOLD"]:
+        return streaming_paginated_response(
+            query,
+            lambda user: user.to_dict(),
+            page=page,
+            per_page=per_page,
+            total=query.order_by(None).count(),
+        )
+
     # Paginate
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
@@ -214,9 +234,18 @@ def delete_user(user_id: int):
     if not user:
         return error_response("User not found", status=404)
 
+    profile = user.profile
+    picture = profile.profile_picture if profile else None
+    variants = profile.profile_picture_variants if profile else None
+
     db.session.delete(user)
     db.session.commit()
 
+    # Files go once the row is gone; anything left behind is swept by the media GC
+    if picture:
+        FileService.delete_profile_picture_files(picture, variants)
+        db.session.commit()
+
     return success_response(message="User deleted successfully")
 
 
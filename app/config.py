@@ -43,10 +43,64 @@ class Config:
     ALLOWED_AGENDA_EXTENSIONS = {'pdf'}
     MAX_PROFILE_PIC_SIZE = 5 * 1024 * 1024  # 5 MB
     MAX_AGENDA_SIZE = 10 * 1024 * 1024  # 10 MB
+    UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', 86400))  # seconds since last chunk
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 1024 * 1024))  # Suggested to clients
+    
+    # Image Processing
+    IMAGE_PROCESS_WORKERS = int(os.getenv('IMAGE_PROCESS_WORKERS', 2))  # 0 = process inline
+    PROFILE_PICTURE_SIZES = (64, 256, 800)  # Max edge in px; WebP + JPEG each
+    MAX_IMAGE_PIXELS = int(os.getenv('MAX_IMAGE_PIXELS', 50_000_000))  # Decompression-bomb limit
+    IMAGE_RESIZE_MAX_WIDTH = int(os.getenv('IMAGE_RESIZE_MAX_WIDTH', 1024))  # Largest ?w= accepted
+    IMAGE_RESIZE_TIMEOUT = int(os.getenv('IMAGE_RESIZE_TIMEOUT', 30))  # seconds
+    AGENDA_PREVIEW_WIDTH = int(os.getenv('AGENDA_PREVIEW_WIDTH', 320))  # px, first-page agenda preview
+    AGENDA_TEXT_MAX_CHARS = int(os.getenv('AGENDA_TEXT_MAX_CHARS', 200_000))  # Indexed for search_agenda
+    AGENDA_INDEX_WARMUP = os.getenv('AGENDA_INDEX_WARMUP', 'True') == 'True'  # Build the in-process search index at server start
+    IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # 256 MB, LRU-evicted
     
     # Directories
     PROFILE_PICS_FOLDER = os.path.join(UPLOAD_FOLDER, 'profile_pics')
     AGENDAS_FOLDER = os.path.join(UPLOAD_FOLDER, 'agendas')
+    IMAGE_CACHE_FOLDER = os.path.join(UPLOAD_FOLDER, 'cache')
+    UPLOAD_SESSIONS_FOLDER = os.path.join(UPLOAD_FOLDER, 'uploads')
+
+    # Media Serving
+    MEDIA_IMMUTABLE_MAX_AGE = int(os.getenv('MEDIA_IMMUTABLE_MAX_AGE', 31536000))  # seconds, hex-named files
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'False') == 'True'  # Apache/lighttpd mod_xsendfile
+    MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX')  # nginx internal location, e.g. /protected-media
+    MEDIA_URL_SECRET = os.getenv('MEDIA_URL_SECRET')  # HMAC key for signed media URLs; defaults to SECRET_KEY
+    MEDIA_URL_TTL = int(os.getenv('MEDIA_URL_TTL', 86400))  # seconds; URLs stay stable within a TTL window
+
+    # Storage
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')  # local (UPLOAD_FOLDER) | s3
+    S3_BUCKET = os.getenv('S3_BUCKET')
+    S3_KEY_PREFIX = os.getenv('S3_KEY_PREFIX', '')  # e.g. "media/"
+    S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')  # MinIO / local stand-in; unset for AWS
+    S3_REGION = os.getenv('S3_REGION')
+    S3_ACCESS_KEY_ID = os.getenv('S3_ACCESS_KEY_ID')  # Falls back to the default AWS credential chain
+    S3_SECRET_ACCESS_KEY = os.getenv('S3_SECRET_ACCESS_KEY')
+    S3_PRESIGNED_DOWNLOADS = os.getenv('S3_PRESIGNED_DOWNLOADS', 'True') == 'True'  # Redirect /media to the bucket
+    STORAGE_CACHE_FOLDER = os.getenv('STORAGE_CACHE_FOLDER', os.path.join(UPLOAD_FOLDER, 'cache', 'storage'))
+    STORAGE_CACHE_MAX_BYTES = int(os.getenv('STORAGE_CACHE_MAX_BYTES', 1024 * 1024 * 1024))  # 1 GB read-through, LRU-evicted
+
+    # Orphaned Media GC
+    MEDIA_GC_INTERVAL = int(os.getenv('MEDIA_GC_INTERVAL', 3600))  # seconds
+    MEDIA_GC_BATCH_SIZE = int(os.getenv('MEDIA_GC_BATCH_SIZE', 500))  # files per reference query
+    MEDIA_GC_MAX_BATCHES = int(os.getenv('MEDIA_GC_MAX_BATCHES', 20))  # per run; resumes from checkpoint
+    MEDIA_GC_GRACE_PERIOD = int(os.getenv('MEDIA_GC_GRACE_PERIOD', 86400))  # seconds; newer files are never swept
+    MEDIA_GC_QUARANTINE_PERIOD = int(os.getenv('MEDIA_GC_QUARANTINE_PERIOD', 7 * 86400))  # seconds before deletion
+    
+    # API Responses
+    JSON_USE_ORJSON = os.getenv('JSON_USE_ORJSON', 'True') == 'True'  # Used when orjson is installed
+    MSGPACK_ENABLED = os.getenv('MSGPACK_ENABLED', 'True') == 'True'  # Accept: application/msgpack, when msgpack is installed
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True') == 'True'  # gzip, or brotli when installed
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes; smaller bodies are sent as-is
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))  # brotli 0-11
+    STREAM_PER_PAGE_THRESHOLD = int(os.getenv('STREAM_PER_PAGE_THRESHOLD', 200))  # Larger pages are streamed
+    COMPRESS_MIMETYPES = {'application/json', 'application/msgpack', 'text/plain', 'text/html', 'text/csv', 'text/calendar'}
+    
+    # Reference Data
+    REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', 300))  # seconds; picks up writes from other processes
     
     # Email (SMTP)
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -56,6 +110,10 @@ class Config:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
+    MAIL_RECIPIENTS_PER_MESSAGE = int(os.getenv('MAIL_RECIPIENTS_PER_MESSAGE', 50))
+    MAIL_USE_BCC = os.getenv('MAIL_USE_BCC', 'True') == 'True'
+    MAIL_SEND_CONCURRENCY = int(os.getenv('MAIL_SEND_CONCURRENCY', 4))
+    MAIL_SEND_RETRIES = int(os.getenv('MAIL_SEND_RETRIES', 2))
     
     # Celery
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
@@ -63,6 +121,15 @@ class Config:
     
     # Google Calendar
     GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_CREDENTIALS_PATH')
+    GOOGLE_CALENDAR_API_ENDPOINT = os.getenv('GOOGLE_CALENDAR_API_ENDPOINT')  # Root URL override (emulators)
+    GOOGLE_CALENDAR_BATCH_SIZE = int(os.getenv('GOOGLE_CALENDAR_BATCH_SIZE', 50))  # API allows up to 1000
+    GOOGLE_CALENDAR_BATCH_RETRIES = int(os.getenv('GOOGLE_CALENDAR_BATCH_RETRIES', 3))
+    CALENDAR_SYNC_INTERVAL = int(os.getenv('CALENDAR_SYNC_INTERVAL', 30))  # seconds
+    CALENDAR_SYNC_BATCH_SIZE = int(os.getenv('CALENDAR_SYNC_BATCH_SIZE', 50))
+    CALENDAR_SYNC_MAX_ATTEMPTS = int(os.getenv('CALENDAR_SYNC_MAX_ATTEMPTS', 8))
+    CALENDAR_SYNC_BACKOFF = int(os.getenv('CALENDAR_SYNC_BACKOFF', 30))  # seconds, doubled per attempt
+    CALENDAR_SYNC_MAX_BACKOFF = int(os.getenv('CALENDAR_SYNC_MAX_BACKOFF', 3600))
+    CALENDAR_RECONCILE_INTERVAL = int(os.getenv('CALENDAR_RECONCILE_INTERVAL', 900))  # seconds
 
 
 class DevelopmentConfig(Config):
@@ -75,6 +142,8 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    IMAGE_PROCESS_WORKERS = 0
+    AGENDA_INDEX_WARMUP = False
 
 
 class ProductionConfig(Config):
@@ -2,6 +2,8 @@
 
 from .user import User, UserProfile, user_titles
 from .meeting import Meeting, meeting_attendees
+from .calendar_sync import CalendarSyncJob, CalendarSyncState
+from .media import StoredFile, AgendaText, UploadSession
 from .department import (
     Title,
     Faculty,
@@ -16,6 +18,11 @@ __all__ = [
     "user_titles",
     "Meeting",
     "meeting_attendees",
+    "CalendarSyncJob",
+    "CalendarSyncState",
+    "StoredFile",
+    "AgendaText",
+    "UploadSession",
     "Title",
     "Faculty",
     "AcademicDepartment",
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class CalendarSyncJob(db.Model):
+    """Pending Google Calendar operation for a meeting"""
+
+    __tablename__ = "calendar_sync_jobs"
+
+    # Action choices
+    ACTION_CREATE = "create"
+    ACTION_UPDATE = "update"
+    ACTION_DELETE = "delete"
+
+    # Status choices
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_FAILED = "failed"
+
+    # Primary Key
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Target (no FK: delete jobs outlive the meeting row)
+    meeting_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    google_event_id: Mapped[Optional[str]] = mapped_column(String(255))
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Queue State
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default=STATUS_PENDING,
+        nullable=False,
+        index=True,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "meeting_id": self.meeting_id,
+            "google_event_id": self.google_event_id,
+            "action": self.action,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+        }
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<CalendarSyncJob {self.id}: {self.action} meeting {self.meeting_id}>"
+
+
+class CalendarSyncState(db.Model):
+    """Incremental sync cursor for a Google calendar"""
+
+    __tablename__ = "calendar_sync_state"
+
+    calendar_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    sync_token: Mapped[Optional[str]] = mapped_column(Text)
+    last_reconciled_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_full_sync_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<CalendarSyncState {self.calendar_id}>"
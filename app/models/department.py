@@ -44,6 +44,7 @@ class Faculty(db.Model):
     departments: Mapped[List["AcademicDepartment"]] = relationship(
         back_populates="faculty",
         cascade="all, delete-orphan",
+        order_by="AcademicDepartment.id",
     )
 
     def to_dict(self, include_departments: bool = False) -> dict:
@@ -108,6 +109,7 @@ class AdminCategory(db.Model):
     departments: Mapped[List["AdministrativeDepartment"]] = relationship(
         back_populates="category",
         cascade="all, delete-orphan",
+        order_by="AdministrativeDepartment.id",
     )
 
     def to_dict(self, include_departments: bool = False) -> dict:
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, BigInteger, DateTime, Text, Index, ForeignKey, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class StoredFile(db.Model):
+    """Content-addressed media file shared by every record that references it"""
+
+    __tablename__ = "stored_files"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    path: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)  # Relative path
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Last reference taken or dropped; the media GC leaves recently used files alone
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "path": self.path,
+            "sha256": self.sha256,
+            "size": self.size,
+            "ref_count": self.ref_count,
+            "created_at": self.created_at,
+            "last_used_at": self.last_used_at,
+        }
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<StoredFile {self.path} refs={self.ref_count}>"
+
+
+class AgendaText(db.Model):
+    """Text extracted from an agenda PDF, one row per stored agenda"""
+
+    __tablename__ = "agenda_texts"
+
+    # Text search configuration for the Postgres index; 'simple' does not
+    # stem, so results match the in-process index used on other databases
+    SEARCH_CONFIG = "simple"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    path: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)  # Agenda relative path
+    content: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    # Timestamps
+    extracted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index(
+            "ix_agenda_texts_content_fts",
+            text(f"to_tsvector('{SEARCH_CONFIG}', content)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        # Never reuse ids: the in-process index tracks rows by id high-water mark
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<AgendaText {self.path}>"
+
+
+class UploadSession(db.Model):
+    """Resumable chunked upload, written to a temp file until it is used"""
+
+    __tablename__ = "upload_sessions"
+
+    # Purposes
+    PURPOSE_AGENDA = "agenda"
+
+    # Status choices
+    STATUS_UPLOADING = "uploading"
+    STATUS_COMPLETE = "complete"  # Validated, waiting to be attached
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # uuid4 hex
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    purpose: Mapped[str] = mapped_column(String(20), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    received: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default=STATUS_UPLOADING, nullable=False)
+
+    # Set on completion
+    sha256: Mapped[Optional[str]] = mapped_column(String(64))
+    page_count: Mapped[Optional[int]] = mapped_column(Integer)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "upload_id": self.id,
+            "purpose": self.purpose,
+            "filename": self.filename,
+            "total_size": self.total_size,
+            "offset": self.received,
+            "status": self.status,
+            "page_count": self.page_count,
+            "expires_at": self.expires_at,
+        }
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<UploadSession {self.id} {self.received}/{self.total_size}>"
@@ -12,6 +12,7 @@ from sqlalchemy import (
     Column,
     Integer,
     ForeignKey,
+    JSON,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,10 +50,27 @@ class Meeting(db.Model):
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     date: Mapped[Optional[date]] = mapped_column(Date)
     time: Mapped[Optional[time]] = mapped_column(Time)
-    agenda: Mapped[Optional[str]] = mapped_column(String(255))  # File path
+    agenda: Mapped[Optional[str]] = mapped_column(String(255), index=True)  # File path
+    # First-page preview image and page count, filled in after upload
+    agenda_preview: Mapped[Optional[str]] = mapped_column(String(255))
+    agenda_page_count: Mapped[Optional[int]] = mapped_column(Integer)
+
+    # Calendar sync status choices
+    SYNC_PENDING = "pending"
+    SYNC_SYNCED = "synced"
+    SYNC_FAILED = "failed"
 
     # External Integration
     google_event_id: Mapped[Optional[str]] = mapped_column(String(255))
+    sync_status: Mapped[Optional[str]] = mapped_column(String(20))
+    # ETag and app-owned fields of the event as last written, used to send
+    # minimal conditional patches
+    google_event_etag: Mapped[Optional[str]] = mapped_column(String(255))
+    google_event_snapshot: Mapped[Optional[dict]] = mapped_column(JSON)
+
+    # Delivery counts of the last notification email of each kind
+    # (invitation, reminder); no addresses, it is shown to every viewer
+    notification_summary: Mapped[Optional[dict]] = mapped_column(JSON)
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
@@ -90,6 +108,13 @@ class Meeting(db.Model):
             return self.date >= date.today()
         return False
 
+    def is_synced(self) -> bool:
+        """Check if the Google Calendar event reflects the latest changes"""
+        if self.sync_status is None:
+            # Rows synced inline before the sync queue existed
+            return bool(self.google_event_id)
+        return self.sync_status == Meeting.SYNC_SYNCED
+
     def get_attendee_emails(self) -> List[str]:
         """Get list of attendee emails"""
         emails: List[str] = []
@@ -107,22 +132,27 @@ class Meeting(db.Model):
 
     def to_dict(self, include_attendees: bool = True) -> dict:
         """Serialize meeting for API responses"""
+        from app.services.file_service import FileService
+
         data = {
             "id": self.id,
             "title": self.title,
-            "date": self.date.isoformat() if self.date else None,
-            "time": self.time.isoformat() if self.time else None,
-            "datetime": self.get_datetime().isoformat()
-            if self.get_datetime()
-            else None,
+            "date": self.date,
+            "time": self.time,
+            "datetime": self.get_datetime(),
             "agenda": self.agenda,
+            "agenda_url": FileService.get_file_url(self.agenda),
             "has_agenda": bool(self.agenda),
+            "agenda_preview_url": FileService.get_file_url(self.agenda_preview),
+            "agenda_page_count": self.agenda_page_count,
             "google_event_id": self.google_event_id,
-            "is_synced": bool(self.google_event_id),
+            "is_synced": self.is_synced(),
+            "sync_status": self.sync_status,
+            "notification_summary": self.notification_summary,
             "is_past": self.is_past(),
             "is_upcoming": self.is_upcoming(),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
         if include_attendees:
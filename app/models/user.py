@@ -5,7 +5,7 @@ from typing import Optional, List
 
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
-from sqlalchemy import String, Boolean, DateTime, Table, Column, Integer, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, Table, Column, Integer, ForeignKey, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -98,8 +98,8 @@ class User(db.Model):
             "is_active": self.is_active,
             "is_staff": self.is_staff,
             "is_superuser": self.is_superuser,
-            "date_joined": self.date_joined.isoformat() if self.date_joined else None,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
+            "date_joined": self.date_joined,
+            "last_login": self.last_login,
         }
         if include_profile and self.profile:
             data["profile"] = self.profile.to_dict(include_user=False)
@@ -157,6 +157,12 @@ class UserProfile(db.Model):
         ForeignKey("administrative_departments.id")
     )
 
+    # (department, id) so member lists and counts are index range scans
+    __table_args__ = (
+        Index("ix_user_profiles_academic_department_id", "academic_department_id", "id"),
+        Index("ix_user_profiles_administrative_department_id", "administrative_department_id", "id"),
+    )
+
     # Profile Fields
     role: Mapped[Optional[str]] = mapped_column(String(50))
     address: Mapped[Optional[str]] = mapped_column(String(255))
@@ -165,6 +171,9 @@ class UserProfile(db.Model):
     profile_picture: Mapped[Optional[str]] = mapped_column(
         String(255)
     )  # Relative path
+    profile_picture_variants: Mapped[Optional[dict]] = mapped_column(
+        JSON
+    )  # {size: {"jpeg": path, "webp": path}}
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="profile")
@@ -210,6 +219,8 @@ class UserProfile(db.Model):
 
     def to_dict(self, include_user: bool = False) -> dict:
         """Serialize profile for API responses"""
+        from app.services.file_service import FileService
+
         data = {
             "id": self.id,
             "role": self.role,
@@ -217,6 +228,9 @@ class UserProfile(db.Model):
             "university": self.university,
             "email": self.email,
             "profile_picture": self.profile_picture,
+            "profile_picture_variants": self.profile_picture_variants,
+            "profile_picture_url": FileService.get_file_url(self.profile_picture),
+            "profile_picture_variant_urls": FileService.get_variant_urls(self.profile_picture_variants),
             "initials": self.get_initials(),
             "academic_department": self.academic_department.to_dict()
             if self.academic_department
@@ -0,0 +1,179 @@
+# app/services/agenda_search_service.py
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from sqlalchemy import bindparam, func, literal_column
+from app.extensions import db
+from app.models.media import AgendaText
+from app.models.meeting import Meeting
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class AgendaIndex:
+    """
+    In-process inverted index over agenda_texts (token -> row ids)
+
+    Used on databases without full-text search. Each search first loads
+    rows added since the last one (by id), so every worker process catches
+    up with uploads from other processes without rebuilding. Rows deleted
+    later stay in the postings; the join with meetings drops them.
+    """
+
+    REFRESH_BATCH = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._last_id = 0
+
+    def refresh(self) -> None:
+        """Index rows inserted since the last refresh"""
+        with self._lock:
+            rows = (
+                db.session.query(AgendaText.id, AgendaText.content)
+                .filter(AgendaText.id > self._last_id)
+                .order_by(AgendaText.id)
+                .yield_per(self.REFRESH_BATCH)
+            )
+            for row_id, content in rows:
+                for token in set(AgendaSearchService.tokenize(content)):
+                    self._postings[token].add(row_id)
+                self._last_id = row_id
+
+    def search(self, terms: List[str]) -> Set[int]:
+        """Ids of texts containing every term"""
+        self.refresh()
+        with self._lock:
+            postings = sorted((self._postings.get(term, set()) for term in set(terms)), key=len)
+            if not postings:
+                return set()
+            result = set(postings[0])
+            for ids in postings[1:]:
+                result &= ids
+                if not result:
+                    break
+            return result
+
+
+# Per-process index, built by start_warm_up (or on first search)
+_index: Optional[AgendaIndex] = None
+_index_lock = threading.Lock()
+_warm_up_app = None  # App to warm up again in forked request workers (post_fork)
+
+
+class AgendaSearchService:
+    """Full-text search over extracted agenda text"""
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercased word tokens, matching Postgres' 'simple' configuration"""
+        return TOKEN_RE.findall(text.casefold())
+
+    @staticmethod
+    def store_text(relative_path: str, text: str) -> None:
+        """Save the text of an agenda (part of the caller's transaction)"""
+        if AgendaText.query.filter_by(path=relative_path).first():
+            return
+        db.session.add(AgendaText(path=relative_path, content=text))
+
+    @staticmethod
+    def remove_text(relative_path: str) -> None:
+        """Drop the text of a released agenda (part of the caller's transaction)"""
+        AgendaText.query.filter_by(path=relative_path).delete(synchronize_session=False)
+
+    @staticmethod
+    def _get_index() -> AgendaIndex:
+        global _index
+        if _index is None:
+            with _index_lock:
+                if _index is None:
+                    _index = AgendaIndex()
+        return _index
+
+    @staticmethod
+    def start_warm_up(app) -> Optional[threading.Thread]:
+        """
+        Build this process's in-process index in the background
+
+        Called when the server starts (run.py) so the first search doesn't
+        pay for indexing every agenda. Searches made meanwhile wait for the
+        build. Request workers forked afterwards (gunicorn --preload) call
+        post_fork to build their own. No-op on PostgreSQL or with
+        AGENDA_INDEX_WARMUP=False.
+        """
+        global _warm_up_app
+        if not app.config['AGENDA_INDEX_WARMUP']:
+            return None
+        _warm_up_app = app
+
+        thread = threading.Thread(
+            target=AgendaSearchService._warm_up, args=(app,), name='agenda-index-warm-up', daemon=True
+        )
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _warm_up(app) -> None:
+        with app.app_context():
+            try:
+                if db.engine.dialect.name == 'postgresql':
+                    return
+                started = time.perf_counter()
+                AgendaSearchService._get_index().refresh()
+                logger.info(f"✅ Agenda search index built in {time.perf_counter() - started:.1f}s")
+            except Exception as e:
+                # e.g. tables not created yet; the first search builds it instead
+                logger.warning(f"⚠️  Agenda search index warm-up failed: {e}")
+            finally:
+                db.session.remove()
+
+    @staticmethod
+    def post_fork() -> None:
+        """
+        Restart the warm-up in a freshly forked request worker
+
+        Called from gunicorn's post_fork hook (gunicorn.conf.py). Not
+        registered with os.register_at_fork: other forked children, such
+        as the image/PDF process pool, never search and shouldn't build an
+        index.
+        """
+        # The parent's build thread (and any lock it held) didn't survive the fork
+        global _index, _index_lock
+        _index = None
+        _index_lock = threading.Lock()
+        if _warm_up_app is not None:
+            with _warm_up_app.app_context():
+                # Don't share the parent's pooled connection (the warm-up used one)
+                db.engine.dispose(close=False)
+            AgendaSearchService.start_warm_up(_warm_up_app)
+
+    @staticmethod
+    def filter_meetings(query, search: str):
+        """
+        Restrict a Meeting query to meetings whose agenda contains every word of search
+
+        Uses a tsvector match (GIN-indexed) on PostgreSQL and the
+        in-process inverted index elsewhere.
+        """
+        terms = AgendaSearchService.tokenize(search)
+        if not terms:
+            return query
+
+        query = query.join(AgendaText, AgendaText.path == Meeting.agenda)
+
+        if db.engine.dialect.name == 'postgresql':
+            config = literal_column(f"'{AgendaText.SEARCH_CONFIG}'")
+            document = func.to_tsvector(config, AgendaText.content)
+            return query.filter(document.op('@@')(func.plainto_tsquery(config, ' '.join(terms))))
+
+        ids = AgendaSearchService._get_index().search(terms)
+        # Inlined rather than bound so large result sets don't hit SQLite's variable limit
+        return query.filter(AgendaText.id.in_(
+            bindparam('agenda_text_ids', sorted(ids), expanding=True, literal_execute=True)
+        ))
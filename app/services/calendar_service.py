@@ -2,25 +2,69 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 from datetime import datetime, timedelta
 from app.models.meeting import Meeting
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from flask import current_app
 import logging
 import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Credentials are shared by every thread so a refreshed access token is
+# reused process-wide; built services (and their httplib2.Http transport,
+# which is not thread-safe) are cached per thread.
+_credentials_lock = threading.Lock()
+_credentials_cache = {}
+_thread_local = threading.local()
+
 class CalendarService:
     """Google Calendar API integration"""
     
     SCOPES = ['https://www.googleapis.com/auth/calendar']
     CALENDAR_ID = 'primary'  # Or specific calendar ID
+    MEETING_ID_PROPERTY = 'rsdd_meeting_id'
+    
+    @staticmethod
+    def is_configured() -> bool:
+        """Check if Google Calendar credentials are available"""
+        credentials_path = current_app.config.get('GOOGLE_CREDENTIALS_PATH')
+        return bool(credentials_path) and os.path.exists(credentials_path)
+    
+    @staticmethod
+    def get_credentials(credentials_path: str):
+        """
+        Load service account credentials, cached per file version
+        
+        The cache key includes the file's mtime so rotating the key file
+        on disk is picked up without a restart.
+        """
+        key = (credentials_path, os.path.getmtime(credentials_path))
+        
+        credentials = _credentials_cache.get(key)
+        if credentials is None:
+            with _credentials_lock:
+                credentials = _credentials_cache.get(key)
+                if credentials is None:
+                    credentials = service_account.Credentials.from_service_account_file(
+                        credentials_path,
+                        scopes=CalendarService.SCOPES
+                    )
+                    _credentials_cache.clear()
+                    _credentials_cache[key] = credentials
+        
+        return credentials
     
     @staticmethod
     def get_calendar_service():
         """
-        Initialize Google Calendar API service using service account
+        Get Google Calendar API service using service account
+        
+        The service is built once per thread and reused; building parses
+        the discovery document and opens a new HTTP transport.
         
         Returns:
             Google Calendar service object
@@ -28,19 +72,89 @@ class CalendarService:
         Raises:
             ValueError: If credentials not configured
         """
-        credentials_path = current_app.config.get('GOOGLE_CREDENTIALS_PATH')
-        
-        if not credentials_path or not os.path.exists(credentials_path):
+        if not CalendarService.is_configured():
             raise ValueError("Google Calendar credentials not configured")
         
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=CalendarService.SCOPES
-        )
+        credentials_path = current_app.config['GOOGLE_CREDENTIALS_PATH']
+        credentials = CalendarService.get_credentials(credentials_path)
+        
+        cached = getattr(_thread_local, 'service', None)
+        if cached is not None and cached[0] is credentials:
+            return cached[1]
         
-        service = build('calendar', 'v3', credentials=credentials)
+        client_options = None
+        api_endpoint = current_app.config.get('GOOGLE_CALENDAR_API_ENDPOINT')
+        if api_endpoint:
+            client_options = {'api_endpoint': f"{api_endpoint.rstrip('/')}/calendar/v3/"}
+        
+        service = build(
+            'calendar', 'v3',
+            credentials=credentials,
+            cache_discovery=False,
+            client_options=client_options
+        )
+        _thread_local.service = (credentials, service)
         return service
     
+    @staticmethod
+    def reset_client() -> None:
+        """Drop cached credentials and this thread's service (e.g. after key rotation)"""
+        with _credentials_lock:
+            _credentials_cache.clear()
+        _thread_local.service = None
+    
+    @staticmethod
+    def build_event_body(meeting: Meeting) -> dict:
+        """Build the Calendar event resource for a meeting"""
+        # Combine date and time
+        start_datetime = datetime.combine(meeting.date, meeting.time)
+        end_datetime = start_datetime + timedelta(hours=1)  # Default 1-hour duration
+        
+        # Get attendee emails
+        attendee_emails = []
+        for attendee in meeting.attendees:
+            email = attendee.profile.email if attendee.profile and attendee.profile.email else attendee.email
+            if email:
+                attendee_emails.append({'email': email})
+        
+        # Build event description
+        description = f'Meeting ID: {meeting.id}\n\n'
+        description += f'Attendees: {len(meeting.attendees)}\n'
+        
+        if meeting.agenda:
+            from flask import url_for
+            try:
+                agenda_url = url_for('media.serve_media', filepath=meeting.agenda, _external=True)
+                description += f'\nAgenda: {agenda_url}'
+            except RuntimeError:
+                # Outside a request (sync worker) without SERVER_NAME configured
+                pass
+        
+        return {
+            'summary': meeting.title,
+            'description': description,
+            'start': {
+                'dateTime': start_datetime.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'end': {
+                'dateTime': end_datetime.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'attendees': attendee_emails,
+            'extendedProperties': {
+                # Lets reconciliation map events back to meetings
+                'private': {CalendarService.MEETING_ID_PROPERTY: str(meeting.id)},
+            },
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},  # 1 day before
+                    {'method': 'popup', 'minutes': 15},  # 15 min before
+                ],
+            },
+        }
+    
     @staticmethod
     def create_event(meeting: Meeting) -> Optional[str]:
         """
@@ -58,48 +172,7 @@ class CalendarService:
         
         try:
             service = CalendarService.get_calendar_service()
-            
-            # Combine date and time
-            start_datetime = datetime.combine(meeting.date, meeting.time)
-            end_datetime = start_datetime + timedelta(hours=1)  # Default 1-hour duration
-            
-            # Get attendee emails
-            attendee_emails = []
-            for attendee in meeting.attendees:
-                email = attendee.profile.email if attendee.profile and attendee.profile.email else attendee.email
-                if email:
-                    attendee_emails.append({'email': email})
-            
-            # Build event description
-            description = f'Meeting ID: {meeting.id}\n\n'
-            description += f'Attendees: {len(meeting.attendees)}\n'
-            
-            if meeting.agenda:
-                from flask import url_for
-                agenda_url = url_for('media.serve_media', filepath=meeting.agenda, _external=True)
-                description += f'\nAgenda: {agenda_url}'
-            
-            # Create event
-            event = {
-                'summary': meeting.title,
-                'description': description,
-                'start': {
-                    'dateTime': start_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'attendees': attendee_emails,
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},  # 1 day before
-                        {'method': 'popup', 'minutes': 15},  # 15 min before
-                    ],
-                },
-            }
+            event = CalendarService.build_event_body(meeting)
             
             # Insert event
             created_event = service.events().insert(
@@ -107,6 +180,8 @@ class CalendarService:
                 body=event
             ).execute()
             
+            CalendarService.remember_event(meeting, created_event, event)
+            
             logger.info(f"✅ Google Calendar event created: {created_event.get('id')}")
             return created_event.get('id')
             
@@ -120,52 +195,85 @@ class CalendarService:
             logger.error(f"❌ Failed to create calendar event: {e}")
             return None
     
+    # Event fields owned by the app; everything else may be edited in Calendar
+    SYNCED_FIELDS = ('summary', 'start', 'end', 'attendees')
+    
+    @staticmethod
+    def remember_event(meeting: Meeting, event: dict, body: dict) -> None:
+        """Store the event's ETag and the app-owned fields just written"""
+        meeting.google_event_etag = event.get('etag') if event else None
+        meeting.google_event_snapshot = {
+            key: body[key] for key in CalendarService.SYNCED_FIELDS if key in body
+        }
+    
+    @staticmethod
+    def build_event_patch(meeting: Meeting) -> Tuple[dict, dict]:
+        """
+        Compute the minimal patch for a meeting's event
+        
+        Returns:
+            Tuple of (all synced fields, changed fields since the last write)
+        """
+        body = CalendarService.build_event_body(meeting)
+        fields = {key: body[key] for key in CalendarService.SYNCED_FIELDS}
+        snapshot = meeting.google_event_snapshot or {}
+        changes = {key: value for key, value in fields.items() if snapshot.get(key) != value}
+        return fields, changes
+    
+    @staticmethod
+    def _replace_event(service, meeting: Meeting, fields: dict) -> dict:
+        """Fetch the current event and overwrite the app-owned fields (get + update)"""
+        event = service.events().get(
+            calendarId=CalendarService.CALENDAR_ID,
+            eventId=meeting.google_event_id
+        ).execute()
+        event.update(fields)
+        
+        return service.events().update(
+            calendarId=CalendarService.CALENDAR_ID,
+            eventId=meeting.google_event_id,
+            body=event
+        ).execute()
+    
     @staticmethod
     def update_event(meeting: Meeting) -> bool:
-        """Update Google Calendar event"""
+        """
+        Update Google Calendar event
+        
+        Sends only the fields that changed since the last write as a PATCH
+        conditioned on the stored ETag. If the event was modified in
+        Calendar meanwhile (412), falls back to get + update.
+        """
         if not meeting.google_event_id:
             return False
         
+        if not meeting.date or not meeting.time:
+            return False
+        
         try:
             service = CalendarService.get_calendar_service()
+            fields, changes = CalendarService.build_event_patch(meeting)
             
-            # Get existing event
-            event = service.events().get(
-                calendarId=CalendarService.CALENDAR_ID,
-                eventId=meeting.google_event_id
-            ).execute()
-            
-            # Update fields
-            if meeting.date and meeting.time:
-                start_datetime = datetime.combine(meeting.date, meeting.time)
-                end_datetime = start_datetime + timedelta(hours=1)
-                
-                event['start'] = {
-                    'dateTime': start_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                }
-                event['end'] = {
-                    'dateTime': end_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                }
-            
-            if meeting.title:
-                event['summary'] = meeting.title
+            if not changes:
+                return True
             
-            # Update attendees
-            attendee_emails = []
-            for attendee in meeting.attendees:
-                email = attendee.profile.email if attendee.profile and attendee.profile.email else attendee.email
-                if email:
-                    attendee_emails.append({'email': email})
-            event['attendees'] = attendee_emails
-            
-            # Update event
-            service.events().update(
+            request = service.events().patch(
                 calendarId=CalendarService.CALENDAR_ID,
                 eventId=meeting.google_event_id,
-                body=event
-            ).execute()
+                body=changes
+            )
+            if meeting.google_event_etag:
+                request.headers['If-Match'] = meeting.google_event_etag
+            
+            try:
+                event = request.execute()
+            except HttpError as e:
+                if e.resp.status != 412:
+                    raise
+                logger.info(f"Calendar event {meeting.google_event_id} changed remotely, replacing")
+                event = CalendarService._replace_event(service, meeting, fields)
+            
+            CalendarService.remember_event(meeting, event, fields)
             
             logger.info(f"✅ Google Calendar event updated: {meeting.google_event_id}")
             return True
@@ -190,4 +298,196 @@ class CalendarService:
         except Exception as e:
             logger.error(f"❌ Failed to delete calendar event: {e}")
             return False
-
+    
+    @staticmethod
+    def list_changed_events(sync_token: Optional[str] = None) -> Tuple[List[dict], Optional[str], bool]:
+        """
+        List events changed since the given sync token
+        
+        Without a token (or when Calendar rejects it as expired with 410),
+        lists every event to establish a new token.
+        
+        Args:
+            sync_token: nextSyncToken from the previous run
+        
+        Returns:
+            Tuple of (events including cancelled ones, next sync token, full_sync)
+        
+        Raises:
+            ValueError: If credentials not configured
+        """
+        service = CalendarService.get_calendar_service()
+        
+        def fetch(token):
+            events, page_token = [], None
+            while True:
+                response = service.events().list(
+                    calendarId=CalendarService.CALENDAR_ID,
+                    syncToken=token,
+                    pageToken=page_token,
+                    showDeleted=True,
+                    maxResults=250
+                ).execute()
+                events.extend(response.get('items', []))
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    return events, response.get('nextSyncToken')
+        
+        if sync_token:
+            try:
+                events, next_token = fetch(sync_token)
+                return events, next_token, False
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.warning("⚠️  Google Calendar sync token expired, running full sync")
+        
+        events, next_token = fetch(None)
+        return events, next_token, True
+    
+    # Sub-request statuses worth retrying (rate limits and server errors)
+    RETRYABLE_STATUSES = {403, 429, 500, 502, 503, 504}
+    
+    @staticmethod
+    def _build_batch_request(service, action: str, target: Any):
+        """Build an un-executed events() request for a batch operation"""
+        events = service.events()
+        
+        if action == 'delete':
+            return events.delete(calendarId=CalendarService.CALENDAR_ID, eventId=target)
+        
+        if action == 'insert':
+            body = CalendarService.build_event_body(target)
+            return events.insert(calendarId=CalendarService.CALENDAR_ID, body=body)
+        
+        # Only the changed app-owned fields, so no prior get() is needed
+        _, changes = CalendarService.build_event_patch(target)
+        request = events.patch(
+            calendarId=CalendarService.CALENDAR_ID,
+            eventId=target.google_event_id,
+            body=changes
+        )
+        if target.google_event_etag:
+            request.headers['If-Match'] = target.google_event_etag
+        return request
+    
+    @staticmethod
+    def _new_batch(service, callback) -> BatchHttpRequest:
+        """Create a batch request, honouring GOOGLE_CALENDAR_API_ENDPOINT"""
+        api_endpoint = current_app.config.get('GOOGLE_CALENDAR_API_ENDPOINT')
+        if api_endpoint:
+            # The discovery document's batch URI always points at googleapis.com
+            batch_uri = f"{api_endpoint.rstrip('/')}/batch/calendar/v3"
+            return BatchHttpRequest(callback=callback, batch_uri=batch_uri)
+        return service.new_batch_http_request(callback=callback)
+    
+    @staticmethod
+    def batch_execute(operations: List[Tuple[str, str, Any]]) -> Dict[str, Dict]:
+        """
+        Run many event operations as Calendar API batch requests
+        
+        Operations are grouped into batches of GOOGLE_CALENDAR_BATCH_SIZE
+        sub-requests (one HTTP round-trip each). Sub-requests that fail with
+        a retryable status are re-sent in a new batch with backoff; updates
+        rejected by their ETag precondition fall back to get + update; the
+        rest are reported as failures.
+        
+        Args:
+            operations: List of (key, action, target) tuples where action is
+                'insert', 'update' (target: Meeting) or 'delete' (target: event ID)
+        
+        Returns:
+            Dict of key -> {'ok': bool, 'event_id': str or None, 'error': str or None}
+        
+        Raises:
+            ValueError: If credentials not configured
+        """
+        service = CalendarService.get_calendar_service()
+        config = current_app.config
+        batch_size = config['GOOGLE_CALENDAR_BATCH_SIZE']
+        retries = config['GOOGLE_CALENDAR_BATCH_RETRIES']
+        
+        results: Dict[str, Dict] = {}
+        pending = []
+        conflicts = []
+        for key, action, target in operations:
+            if action != 'delete' and (not target.date or not target.time):
+                results[key] = {'ok': False, 'event_id': None, 'error': 'Meeting has no date/time'}
+            elif action == 'update' and not CalendarService.build_event_patch(target)[1]:
+                # Nothing changed since the last write
+                results[key] = {'ok': True, 'event_id': target.google_event_id, 'error': None}
+            else:
+                pending.append((key, action, target))
+        
+        for attempt in range(retries + 1):
+            if not pending:
+                break
+            if attempt:
+                time.sleep(2 ** (attempt - 1))
+            
+            retry = []
+            for i in range(0, len(pending), batch_size):
+                chunk = pending[i:i + batch_size]
+                by_key = {key: (key, action, target) for key, action, target in chunk}
+                answered = set()  # Sub-requests this round-trip got a response for
+                
+                def callback(request_id, response, exception):
+                    key, action, target = by_key[request_id]
+                    answered.add(key)
+                    if exception is None:
+                        if action == 'delete':
+                            event_id = target
+                        else:
+                            event_id = response.get('id')
+                            CalendarService.remember_event(
+                                target, response, CalendarService.build_event_body(target)
+                            )
+                        results[key] = {'ok': True, 'event_id': event_id, 'error': None}
+                        return
+                    
+                    status = getattr(getattr(exception, 'resp', None), 'status', None)
+                    if action == 'update' and status == 412:
+                        # Modified in Calendar since our last write
+                        conflicts.append(by_key[request_id])
+                    elif action == 'delete' and status in (404, 410):
+                        # Already gone
+                        results[key] = {'ok': True, 'event_id': target, 'error': None}
+                    elif status is None or status in CalendarService.RETRYABLE_STATUSES:
+                        results[key] = {'ok': False, 'event_id': None, 'error': str(exception)}
+                        retry.append(by_key[request_id])
+                    else:
+                        results[key] = {'ok': False, 'event_id': None, 'error': str(exception)}
+                
+                batch = CalendarService._new_batch(service, callback)
+                for key, action, target in chunk:
+                    batch.add(CalendarService._build_batch_request(service, action, target), request_id=key)
+                
+                try:
+                    batch.execute()
+                except Exception as e:
+                    # Only sub-requests without a response are retried; answered
+                    # ones are done, conflicts, queued or failed for good
+                    logger.warning(f"⚠️  Google Calendar batch request failed: {e}")
+                    for op in chunk:
+                        if op[0] not in answered:
+                            results[op[0]] = {'ok': False, 'event_id': None, 'error': str(e)}
+                            retry.append(op)
+                        else:
+                            # Answered, but its callback raised before recording a result
+                            results.setdefault(op[0], {'ok': False, 'event_id': None, 'error': str(e)})
+            
+            pending = retry
+        
+        # Conditional patches that lost the race fall back to get + update
+        for key, action, target in conflicts:
+            try:
+                fields = CalendarService.build_event_patch(target)[0]
+                event = CalendarService._replace_event(service, target, fields)
+                CalendarService.remember_event(target, event, fields)
+                results[key] = {'ok': True, 'event_id': target.google_event_id, 'error': None}
+            except Exception as e:
+                results[key] = {'ok': False, 'event_id': None, 'error': str(e)}
+        
+        failed = sum(1 for r in results.values() if not r['ok'])
+        logger.info(f"✅ Google Calendar batch: {len(results) - failed} succeeded, {failed} failed")
+        return results
@@ -0,0 +1,384 @@
+# app/services/calendar_sync_service.py
+from app.extensions import db
+from app.models.calendar_sync import CalendarSyncJob, CalendarSyncState
+from app.models.meeting import Meeting
+from app.services.calendar_service import CalendarService
+from datetime import date, datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import or_
+from typing import Any, Dict, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CalendarSyncService:
+    """Persistent queue of Google Calendar operations, processed off-request"""
+
+    # Jobs left in "processing" longer than this belonged to a crashed worker
+    STALE_PROCESSING_AFTER = timedelta(minutes=10)
+
+    # Event IDs per IN (...) query when matching events to meetings
+    RECONCILE_CHUNK_SIZE = 500
+
+    @staticmethod
+    def _pending_jobs(meeting_id: int):
+        return CalendarSyncJob.query.filter_by(
+            meeting_id=meeting_id,
+            status=CalendarSyncJob.STATUS_PENDING
+        )
+
+    @staticmethod
+    def enqueue(meeting: Meeting, action: str) -> Optional[CalendarSyncJob]:
+        """
+        Queue a calendar operation for a meeting
+
+        Jobs are added to the current session so they commit atomically with
+        the meeting change. Pending create/update jobs for the same meeting
+        are coalesced, since the worker always sends the meeting's latest
+        state; a delete supersedes them. A create already being processed
+        can't be cancelled; process_pending deletes its event when it finds
+        the meeting gone.
+
+        Args:
+            meeting: Meeting object (must have an ID)
+            action: One of CalendarSyncJob.ACTION_*
+
+        Returns:
+            The queued (or coalesced) job, or None if nothing needs syncing
+        """
+        if not CalendarService.is_configured():
+            return None
+
+        pending = CalendarSyncService._pending_jobs(meeting.id).all()
+
+        if action == CalendarSyncJob.ACTION_DELETE:
+            for job in pending:
+                db.session.delete(job)
+
+            if not meeting.google_event_id:
+                # No event yet; dropping the pending create is enough
+                return None
+
+            job = CalendarSyncJob(
+                meeting_id=meeting.id,
+                google_event_id=meeting.google_event_id,
+                action=action
+            )
+            db.session.add(job)
+            return job
+
+        meeting.sync_status = Meeting.SYNC_PENDING
+
+        if pending:
+            job = pending[0]
+            job.next_attempt_at = min(job.next_attempt_at, datetime.utcnow())
+            return job
+
+        if action == CalendarSyncJob.ACTION_UPDATE and not meeting.google_event_id:
+            action = CalendarSyncJob.ACTION_CREATE
+
+        job = CalendarSyncJob(meeting_id=meeting.id, action=action)
+        db.session.add(job)
+        return job
+
+    @staticmethod
+    def _build_operation(job: CalendarSyncJob) -> Optional[Tuple[str, str, Any]]:
+        """
+        Translate a job into a CalendarService.batch_execute operation
+
+        Returns:
+            (key, action, target) tuple, or None if there is nothing to send
+        """
+        key = str(job.id)
+
+        if job.action == CalendarSyncJob.ACTION_DELETE:
+            return (key, 'delete', job.google_event_id) if job.google_event_id else None
+
+        meeting = db.session.get(Meeting, job.meeting_id)
+        if not meeting:
+            return None
+
+        return (key, 'update' if meeting.google_event_id else 'insert', meeting)
+
+    @staticmethod
+    def _record_failure(job: CalendarSyncJob, error: str) -> None:
+        """Schedule a retry with exponential backoff, or give up"""
+        config = current_app.config
+        job.attempts += 1
+        job.last_error = error
+
+        if job.attempts >= config['CALENDAR_SYNC_MAX_ATTEMPTS']:
+            job.status = CalendarSyncJob.STATUS_FAILED
+            meeting = db.session.get(Meeting, job.meeting_id)
+            if meeting:
+                meeting.sync_status = Meeting.SYNC_FAILED
+            logger.error(f"❌ Calendar sync for meeting {job.meeting_id} gave up after {job.attempts} attempts: {error}")
+            return
+
+        delay = min(
+            config['CALENDAR_SYNC_BACKOFF'] * (2 ** (job.attempts - 1)),
+            config['CALENDAR_SYNC_MAX_BACKOFF']
+        )
+        job.status = CalendarSyncJob.STATUS_PENDING
+        job.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        logger.warning(f"⚠️  Calendar sync for meeting {job.meeting_id} failed, retrying in {delay}s: {error}")
+
+    @staticmethod
+    def _record_success(job: CalendarSyncJob, operation, result: dict, values: Optional[dict]) -> None:
+        """Store the event on the meeting (if it still exists) and drop the job"""
+        if values:
+            # Bulk UPDATE: matches no row, rather than raising, if the meeting is gone
+            updated = Meeting.query.filter_by(id=job.meeting_id).update(values, synchronize_session=False)
+            if not updated and operation[1] == 'insert' and result['event_id']:
+                logger.warning(f"⚠️  Meeting {job.meeting_id} was deleted while its event was created, deleting the event")
+                CalendarSyncService._queue_orphan_delete(job.meeting_id, result['event_id'])
+        db.session.delete(job)
+
+    @staticmethod
+    def process_pending(limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process due jobs from the queue
+
+        Jobs are claimed with SKIP LOCKED (where supported) so several
+        workers can drain the queue concurrently, then sent to the Calendar
+        API as batch requests. Each job's outcome is committed on its own,
+        so a meeting deleted while the batch was in flight only affects its
+        own job: its event ID is not stored, and an event just created for
+        it is queued for deletion.
+
+        Args:
+            limit: Maximum number of jobs to process (default CALENDAR_SYNC_BATCH_SIZE)
+
+        Returns:
+            Counts of processed, succeeded and failed jobs
+        """
+        limit = limit or current_app.config['CALENDAR_SYNC_BATCH_SIZE']
+
+        CalendarSyncJob.query.filter(
+            CalendarSyncJob.status == CalendarSyncJob.STATUS_PROCESSING,
+            CalendarSyncJob.updated_at < datetime.utcnow() - CalendarSyncService.STALE_PROCESSING_AFTER
+        ).update({'status': CalendarSyncJob.STATUS_PENDING}, synchronize_session=False)
+
+        jobs = CalendarSyncJob.query.filter(
+            CalendarSyncJob.status == CalendarSyncJob.STATUS_PENDING,
+            CalendarSyncJob.next_attempt_at <= datetime.utcnow()
+        ).order_by(CalendarSyncJob.id.asc()).limit(limit).with_for_update(skip_locked=True).all()
+
+        for job in jobs:
+            job.status = CalendarSyncJob.STATUS_PROCESSING
+        db.session.commit()
+
+        stats = {'processed': len(jobs), 'succeeded': 0, 'failed': 0}
+
+        operations = {}
+        for job in jobs:
+            operation = CalendarSyncService._build_operation(job)
+            if operation:
+                operations[job.id] = operation
+
+        # One batched round-trip per GOOGLE_CALENDAR_BATCH_SIZE jobs
+        try:
+            results = CalendarService.batch_execute(list(operations.values())) if operations else {}
+        except Exception as e:
+            results = {key: {'ok': False, 'event_id': None, 'error': str(e)}
+                       for key, _, _ in operations.values()}
+
+        # Meeting columns to store per succeeded job. The batch left them as
+        # pending changes on the meeting objects; those are discarded and
+        # written per job below, so a vanished meeting can't fail the flush
+        # for the whole batch.
+        outcomes = {}
+        for job in jobs:
+            operation = operations.get(job.id)
+            result = results.get(operation[0]) if operation else {'ok': True}
+            values = None
+            if result['ok'] and operation and operation[1] != 'delete':
+                meeting = operation[2]
+                values = {
+                    'google_event_id': result['event_id'] if operation[1] == 'insert' else meeting.google_event_id,
+                    'google_event_etag': meeting.google_event_etag,
+                    'google_event_snapshot': meeting.google_event_snapshot,
+                    'sync_status': Meeting.SYNC_SYNCED,
+                }
+            outcomes[job.id] = (operation, result, values)
+        db.session.rollback()
+
+        for job in jobs:
+            operation, result, values = outcomes[job.id]
+            try:
+                if result['ok']:
+                    CalendarSyncService._record_success(job, operation, result, values)
+                    stats['succeeded'] += 1
+                else:
+                    CalendarSyncService._record_failure(job, result['error'])
+                    stats['failed'] += 1
+                db.session.commit()
+            except Exception as e:
+                # Left in "processing"; picked up again once stale
+                db.session.rollback()
+                logger.error(f"❌ Failed to save calendar sync result for meeting {job.meeting_id}: {e}")
+
+        if jobs:
+            logger.info(f"✅ Calendar sync: {stats['succeeded']} succeeded, {stats['failed']} failed")
+        return stats
+
+    @staticmethod
+    def _active_job_meeting_ids() -> Set[int]:
+        """IDs of meetings with a queued or in-flight job"""
+        rows = db.session.query(CalendarSyncJob.meeting_id).filter(
+            CalendarSyncJob.status.in_([CalendarSyncJob.STATUS_PENDING, CalendarSyncJob.STATUS_PROCESSING])
+        ).distinct()
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _normalize_fields(fields: dict) -> tuple:
+        """Comparable form of the app-owned event fields (Calendar reformats them)"""
+        def moment(value):
+            value = value or {}
+            raw = value.get('dateTime')
+            if not raw:
+                return value.get('date')
+            parsed = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+
+        return (
+            fields.get('summary') or '',
+            moment(fields.get('start')),
+            moment(fields.get('end')),
+            frozenset((a.get('email') or '').lower() for a in fields.get('attendees') or []),
+        )
+
+    @staticmethod
+    def _queue_orphan_delete(meeting_id: int, event_id: str) -> bool:
+        """Queue deletion of an event whose meeting no longer owns it"""
+        exists = CalendarSyncJob.query.filter_by(
+            google_event_id=event_id,
+            action=CalendarSyncJob.ACTION_DELETE,
+            status=CalendarSyncJob.STATUS_PENDING
+        ).first()
+        if exists:
+            return False
+
+        db.session.add(CalendarSyncJob(
+            meeting_id=meeting_id,
+            google_event_id=event_id,
+            action=CalendarSyncJob.ACTION_DELETE
+        ))
+        return True
+
+    @staticmethod
+    def reconcile() -> Dict[str, int]:
+        """
+        Detect and repair drift between meetings and Calendar events
+
+        Pulls only events changed since the stored sync token, matches them
+        to meetings with chunked IN (...) queries and queues repairs:
+        events deleted in Calendar are recreated, events edited in Calendar
+        are patched back to the meeting's state, and events whose meeting is
+        gone are deleted. Upcoming meetings that never synced (or gave up)
+        are re-queued. The queue is then drained as batch requests and the
+        new sync token saved.
+
+        Returns:
+            Counts of changed events and repairs queued
+        """
+        state = db.session.get(CalendarSyncState, CalendarService.CALENDAR_ID)
+        if state is None:
+            state = CalendarSyncState(calendar_id=CalendarService.CALENDAR_ID)
+            db.session.add(state)
+
+        events, next_token, full_sync = CalendarService.list_changed_events(state.sync_token)
+        stats = {'events': len(events), 'full_sync': full_sync, 'stale': 0, 'missing': 0, 'orphaned': 0, 'unsynced': 0}
+
+        active = CalendarSyncService._active_job_meeting_ids()
+        by_event_id = {event['id']: event for event in events}
+        chunk_size = CalendarSyncService.RECONCILE_CHUNK_SIZE
+
+        meetings: Dict[str, Meeting] = {}
+        event_ids = list(by_event_id)
+        for i in range(0, len(event_ids), chunk_size):
+            for meeting in Meeting.query.filter(Meeting.google_event_id.in_(event_ids[i:i + chunk_size])):
+                meetings[meeting.google_event_id] = meeting
+
+        # Events tagged with a meeting ID that don't match that meeting's event
+        owners: Dict[str, int] = {}
+        for event_id, event in by_event_id.items():
+            owner = event.get('extendedProperties', {}).get('private', {}).get(CalendarService.MEETING_ID_PROPERTY)
+            if event_id not in meetings and owner and owner.isdigit() and event.get('status') != 'cancelled':
+                owners[event_id] = int(owner)
+
+        owner_meetings: Dict[int, Meeting] = {}
+        owner_ids = list(set(owners.values()))
+        for i in range(0, len(owner_ids), chunk_size):
+            for meeting in Meeting.query.filter(Meeting.id.in_(owner_ids[i:i + chunk_size])):
+                owner_meetings[meeting.id] = meeting
+
+        for event_id, meeting_id in owners.items():
+            if meeting_id in active:
+                continue
+            meeting = owner_meetings.get(meeting_id)
+            if meeting and not meeting.google_event_id:
+                # Created but the ID was never stored; adopt it
+                meeting.google_event_id = event_id
+                meetings[event_id] = meeting
+            elif CalendarSyncService._queue_orphan_delete(meeting_id, event_id):
+                stats['orphaned'] += 1
+
+        for event_id, meeting in meetings.items():
+            event = by_event_id[event_id]
+            if meeting.id in active or not meeting.date or not meeting.time:
+                continue
+
+            if event.get('status') == 'cancelled':
+                # Deleted in Calendar; recreate from the meeting
+                meeting.google_event_id = None
+                meeting.google_event_etag = None
+                meeting.google_event_snapshot = None
+                CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_CREATE)
+                stats['missing'] += 1
+                continue
+
+            fields, _ = CalendarService.build_event_patch(meeting)
+            normalize = CalendarSyncService._normalize_fields
+            if normalize(fields) != normalize(event):
+                # Edited in Calendar; patch the differing fields back
+                CalendarService.remember_event(meeting, event, event)
+                CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
+                stats['stale'] += 1
+            elif meeting.sync_status != Meeting.SYNC_SYNCED:
+                CalendarService.remember_event(meeting, event, fields)
+                meeting.sync_status = Meeting.SYNC_SYNCED
+
+        # Upcoming meetings that never got an event or gave up retrying
+        # (meetings without a date/time can't have an event; don't queue them every run)
+        active = CalendarSyncService._active_job_meeting_ids()
+        unsynced = Meeting.query.filter(
+            Meeting.date.isnot(None),
+            Meeting.time.isnot(None),
+            Meeting.date >= date.today(),
+            or_(Meeting.google_event_id.is_(None), Meeting.sync_status == Meeting.SYNC_FAILED)
+        )
+        for meeting in unsynced:
+            if meeting.id not in active:
+                CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
+                stats['unsynced'] += 1
+
+        state.sync_token = next_token
+        state.last_reconciled_at = datetime.utcnow()
+        if full_sync:
+            state.last_full_sync_at = state.last_reconciled_at
+        db.session.commit()
+
+        # Push the repairs
+        limit = current_app.config['CALENDAR_SYNC_BATCH_SIZE']
+        while CalendarSyncService.process_pending(limit)['processed'] >= limit:
+            pass
+
+        logger.info(
+            f"✅ Calendar reconciliation: {stats['events']} changed event(s), "
+            f"{stats['stale']} stale, {stats['missing']} missing, "
+            f"{stats['orphaned']} orphaned, {stats['unsynced']} unsynced"
+        )
+        return stats
@@ -0,0 +1,86 @@
+# app/services/department_service.py
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from app.extensions import db
+from app.models.department import AcademicDepartment, AdministrativeDepartment
+from app.models.user import User, UserProfile
+
+
+class DepartmentService:
+    """Department membership queries"""
+
+    # URL kind -> (department model, UserProfile foreign key)
+    KINDS = {
+        'academic': (AcademicDepartment, UserProfile.academic_department_id),
+        'administrative': (AdministrativeDepartment, UserProfile.administrative_department_id),
+    }
+
+    @staticmethod
+    def _kind(kind: str):
+        if kind not in DepartmentService.KINDS:
+            raise ValueError(f"Unknown department kind: {kind}. Use one of: {', '.join(DepartmentService.KINDS)}")
+        return DepartmentService.KINDS[kind]
+
+    @staticmethod
+    def get_department(kind: str, department_id: int):
+        """
+        Department of the given kind, or None
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        model, _ = DepartmentService._kind(kind)
+        return db.session.get(model, department_id)
+
+    @staticmethod
+    def member_counts(kind: str, department_ids: Optional[List[int]] = None) -> Dict[int, int]:
+        """
+        Number of profiles per department, as one grouped aggregate
+
+        Departments without members are left out.
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        _, column = DepartmentService._kind(kind)
+        query = db.session.query(column, func.count(UserProfile.id)).filter(column.isnot(None))
+        if department_ids is not None:
+            query = query.filter(column.in_(department_ids))
+        return dict(query.group_by(column).all())
+
+    @staticmethod
+    def members_page(kind: str, department_id: int, after: int = 0, per_page: int = 20) -> Tuple[List[User], Optional[int]]:
+        """
+        One page of a department's members, ordered by profile id
+
+        Keyset pagination: the page starts after the profile id `after`, so
+        every page is an index range scan however deep the client pages.
+
+        Returns:
+            Tuple of (users, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        _, column = DepartmentService._kind(kind)
+        rows = (
+            User.query
+            .join(User.profile)
+            .options(
+                contains_eager(User.profile).options(
+                    selectinload(UserProfile.titles),
+                    joinedload(UserProfile.academic_department).joinedload(AcademicDepartment.faculty),
+                    joinedload(UserProfile.administrative_department).joinedload(AdministrativeDepartment.category),
+                ),
+            )
+            .filter(column == department_id, UserProfile.id > after)
+            .order_by(UserProfile.id)
+            .limit(per_page + 1)
+            .all()
+        )
+
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            return rows, rows[-1].profile.id
+        return rows, None
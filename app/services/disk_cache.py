@@ -0,0 +1,132 @@
+# app/services/disk_cache.py
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Size-capped disk cache with LRU eviction
+
+    Used for resized images and as the read-through cache in front of
+    remote storage. Entries are plain files in the cache directory (keys
+    may contain '/' and map to subdirectories). An index file
+    (index.json: key -> [size, last_access]) tracks sizes and access
+    times; it is only rewritten under an exclusive file lock, so several
+    worker processes can share one cache directory. Hits only record the
+    access time in memory and are merged into the index at most every
+    FLUSH_INTERVAL seconds, so serving a cached file costs no writes.
+    """
+
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+    FLUSH_INTERVAL = 30  # seconds
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def discard(self, key: str) -> None:
+        """Drop an entry (e.g. after the stored object was deleted)"""
+        with self._locked_index() as index:
+            index.pop(key, None)
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of a cached entry, or None on a miss"""
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+
+        with self._lock:
+            self._pending_access[key] = time.time()
+            flush_due = time.monotonic() - self._last_flush > self.FLUSH_INTERVAL
+
+        if flush_due:
+            with self._locked_index():
+                pass
+        return path
+
+    def add(self, key: str, size: int) -> None:
+        """Record a newly written entry and evict least recently used ones over the cap"""
+        with self._locked_index() as index:
+            index[key] = [size, time.time()]
+            evicted = self._evict(index)
+
+        if evicted:
+            logger.info(f"🧹 Evicted {len(evicted)} cached file(s) from {self.directory}")
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, List[float]]]:
+        """Load the index under the process and file locks, merge access times, save on exit"""
+        with self._lock, open(os.path.join(self.directory, self.LOCK_FILE), 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            index = self._load_index()
+            for key, accessed_at in self._pending_access.items():
+                if key in index:
+                    index[key][1] = max(index[key][1], accessed_at)
+            self._pending_access.clear()
+
+            yield index
+
+            self._save_index(index)
+            self._last_flush = time.monotonic()
+
+    def _load_index(self) -> Dict[str, List[float]]:
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"⚠️ Cache index unreadable, starting fresh: {self.directory}")
+            return {}
+
+    def _save_index(self, index: Dict[str, List[float]]) -> None:
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _evict(self, index: Dict[str, List[float]]) -> List[str]:
+        """Drop oldest entries until the cache fits its cap"""
+        total = sum(size for size, _ in index.values())
+        evicted = []
+
+        for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+            del index[key]
+            total -= size
+            evicted.append(key)
+
+        return evicted
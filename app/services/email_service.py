@@ -2,8 +2,10 @@
 from flask_mail import Message
 from flask import current_app
 from app.models.meeting import Meeting
-from app.extensions import mail
-from typing import List, Optional
+from app.extensions import db, mail
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +13,154 @@ logger = logging.getLogger(__name__)
 class EmailService:
     """Email notification service"""
     
+    @staticmethod
+    def chunk_recipients(recipients: List[str], size: int) -> List[List[str]]:
+        """Split recipients into envelopes of at most `size` addresses (duplicates removed)"""
+        unique = list(dict.fromkeys(r for r in recipients if r))
+        size = max(1, size)
+        return [unique[i:i + size] for i in range(0, len(unique), size)]
+    
+    @staticmethod
+    def _send_chunks(app, chunks: List[List[str]], subject: str, body: str,
+                     html_body: Optional[str]) -> List[Dict]:
+        """
+        Send a share of the chunks over a single SMTP connection
+        
+        Runs inside a worker thread. A failed chunk is retried right away
+        on a fresh connection, since the old one may have been dropped; no
+        sleeping, as the request that created the meeting is waiting.
+        
+        Returns:
+            One result dict per chunk
+        """
+        results = []
+        
+        with app.app_context():
+            config = app.config
+            sender = config['MAIL_DEFAULT_SENDER']
+            use_bcc = config['MAIL_USE_BCC']
+            retries = config['MAIL_SEND_RETRIES']
+            
+            conn = None
+            try:
+                for chunk in chunks:
+                    msg = Message(
+                        subject=subject,
+                        recipients=[] if use_bcc else chunk,
+                        bcc=chunk if use_bcc else None,
+                        body=body,
+                        html=html_body,
+                        sender=sender
+                    )
+                    
+                    result = {'recipients': chunk, 'sent': False, 'attempts': 0, 'error': None}
+                    for attempt in range(retries + 1):
+                        result['attempts'] = attempt + 1
+                        try:
+                            if conn is None:
+                                conn = mail.connect().__enter__()
+                            conn.send(msg)
+                            result['sent'] = True
+                            result['error'] = None
+                            break
+                        except Exception as e:
+                            result['error'] = str(e)
+                            logger.warning(
+                                f"⚠️  Email chunk of {len(chunk)} failed "
+                                f"(attempt {attempt + 1}/{retries + 1}): {e}"
+                            )
+                            EmailService._close_connection(conn)
+                            conn = None
+                    
+                    results.append(result)
+            finally:
+                EmailService._close_connection(conn)
+        
+        return results
+    
+    @staticmethod
+    def _close_connection(conn) -> None:
+        """Quit an SMTP connection, ignoring errors from already-dead sockets"""
+        if conn is None:
+            return
+        try:
+            conn.__exit__(None, None, None)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def send_bulk_email(
+        recipients: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None
+    ) -> Dict:
+        """
+        Send email in recipient chunks over a small pool of SMTP connections
+        
+        Recipients are split into envelopes of MAIL_RECIPIENTS_PER_MESSAGE
+        addresses (placed in BCC when MAIL_USE_BCC is set) and the envelopes
+        are distributed over MAIL_SEND_CONCURRENCY worker threads, each of
+        which keeps one connection open for all of its chunks.
+        
+        Args:
+            recipients: List of email addresses
+            subject: Email subject
+            body: Plain text body
+            html_body: HTML body (optional)
+        
+        Returns:
+            Delivery summary dict (counts only: it is shown to every viewer
+            of the meeting, so no addresses or SMTP error texts)
+        """
+        app = current_app._get_current_object()
+        chunks = EmailService.chunk_recipients(
+            recipients, app.config['MAIL_RECIPIENTS_PER_MESSAGE']
+        )
+        
+        results: List[Dict] = []
+        if chunks:
+            workers = max(1, min(app.config['MAIL_SEND_CONCURRENCY'], len(chunks)))
+            shares = [chunks[i::workers] for i in range(workers)]
+            
+            if workers == 1:
+                results = EmailService._send_chunks(app, shares[0], subject, body, html_body)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(EmailService._send_chunks, app, share, subject, body, html_body)
+                        for share in shares
+                    ]
+                    for future in futures:
+                        results.extend(future.result())
+        
+        failed = [r for r in results if not r['sent']]
+        summary = {
+            'subject': subject,
+            'sent_at': datetime.utcnow().isoformat(),
+            'mode': 'bcc' if app.config['MAIL_USE_BCC'] else 'to',
+            'total_recipients': sum(len(c) for c in chunks),
+            'chunks': len(chunks),
+            'chunks_failed': len(failed),
+            'delivered': sum(len(r['recipients']) for r in results if r['sent']),
+            'failed': sum(len(r['recipients']) for r in failed),
+            'attempts': sum(r['attempts'] for r in results),
+        }
+        
+        if failed:
+            errors = sorted({r['error'] for r in failed if r['error']})
+            logger.error(
+                f"❌ Email '{subject}': {len(failed)}/{len(chunks)} chunk(s) failed, "
+                f"{summary['failed']} recipient(s) not reached: {'; '.join(errors)}"
+            )
+        else:
+            logger.info(
+                f"✅ Email sent to {summary['delivered']} recipient(s) "
+                f"in {len(chunks)} chunk(s): {subject}"
+            )
+        
+        return summary
+    
     @staticmethod
     def send_email(
         recipients: List[str],
@@ -28,25 +178,40 @@ class EmailService:
             html_body: HTML body (optional)
         
         Returns:
-            True if sent successfully
+            True if sent successfully to every recipient
         """
         try:
-            msg = Message(
-                subject=subject,
-                recipients=recipients,
-                body=body,
-                html=html_body,
-                sender=current_app.config['MAIL_DEFAULT_SENDER']
-            )
-            
-            mail.send(msg)
-            logger.info(f"✅ Email sent to {len(recipients)} recipient(s): {subject}")
-            return True
+            summary = EmailService.send_bulk_email(recipients, subject, body, html_body)
+            return summary['chunks'] > 0 and summary['chunks_failed'] == 0
             
         except Exception as e:
             logger.error(f"❌ Email sending failed: {e}")
             return False
     
+    @staticmethod
+    def _send_meeting_email(meeting: Meeting, kind: str, recipients: List[str], subject: str,
+                            body: str, html_body: str) -> bool:
+        """
+        Send a meeting notification and save its delivery summary on the meeting
+        
+        Summaries are kept per kind ('invitation', 'reminder'), so a
+        reminder doesn't replace the invitation's, and committed here.
+        """
+        try:
+            summary = EmailService.send_bulk_email(recipients, subject, body, html_body)
+        except Exception as e:
+            logger.error(f"❌ Email sending failed: {e}")
+            return False
+        
+        # New dict: in-place changes to a JSON column aren't tracked
+        meeting.notification_summary = {**(meeting.notification_summary or {}), kind: summary}
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"❌ Saving email summary for meeting {meeting.id} failed: {e}")
+        return summary['chunks'] > 0 and summary['chunks_failed'] == 0
+    
     @staticmethod
     def send_meeting_created(meeting: Meeting) -> bool:
         """
@@ -129,7 +294,7 @@ This is an automated message from the Meeting Management System.
 </html>
         """
         
-        return EmailService.send_email(recipients, subject, body, html_body)
+        return EmailService._send_meeting_email(meeting, 'invitation', recipients, subject, body, html_body)
     
     @staticmethod
     def send_meeting_reminder(meeting: Meeting, days_before: int) -> bool:
@@ -220,5 +385,5 @@ This is an automated reminder from the Meeting Management System.
 </html>
         """
         
-        return EmailService.send_email(recipients, subject, body, html_body)
+        return EmailService._send_meeting_email(meeting, 'reminder', recipients, subject, body, html_body)
 
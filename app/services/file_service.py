@@ -1,18 +1,89 @@
 # app/services/file_service.py
+import base64
+import hashlib
+import hmac
 import os
+import shutil
+import time
 import uuid
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 from PIL import Image
-from typing import Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.services.disk_cache import DiskCache
+from app.services.image_processing import RESIZE_FORMATS, check_pixel_limit, render_variants, render_width
+from app.services.pdf_inspector import PdfInspector
+from app.services.pdf_preview import inspect_agenda
+from app.services.storage import get_storage
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process pool for CPU-bound image work, created on first use, and the
+# threads that store its results (uploads, commits) once a job is done
+_image_pool: Optional[ProcessPoolExecutor] = None
+_finish_pool: Optional[ThreadPoolExecutor] = None
+_image_pool_lock = threading.Lock()
+
+# On-demand resize cache and the resizes currently being rendered (key -> Future)
+_image_cache: Optional[DiskCache] = None
+_resize_inflight: Dict[str, Future] = {}
+_resize_lock = threading.Lock()
+
+# Storage keys released in a transaction are deleted once it commits, and so
+# are the temp files of the upload sessions it consumed
+PENDING_DELETES_KEY = 'pending_media_deletes'
+PENDING_UPLOAD_REMOVALS_KEY = 'pending_upload_removals'
+_delete_events_registered = False
+_delete_events_lock = threading.Lock()
+
 class FileService:
     """File upload and management service"""
     
+    @staticmethod
+    def init_app(app) -> None:
+        """Hook the session events that delete released files after commit"""
+        global _delete_events_registered
+        with _delete_events_lock:
+            if _delete_events_registered:
+                return
+            event.listen(Session, 'after_commit', FileService._after_commit)
+            event.listen(Session, 'after_soft_rollback', FileService._after_rollback)
+            _delete_events_registered = True
+    
+    @staticmethod
+    def _after_commit(session: Session) -> None:
+        for tmp_path in session.info.pop(PENDING_UPLOAD_REMOVALS_KEY, ()):
+            try:
+                os.remove(tmp_path)
+            except OSError as e:
+                # Left for UploadService.purge_expired
+                logger.warning(f"⚠️  Failed to remove upload data {tmp_path}: {e}")
+        
+        pending = session.info.pop(PENDING_DELETES_KEY, None)
+        if not pending:
+            return
+        storage = get_storage()
+        for relative_path in pending:
+            try:
+                storage.delete(relative_path)
+                logger.info(f"✅ File deleted: {relative_path}")
+            except Exception as e:
+                # Left for the media GC to sweep
+                logger.error(f"❌ Failed to delete file {relative_path}: {e}")
+    
+    @staticmethod
+    def _after_rollback(session: Session, previous_transaction) -> None:
+        # The references were not released (nor the uploads consumed) after all
+        session.info.pop(PENDING_DELETES_KEY, None)
+        session.info.pop(PENDING_UPLOAD_REMOVALS_KEY, None)
+    
     @staticmethod
     def allowed_file(filename: str, allowed_extensions: set) -> bool:
         """Check if file extension is allowed"""
@@ -26,10 +97,94 @@ class FileService:
         unique_name = f"{uuid.uuid4().hex}"
         return f"{unique_name}.{ext}" if ext else unique_name
     
+    @staticmethod
+    def _stream_to_temp(file: FileStorage, directory: str,
+                        on_chunk: Optional[Callable[[bytes], None]] = None) -> Tuple[str, str, int]:
+        """
+        Stream an upload to an fsynced temp file, hashing it on the way
+        
+        Args:
+            file: Uploaded file object
+            directory: Directory for the temp file (same filesystem as the target)
+            on_chunk: Optional callback given each chunk (e.g. a validator)
+        
+        Returns:
+            Tuple of (temp_path, sha256_hex, size)
+        """
+        tmp_path = os.path.join(directory, f".upload_{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                file.stream.seek(0)
+                while True:
+                    chunk = file.stream.read(64 * 1024)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+    
+    @staticmethod
+    def _store_content_addressed(tmp_path: str, digest: str, size: int, subfolder: str, ext: str) -> str:
+        """
+        Hand a hashed temp file to storage under its content-addressed key
+        
+        If identical bytes are already stored, the temp file is discarded and
+        the existing file's reference count is incremented instead. The
+        StoredFile change is part of the caller's transaction. Two first
+        uploads of the same bytes racing each other both succeed: the one
+        that loses the insert takes a reference on the winner's row.
+        
+        Returns:
+            Relative path (e.g., "agendas/<sha256>.pdf")
+        """
+        from app.extensions import db
+        from app.models.media import StoredFile
+        
+        relative_path = f"{subfolder}/{digest}.{ext}"
+        storage = get_storage()
+        
+        stored = StoredFile.query.filter_by(path=relative_path).with_for_update().first()
+        if stored:
+            stored.ref_count = StoredFile.ref_count + 1
+            if storage.exists(relative_path):
+                os.remove(tmp_path)
+            else:
+                storage.put_file(relative_path, tmp_path)
+            logger.info(f"✅ Duplicate upload deduplicated: {relative_path}")
+        else:
+            # Same key and same bytes whoever wins, so writing is harmless
+            storage.put_file(relative_path, tmp_path)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(StoredFile(path=relative_path, sha256=digest, size=size, ref_count=1))
+            except IntegrityError:
+                # A concurrent first upload of the same content inserted the row
+                StoredFile.query.filter_by(path=relative_path).update(
+                    {'ref_count': StoredFile.ref_count + 1}, synchronize_session=False
+                )
+                logger.info(f"✅ Concurrent duplicate upload deduplicated: {relative_path}")
+        
+        db.session.flush()
+        return relative_path
+    
     @staticmethod
     def save_profile_picture(file: FileStorage, user_id: int) -> Tuple[Optional[str], Optional[str]]:
         """
-        Save profile picture with validation and optimization
+        Validate and store the original profile picture
+        
+        Only the image header is parsed here; resized variants are rendered
+        afterwards by process_profile_picture.
         
         Args:
             file: Uploaded file object
@@ -56,42 +211,301 @@ class FileService:
         if file_size > max_size:
             return None, f"File too large. Max size: {max_size // (1024*1024)} MB"
         
+        # Check it is a readable image of sane dimensions (header only, no pixel decode)
+        try:
+            with Image.open(file.stream) as image:
+                image_format = image.format
+                check_pixel_limit(image, current_app.config['MAX_IMAGE_PIXELS'])
+        except ValueError as e:
+            return None, str(e)
+        except Exception as e:
+            logger.error(f"❌ Failed to process image: {e}")
+            return None, f"Failed to process image: {str(e)}"
+        
+        if not image_format:
+            return None, "Unrecognized image format"
+        
         # Generate filename
         filename = FileService.generate_unique_filename(file.filename)
-        filepath = os.path.join(current_app.config['PROFILE_PICS_FOLDER'], filename)
+        relative_path = f"profile_pics/{filename}"
         
         # Ensure directory exists
         os.makedirs(current_app.config['PROFILE_PICS_FOLDER'], exist_ok=True)
         
+        tmp_path = None
         try:
-            # Open and process image
-            image = Image.open(file)
-            
-            # Convert RGBA/LA/P to RGB
-            if image.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'RGBA':
-                    background.paste(image, mask=image.split()[-1])
-                else:
-                    background.paste(image)
-                image = background
-            
-            # Resize if too large (max 800x800)
-            max_dimension = 800
-            if image.width > max_dimension or image.height > max_dimension:
-                image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
-            
-            # Save with optimization
-            image.save(filepath, optimize=True, quality=85)
+            tmp_path, _, _ = FileService._stream_to_temp(file, current_app.config['PROFILE_PICS_FOLDER'])
+            get_storage().put_file(relative_path, tmp_path)
             
             # Return relative path for database storage
-            relative_path = f"profile_pics/{filename}"
             logger.info(f"✅ Profile picture saved: {relative_path}")
             return relative_path, None
             
         except Exception as e:
-            logger.error(f"❌ Failed to process image: {e}")
-            return None, f"Failed to process image: {str(e)}"
+            logger.error(f"❌ Failed to save image: {e}")
+            return None, f"Failed to save image: {str(e)}"
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def _get_image_pool() -> ProcessPoolExecutor:
+        """Get (or lazily start) this process's image worker pool"""
+        global _image_pool, _finish_pool
+        if _image_pool is None:
+            with _image_pool_lock:
+                if _image_pool is None:
+                    workers = current_app.config['IMAGE_PROCESS_WORKERS']
+                    _finish_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='media-finish')
+                    _image_pool = ProcessPoolExecutor(max_workers=workers)
+        return _image_pool
+    
+    @staticmethod
+    def _submit_and_finish(description: str, finish: Callable, fn: Callable, *args) -> Future:
+        """
+        Run fn(*args) in the image pool, then finish(result) in a finishing thread
+        
+        Done-callbacks of the process pool run on its management thread,
+        which also collects every other job's result; it only hands the
+        result over here, while the storage uploads and commits in finish
+        run in _finish_pool under an app context.
+        
+        Returns:
+            Future resolved once finish has run (or the job has failed)
+        """
+        app = current_app._get_current_object()
+        finished: Future = Future()
+        
+        def run(job: Future) -> None:
+            try:
+                result = job.result()
+                with app.app_context():
+                    finish(result)
+            except Exception as e:
+                logger.error(f"❌ Failed to process {description}: {e}")
+                finished.set_exception(e)
+            else:
+                finished.set_result(None)
+        
+        job = FileService._get_image_pool().submit(fn, *args)
+        job.add_done_callback(lambda done: _finish_pool.submit(run, done))
+        return finished
+    
+    @staticmethod
+    def _apply_profile_variants(user_id: int, relative_path: str, variants: Dict[str, Dict[str, str]]) -> None:
+        """Store the rendered variants, point the profile at them and drop the original"""
+        from app.extensions import db
+        from app.models.user import UserProfile
+        
+        largest = str(max(int(size) for size in variants))
+        variant_paths = {
+            size: {fmt: f"profile_pics/{name}" for fmt, name in formats.items()}
+            for size, formats in variants.items()
+        }
+        
+        storage = get_storage()
+        scratch = current_app.config['PROFILE_PICS_FOLDER']
+        for formats in variants.values():
+            for name in formats.values():
+                storage.put_file(f"profile_pics/{name}", os.path.join(scratch, name))
+        
+        updated = UserProfile.query.filter_by(
+            user_id=user_id,
+            profile_picture=relative_path
+        ).update({
+            'profile_picture': variant_paths[largest]['jpeg'],
+            'profile_picture_variants': variant_paths,
+        }, synchronize_session='fetch')
+        db.session.commit()
+        
+        if not updated:
+            # Picture was replaced or removed while rendering
+            FileService.delete_profile_picture_files(None, variant_paths)
+        
+        FileService.delete_file(relative_path)
+        db.session.commit()
+        logger.info(f"✅ Profile picture variants ready: {relative_path}")
+    
+    @staticmethod
+    def process_profile_picture(user_id: int, relative_path: str) -> Optional[Future]:
+        """
+        Render resized WebP/JPEG variants of a stored profile picture
+        
+        Runs in the image process pool (IMAGE_PROCESS_WORKERS), or inline when
+        that is 0. Variants are rendered into PROFILE_PICS_FOLDER and then
+        handed to storage. Call after the original path has been committed;
+        once the variants exist the profile is switched to them.
+        
+        Args:
+            user_id: Owner of the picture
+            relative_path: Path returned by save_profile_picture
+        
+        Returns:
+            Future resolved once the profile points at the variants, or
+            None when run inline
+        """
+        config = current_app.config
+        src_path = get_storage().local_path(relative_path)
+        if src_path is None:
+            logger.error(f"❌ Profile picture missing from storage: {relative_path}")
+            return None
+        
+        stem = os.path.splitext(os.path.basename(relative_path))[0]
+        os.makedirs(config['PROFILE_PICS_FOLDER'], exist_ok=True)
+        args = (
+            src_path,
+            config['PROFILE_PICS_FOLDER'],
+            stem,
+            config['PROFILE_PICTURE_SIZES'],
+            85,
+            config['MAX_IMAGE_PIXELS'],
+        )
+        
+        if not config['IMAGE_PROCESS_WORKERS']:
+            FileService._apply_profile_variants(user_id, relative_path, render_variants(*args))
+            return None
+        
+        return FileService._submit_and_finish(
+            f"image {relative_path}",
+            lambda variants: FileService._apply_profile_variants(user_id, relative_path, variants),
+            render_variants, *args
+        )
+    
+    @staticmethod
+    def _get_image_cache() -> DiskCache:
+        """Get (or lazily create) this process's resized-image cache"""
+        global _image_cache
+        if _image_cache is None:
+            with _resize_lock:
+                if _image_cache is None:
+                    _image_cache = DiskCache(
+                        os.path.join(current_app.config['IMAGE_CACHE_FOLDER'], 'profile_pics'),
+                        current_app.config['IMAGE_CACHE_MAX_BYTES']
+                    )
+        return _image_cache
+    
+    @staticmethod
+    def get_resized_image(relative_path: str, width: int) -> Optional[str]:
+        """
+        Path of a profile picture scaled to the given width, rendering it on a miss
+        
+        Misses are rendered in the image process pool (inline when
+        IMAGE_PROCESS_WORKERS is 0); concurrent requests for the same
+        resize wait on a single render. Results go to the size-capped
+        IMAGE_CACHE_FOLDER, so repeat requests are served from disk.
+        
+        Args:
+            relative_path: Stored picture (e.g., "profile_pics/abc123_800.jpg")
+            width: Target width in pixels
+        
+        Returns:
+            Absolute path of the cached file, or None if the source is missing
+        
+        Raises:
+            ValueError: Unsupported format or image over MAX_IMAGE_PIXELS
+            concurrent.futures.TimeoutError: Render took longer than IMAGE_RESIZE_TIMEOUT
+        """
+        config = current_app.config
+        stem, ext = os.path.splitext(os.path.basename(relative_path))
+        output = RESIZE_FORMATS.get(ext.lstrip('.').lower())
+        if not output:
+            raise ValueError(f"Cannot resize {ext or 'extensionless'} files")
+        
+        key = f"{stem}_w{width}.{output[0]}"
+        cache = FileService._get_image_cache()
+        cached = cache.get(key)
+        if cached:
+            return cached
+        
+        src_path = get_storage().local_path(relative_path)
+        if src_path is None:
+            return None
+        
+        args = (src_path, cache.path_for(key), width, 85, config['MAX_IMAGE_PIXELS'])
+        
+        if not config['IMAGE_PROCESS_WORKERS']:
+            cache.add(key, render_width(*args))
+            return cache.path_for(key)
+        
+        def on_done(done: Future) -> None:
+            with _resize_lock:
+                _resize_inflight.pop(key, None)
+            if done.exception():
+                logger.error(f"❌ Failed to resize {relative_path}: {done.exception()}")
+                return
+            cache.add(key, done.result())
+            logger.info(f"✅ Resized {relative_path} to {width}px")
+        
+        with _resize_lock:
+            future = _resize_inflight.get(key)
+            owner = future is None
+            if owner:
+                future = FileService._get_image_pool().submit(render_width, *args)
+                _resize_inflight[key] = future
+        
+        if owner:
+            # Outside the lock: runs immediately if the render already finished
+            future.add_done_callback(on_done)
+        
+        future.result(timeout=config['IMAGE_RESIZE_TIMEOUT'])
+        return cache.path_for(key)
+    
+    @staticmethod
+    def delete_profile_picture_files(relative_path: Optional[str], variants: Optional[Dict]) -> None:
+        """Delete a profile picture and all of its rendered variants"""
+        FileService.delete_file(relative_path)
+        for formats in (variants or {}).values():
+            for path in formats.values():
+                FileService.delete_file(path)
+    
+    @staticmethod
+    def _check_agenda(path: str, inspector: PdfInspector) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Finish validating an agenda that has been fed through an inspector
+        
+        Returns:
+            Tuple of (page_count, error_message)
+        """
+        error = inspector.validate(path)
+        if error:
+            return None, error
+        
+        page_count = inspector.page_count
+        if page_count is None:
+            # Page tree is inside compressed object streams; needs a real parser
+            try:
+                import PyPDF2
+                with open(path, 'rb') as f:
+                    page_count = len(PyPDF2.PdfReader(f).pages)
+            except Exception:
+                return None, "Invalid PDF file"
+        
+        if not page_count:
+            return None, "PDF has no pages"
+        return page_count, None
+    
+    @staticmethod
+    def inspect_agenda_file(path: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+        """
+        Hash and validate an agenda already on disk (e.g. an assembled chunked upload)
+        
+        Returns:
+            Tuple of (sha256_hex, page_count, error_message)
+        """
+        inspector = PdfInspector()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                inspector.feed(chunk)
+        
+        page_count, error = FileService._check_agenda(path, inspector)
+        if error:
+            return None, None, error
+        return digest.hexdigest(), page_count, None
     
     @staticmethod
     def save_agenda(file: FileStorage, meeting_id: int) -> Tuple[Optional[str], Optional[str]]:
@@ -122,76 +536,299 @@ class FileService:
         if file_size > max_size:
             return None, f"File too large. Max size: {max_size // (1024*1024)} MB"
         
-        # Generate filename with meeting ID
         ext = file.filename.rsplit('.', 1)[1].lower()
-        filename = f"agenda_{meeting_id}_{uuid.uuid4().hex[:8]}.{ext}"
-        filepath = os.path.join(current_app.config['AGENDAS_FOLDER'], filename)
+        folder = current_app.config['AGENDAS_FOLDER']
         
         # Ensure directory exists
-        os.makedirs(current_app.config['AGENDAS_FOLDER'], exist_ok=True)
+        os.makedirs(folder, exist_ok=True)
         
+        tmp_path = None
         try:
-            # Save file
-            file.save(filepath)
+            # Save to a temp file, hashing and validating while streaming
+            inspector = PdfInspector()
+            tmp_path, digest, size = FileService._stream_to_temp(file, folder, inspector.feed)
             
-            # Validate PDF (optional)
-            try:
-                import PyPDF2
-                with open(filepath, 'rb') as f:
-                    pdf = PyPDF2.PdfReader(f)
-                    # Just check if it's a valid PDF
-                    _ = len(pdf.pages)
-            except:
-                os.remove(filepath)
-                return None, "Invalid PDF file"
+            page_count, error = FileService._check_agenda(tmp_path, inspector)
+            if error:
+                return None, error
             
-            relative_path = f"agendas/{filename}"
-            logger.info(f"✅ Agenda saved: {relative_path}")
+            # Stored once per distinct content, shared between meetings
+            relative_path = FileService._store_content_addressed(tmp_path, digest, size, 'agendas', ext)
+            logger.info(f"✅ Agenda saved for meeting {meeting_id}: {relative_path} ({page_count} pages)")
             return relative_path, None
             
         except Exception as e:
             logger.error(f"❌ Failed to save file: {e}")
             return None, f"Failed to save file: {str(e)}"
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def save_agenda_from_upload(upload_id: str, user_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Store a completed chunked upload as an agenda
+        
+        The upload session is consumed as part of the caller's transaction.
+        Storage gets a link to (or copy of) the upload's temp file, which is
+        itself only removed once that transaction commits, so after a
+        rollback the upload can still be attached.
+        
+        Args:
+            upload_id: Completed upload session owned by user_id
+            user_id: Current user
+        
+        Returns:
+            Tuple of (relative_path, error_message)
+        """
+        from app.extensions import db
+        from app.models.media import UploadSession
+        from app.services.upload_service import UploadService
+        
+        session = UploadSession.query.filter_by(id=upload_id, user_id=user_id).with_for_update().first()
+        if not session or session.purpose != UploadSession.PURPOSE_AGENDA:
+            return None, "Upload not found"
+        if session.status != UploadSession.STATUS_COMPLETE:
+            return None, "Upload is not complete"
+        
+        tmp_path = UploadService.temp_path(session.id)
+        if not os.path.exists(tmp_path):
+            return None, "Upload data is missing"
+        
+        os.makedirs(current_app.config['AGENDAS_FOLDER'], exist_ok=True)
+        # put_file consumes its source; a stray link is swept by purge_expired
+        staged = os.path.join(os.path.dirname(tmp_path), f"{uuid.uuid4().hex}.part")
+        try:
+            os.link(tmp_path, staged)
+        except OSError:
+            shutil.copyfile(tmp_path, staged)
+        relative_path = FileService._store_content_addressed(staged, session.sha256, session.total_size, 'agendas', 'pdf')
+        db.session.delete(session)
+        db.session.info.setdefault(PENDING_UPLOAD_REMOVALS_KEY, []).append(tmp_path)
+        logger.info(f"✅ Agenda saved from upload {upload_id}: {relative_path}")
+        return relative_path, None
+    
+    @staticmethod
+    def agenda_preview_path(relative_path: str) -> str:
+        """Relative path of an agenda's first-page preview (stored next to it)"""
+        stem = os.path.splitext(os.path.basename(relative_path))[0]
+        return f"agendas/{stem}_preview.png"
+    
+    @staticmethod
+    def _apply_agenda_processing(relative_path: str, preview_path: str, info: Dict) -> None:
+        """Store a rendered preview, attach it to every meeting using the agenda and index its text"""
+        from app.extensions import db
+        from app.models.meeting import Meeting
+        from app.services.agenda_search_service import AgendaSearchService
+        
+        storage = get_storage()
+        if 'width' in info:
+            # Freshly rendered into UPLOAD_FOLDER (not reused)
+            storage.put_file(preview_path, os.path.join(current_app.config['UPLOAD_FOLDER'], preview_path))
+        
+        updated = Meeting.query.filter_by(agenda=relative_path).update({
+            'agenda_preview': preview_path,
+            'agenda_page_count': info['page_count'],
+        }, synchronize_session='fetch')
+        if 'text' in info:
+            AgendaSearchService.store_text(relative_path, info['text'])
+        db.session.commit()
+        
+        if not updated and not storage.exists(relative_path):
+            # Agenda was released while rendering
+            FileService.delete_file(preview_path)
+            AgendaSearchService.remove_text(relative_path)
+            db.session.commit()
+        
+        logger.info(f"✅ Agenda processed: {relative_path} ({info['page_count']} pages)")
+    
+    @staticmethod
+    def process_agenda(relative_path: str) -> Optional[Future]:
+        """
+        Render the first-page preview, page count and search text of a stored agenda
+        
+        Runs in the image process pool (inline when IMAGE_PROCESS_WORKERS is
+        0). Call after the meeting referencing the agenda has been
+        committed. Agendas are content-addressed, so the preview and text
+        from an earlier upload of the same file are reused.
+        
+        Args:
+            relative_path: Path returned by save_agenda
+        
+        Returns:
+            Future resolved once the results are stored, or None when run
+            inline or reused
+        """
+        from app.models.media import AgendaText
+        from app.models.meeting import Meeting
+        
+        config = current_app.config
+        storage = get_storage()
+        preview_path = FileService.agenda_preview_path(relative_path)
+        
+        existing = Meeting.query.filter(
+            Meeting.agenda == relative_path,
+            Meeting.agenda_preview.isnot(None)
+        ).first()
+        if (existing
+                and storage.exists(preview_path)
+                and AgendaText.query.filter_by(path=relative_path).count()):
+            FileService._apply_agenda_processing(relative_path, preview_path, {'page_count': existing.agenda_page_count})
+            return None
+        
+        src_path = storage.local_path(relative_path)
+        if src_path is None:
+            logger.error(f"❌ Agenda missing from storage: {relative_path}")
+            return None
+        
+        os.makedirs(config['AGENDAS_FOLDER'], exist_ok=True)
+        args = (
+            src_path,
+            os.path.join(config['UPLOAD_FOLDER'], preview_path),
+            config['AGENDA_PREVIEW_WIDTH'],
+            config['AGENDA_TEXT_MAX_CHARS'],
+        )
+        
+        if not config['IMAGE_PROCESS_WORKERS']:
+            try:
+                info = inspect_agenda(*args)
+            except Exception as e:
+                logger.error(f"❌ Failed to process agenda {relative_path}: {e}")
+                return None
+            FileService._apply_agenda_processing(relative_path, preview_path, info)
+            return None
+        
+        return FileService._submit_and_finish(
+            f"agenda {relative_path}",
+            lambda info: FileService._apply_agenda_processing(relative_path, preview_path, info),
+            inspect_agenda, *args
+        )
     
     @staticmethod
     def delete_file(relative_path: str) -> bool:
         """
         Delete file from storage
         
+        For deduplicated files this drops one reference; the bytes are
+        removed when the last reference goes. Reference count changes are
+        part of the caller's transaction, and the bytes are only deleted
+        once it commits (nothing is deleted if it rolls back), so callers
+        must commit afterwards.
+        
         Args:
             relative_path: Relative path (e.g., "profile_pics/abc123.jpg")
         
         Returns:
-            True if deleted successfully
+            True if the file was released
         """
         if not relative_path:
             return True
         
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], relative_path)
+        from app.extensions import db
+        from app.models.media import StoredFile
+        from app.services.agenda_search_service import AgendaSearchService
         
         try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                logger.info(f"✅ File deleted: {relative_path}")
+            # Content-addressed files are only removed with their last reference
+            stored = StoredFile.query.filter_by(path=relative_path).with_for_update().first()
+            if stored:
+                if stored.ref_count > 1:
+                    stored.ref_count = StoredFile.ref_count - 1
+                    db.session.flush()
+                    return True
+                db.session.delete(stored)
+                db.session.flush()
+            
+            pending = db.session.info.setdefault(PENDING_DELETES_KEY, [])
+            pending.append(relative_path)
+            
+            if relative_path.startswith('agendas/') and not relative_path.endswith('_preview.png'):
+                pending.append(FileService.agenda_preview_path(relative_path))
+                AgendaSearchService.remove_text(relative_path)
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to delete file {filepath}: {e}")
+            logger.error(f"❌ Failed to delete file {relative_path}: {e}")
             return False
     
     @staticmethod
-    def get_file_url(relative_path: Optional[str]) -> Optional[str]:
+    def _media_url_key() -> bytes:
+        """HMAC key for media URLs, derived so it is never the raw SECRET_KEY"""
+        secret = current_app.config.get('MEDIA_URL_SECRET') or current_app.config['SECRET_KEY']
+        if isinstance(secret, str):
+            secret = secret.encode()
+        return hmac.new(secret, b'media-url', hashlib.sha256).digest()
+    
+    @staticmethod
+    def sign_media_path(relative_path: str, expires: int) -> str:
+        """
+        HMAC signature binding a media path to its expiry timestamp
+        
+        Query parameters other than expires are not covered: clients append
+        ?w= to a signed profile picture URL to pick a width (bounded by
+        IMAGE_RESIZE_MAX_WIDTH, resizes are cached).
+        """
+        message = f"{relative_path}\n{expires}".encode()
+        digest = hmac.new(FileService._media_url_key(), message, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest[:18]).decode()
+    
+    @staticmethod
+    def verify_media_signature(relative_path: str, expires: Optional[str], signature: Optional[str]) -> bool:
+        """
+        Check a signed media URL without touching the database
+        
+        Returns:
+            True if the signature matches and has not expired
+        """
+        try:
+            expires_at = int(expires)
+        except (TypeError, ValueError):
+            return False
+        
+        if not signature or expires_at < time.time():
+            return False
+        
+        expected = FileService.sign_media_path(relative_path, expires_at)
+        return hmac.compare_digest(expected, signature)
+    
+    @staticmethod
+    def get_file_url(relative_path: Optional[str], signed: bool = True) -> Optional[str]:
         """
         Convert relative path to full URL
         
+        Signed URLs carry an expiry and HMAC so serve_media can authorize
+        them without a JWT or user lookup. The expiry is rounded up to the
+        end of the next MEDIA_URL_TTL window, so the same URL is handed out
+        for a whole window and browsers/proxies can cache it.
+        
         Args:
             relative_path: Relative path (e.g., "profile_pics/abc123.jpg")
+            signed: Append expiry and signature query parameters
         
         Returns:
-            Full URL or None
+            Full URL, or None if there is no path or no request/server name
+            to build the URL from
         """
         if not relative_path:
             return None
         
         from flask import url_for
-        return url_for('media.serve_media', filepath=relative_path, _external=True)
-
+        params = {}
+        if signed:
+            ttl = current_app.config['MEDIA_URL_TTL']
+            expires = (int(time.time()) // ttl + 2) * ttl
+            params = {'expires': expires, 'sig': FileService.sign_media_path(relative_path, expires)}
+        
+        try:
+            return url_for('media.serve_media', filepath=relative_path, _external=True, **params)
+        except RuntimeError:
+            return None
+    
+    @staticmethod
+    def get_variant_urls(variants: Optional[Dict[str, Dict[str, str]]]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Signed URLs for each profile picture variant"""
+        if not variants:
+            return None
+        return {
+            size: {fmt: FileService.get_file_url(path) for fmt, path in formats.items()}
+            for size, formats in variants.items()
+        }
@@ -0,0 +1,154 @@
+# app/services/image_processing.py
+"""
+Image processing functions run in worker processes.
+
+Kept free of Flask/app imports so they can be pickled and executed by a
+ProcessPoolExecutor without an application context.
+"""
+from PIL import Image
+from typing import Dict, Iterable, Optional
+import os
+import uuid
+
+
+def to_rgb(image: Image.Image) -> Image.Image:
+    """Convert RGBA/LA/P images to RGB on a white background"""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def check_pixel_limit(image: Image.Image, max_pixels: Optional[int]) -> None:
+    """Guard against decompression bombs using the header dimensions"""
+    if max_pixels and image.width * image.height > max_pixels:
+        raise ValueError(
+            f"Image too large: {image.width}x{image.height} exceeds {max_pixels:,} pixels"
+        )
+
+
+def _atomic_save(image: Image.Image, path: str, **params) -> None:
+    """Write to a temp file in the same directory, then rename into place"""
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        image.save(tmp_path, **params)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_variants(
+    src_path: str,
+    dest_dir: str,
+    stem: str,
+    sizes: Iterable[int],
+    quality: int = 85,
+    max_pixels: Optional[int] = None,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Decode an image once and write WebP and JPEG variants for each size
+
+    JPEGs are decoded with draft mode at the smallest DCT scale (1/2, 1/4,
+    1/8) that still covers the largest size, so a 24 MP photo never
+    expands to a full-resolution bitmap. Sizes are then produced largest
+    first, each downscaled from the previous result.
+
+    Args:
+        src_path: Path of the stored original
+        dest_dir: Directory for the variants
+        stem: Base filename for the variants
+        sizes: Maximum edge lengths in pixels
+        quality: Encoder quality
+        max_pixels: Reject images with more pixels than this
+
+    Returns:
+        Dict of size -> {'jpeg': filename, 'webp': filename}
+
+    Raises:
+        ValueError: If the image exceeds max_pixels
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    variants: Dict[str, Dict[str, str]] = {}
+
+    with Image.open(src_path) as original:
+        check_pixel_limit(original, max_pixels)
+
+        # Decoder-level downscale; a no-op for formats other than JPEG
+        original.draft('RGB', (sizes[0], sizes[0]))
+        image = to_rgb(original)
+
+        for size in sizes:
+            if image.width > size or image.height > size:
+                image = image.copy()
+                image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+            jpeg_name = f"{stem}_{size}.jpg"
+            webp_name = f"{stem}_{size}.webp"
+            _atomic_save(image, os.path.join(dest_dir, jpeg_name), format='JPEG', optimize=True, quality=quality)
+            _atomic_save(image, os.path.join(dest_dir, webp_name), format='WEBP', quality=quality, method=4)
+
+            variants[str(size)] = {'jpeg': jpeg_name, 'webp': webp_name}
+
+    return variants
+
+
+# Source extension -> (output extension, Pillow format) for on-demand resizes
+RESIZE_FORMATS = {
+    'jpg': ('jpg', 'JPEG'),
+    'jpeg': ('jpg', 'JPEG'),
+    'png': ('png', 'PNG'),
+    'gif': ('png', 'PNG'),
+    'webp': ('webp', 'WEBP'),
+}
+
+
+def render_width(
+    src_path: str,
+    dest_path: str,
+    width: int,
+    quality: int = 85,
+    max_pixels: Optional[int] = None,
+) -> int:
+    """
+    Write a copy of an image scaled down to the given width
+
+    Images narrower than the width are re-encoded at their own size, never
+    upscaled. The output format follows dest_path's extension (see
+    RESIZE_FORMATS).
+
+    Returns:
+        Size of the written file in bytes
+
+    Raises:
+        ValueError: If the image exceeds max_pixels
+    """
+    ext = dest_path.rsplit('.', 1)[-1].lower()
+    image_format = RESIZE_FORMATS[ext][1]
+
+    with Image.open(src_path) as original:
+        check_pixel_limit(original, max_pixels)
+
+        height = max(1, round(original.height * width / original.width))
+        original.draft('RGB', (width, height))
+        image = to_rgb(original) if image_format == 'JPEG' else original.convert(
+            'RGBA' if original.mode in ('RGBA', 'LA', 'P') else 'RGB'
+        )
+
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        params = {'quality': quality}
+        if image_format == 'JPEG':
+            params['optimize'] = True
+        elif image_format == 'PNG':
+            params = {'optimize': True}
+        _atomic_save(image, dest_path, format=image_format, **params)
+
+    return os.path.getsize(dest_path)
@@ -0,0 +1,266 @@
+# app/services/media_gc_service.py
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from flask import current_app
+from sqlalchemy import func, or_
+from app.extensions import db
+from app.models.media import AgendaText, StoredFile
+from app.models.meeting import Meeting
+from app.models.user import UserProfile
+from app.services.storage import StoredObject, get_storage
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class MediaGCService:
+    """
+    Incremental garbage collector for files nothing references any more
+
+    Each run lists profile_pics/ and agendas/ from storage in key order,
+    a batch at a time, resuming from the last name recorded in a
+    checkpoint file. Every batch costs one listing call and one query;
+    names are checked against the returned paths as a set. Orphans are
+    moved under the .quarantine/ prefix first and only deleted once they
+    have sat there for MEDIA_GC_QUARANTINE_PERIOD and are still
+    unreferenced, so a wrong call can be undone by moving the file back.
+    Database records kept for a file (StoredFile, AgendaText) are only
+    dropped when it is purged, so a restored file comes back whole.
+    Content-addressed files count as referenced while their StoredFile row
+    holds references or was used within MEDIA_GC_GRACE_PERIOD: a
+    transaction that just reused one may not have committed its meeting yet.
+    """
+
+    FOLDERS = ('profile_pics', 'agendas')
+    CHECKPOINT_FILE = '.media_gc.json'
+    QUARANTINE_PREFIX = '.quarantine/'
+    PROFILE_PREFIX = 'profile_pics/'
+    STEM_LENGTH = 32  # uuid4 hex used for profile picture names
+
+    @staticmethod
+    def _stem(name: str) -> str:
+        """Base name shared by a file and its variants (abc_64.webp -> abc)"""
+        return name.split('.', 1)[0].split('_', 1)[0]
+
+    @staticmethod
+    def _referenced_profile_pics(names: List[str]) -> Set[str]:
+        """Relative paths among a batch of profile_pics/ names still in use"""
+        paths = [MediaGCService.PROFILE_PREFIX + name for name in names]
+        stems = {MediaGCService._stem(name) for name in names}
+        stem_column = func.substr(
+            UserProfile.profile_picture,
+            len(MediaGCService.PROFILE_PREFIX) + 1,
+            MediaGCService.STEM_LENGTH
+        )
+
+        referenced = set()
+        rows = db.session.query(UserProfile.profile_picture, UserProfile.profile_picture_variants).filter(
+            or_(UserProfile.profile_picture.in_(paths), stem_column.in_(stems))
+        )
+        for picture, variants in rows:
+            referenced.add(picture)
+            for formats in (variants or {}).values():
+                referenced.update(formats.values())
+        return referenced
+
+    @staticmethod
+    def _live_stored_files(paths: Set[str]) -> Set[str]:
+        """Content-addressed paths with references or recent use"""
+        if not paths:
+            return set()
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['MEDIA_GC_GRACE_PERIOD'])
+        rows = db.session.query(StoredFile.path).filter(
+            StoredFile.path.in_(paths),
+            or_(StoredFile.ref_count > 0, StoredFile.last_used_at > cutoff)
+        )
+        return {path for path, in rows}
+
+    @staticmethod
+    def _referenced_agendas(names: List[str]) -> Set[str]:
+        """Relative paths among a batch of agendas/ names still in use"""
+        paths = {f"agendas/{name}" for name in names}
+        # A preview is kept while its agenda is referenced, even before it is attached
+        owners = {f"agendas/{name[:-len('_preview.png')]}.pdf" for name in names if name.endswith('_preview.png')}
+
+        agendas = MediaGCService._live_stored_files(paths | owners)
+        previews = set()
+        rows = db.session.query(Meeting.agenda, Meeting.agenda_preview).filter(
+            or_(Meeting.agenda.in_(paths | owners), Meeting.agenda_preview.in_(paths))
+        )
+        for agenda, preview in rows:
+            agendas.add(agenda)
+            if preview:
+                previews.add(preview)
+
+        referenced = agendas | previews
+        for agenda in agendas:
+            stem = os.path.splitext(os.path.basename(agenda))[0]
+            referenced.add(f"agendas/{stem}_preview.png")
+        return referenced
+
+    @staticmethod
+    def _referenced(folder: str, names: List[str]) -> Set[str]:
+        if folder == 'profile_pics':
+            return MediaGCService._referenced_profile_pics(names)
+        return MediaGCService._referenced_agendas(names)
+
+    @staticmethod
+    def _load_checkpoint(path: str) -> Dict[str, str]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_checkpoint(path: str, checkpoint: Dict[str, str]) -> None:
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _release_records(relative_paths: Iterable[str]) -> None:
+        """Drop database records that only existed for purged files"""
+        relative_paths = list(relative_paths)
+        if not relative_paths:
+            return
+        StoredFile.query.filter(StoredFile.path.in_(relative_paths)).delete(synchronize_session=False)
+        AgendaText.query.filter(AgendaText.path.in_(relative_paths)).delete(synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def _sweep_batch(folder: str, objects: List[StoredObject], stats: Dict[str, int]) -> None:
+        """Quarantine the unreferenced, old-enough files of one batch"""
+        storage = get_storage()
+        cutoff = time.time() - current_app.config['MEDIA_GC_GRACE_PERIOD']
+        names = [obj.key[len(folder) + 1:] for obj in objects]
+
+        referenced = MediaGCService._referenced(folder, [n for n in names if not n.endswith('.tmp')])
+        orphans = []
+
+        for obj in objects:
+            # Skip files younger than the grace period (uploads in flight)
+            if obj.key in referenced or obj.modified > cutoff:
+                continue
+            try:
+                storage.move(obj.key, MediaGCService.QUARANTINE_PREFIX + obj.key)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"❌ Failed to quarantine {obj.key}: {e}")
+                continue
+            orphans.append(obj.key)
+
+        stats['scanned'] += len(objects)
+        stats['quarantined'] += len(orphans)
+
+    @staticmethod
+    def purge_quarantine(stats: Dict[str, int]) -> None:
+        """
+        Delete quarantined files past MEDIA_QUARANTINE_PERIOD
+
+        Files that became referenced again meanwhile are moved back instead
+        (unless the path has been re-created since). Database records are
+        released for the files deleted as unreferenced.
+        """
+        config = current_app.config
+        storage = get_storage()
+        cutoff = time.time() - config['MEDIA_GC_QUARANTINE_PERIOD']
+        batch_size = config['MEDIA_GC_BATCH_SIZE']
+
+        for folder in MediaGCService.FOLDERS:
+            prefix = f"{MediaGCService.QUARANTINE_PREFIX}{folder}/"
+            after = ''
+            while True:
+                listed = storage.list(prefix, start_after=after, limit=batch_size)
+                if not listed:
+                    break
+                after = listed[-1].key
+
+                expired = [obj.key[len(MediaGCService.QUARANTINE_PREFIX):] for obj in listed if obj.modified <= cutoff]
+                referenced = MediaGCService._referenced(folder, [path[len(folder) + 1:] for path in expired])
+                released = []
+
+                for relative_path in expired:
+                    source = MediaGCService.QUARANTINE_PREFIX + relative_path
+                    try:
+                        if relative_path not in referenced:
+                            storage.delete(source)
+                            released.append(relative_path)
+                            stats['purged'] += 1
+                        elif not storage.exists(relative_path):
+                            storage.move(source, relative_path)
+                            stats['restored'] += 1
+                            logger.warning(f"⚠️ Restored referenced file from quarantine: {relative_path}")
+                        else:
+                            # Re-created meanwhile; its records belong to the new copy
+                            storage.delete(source)
+                            stats['purged'] += 1
+                    except Exception as e:
+                        logger.error(f"❌ Failed to purge {relative_path}: {e}")
+
+                MediaGCService._release_records(released)
+
+    @staticmethod
+    def run(max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Sweep the next batches of media files, resuming from the checkpoint
+
+        Args:
+            max_batches: Batches to process this run (MEDIA_GC_MAX_BATCHES)
+
+        Returns:
+            Stats: scanned, quarantined, purged, restored, passes_completed, expired_uploads
+        """
+        config = current_app.config
+        batch_size = config['MEDIA_GC_BATCH_SIZE']
+        batches_left = max_batches or config['MEDIA_GC_MAX_BATCHES']
+        checkpoint_path = os.path.join(config['UPLOAD_FOLDER'], MediaGCService.CHECKPOINT_FILE)
+        checkpoint = MediaGCService._load_checkpoint(checkpoint_path)
+        stats = {'scanned': 0, 'quarantined': 0, 'purged': 0, 'restored': 0, 'passes_completed': 0}
+
+        storage = get_storage()
+        for folder in MediaGCService.FOLDERS:
+            if batches_left <= 0:
+                continue
+
+            prefix = f"{folder}/"
+            after = checkpoint.get(folder, '')
+            finished = False
+
+            while batches_left > 0:
+                objects = storage.list(prefix, start_after=prefix + after if after else '', limit=batch_size)
+                if not objects:
+                    finished = True
+                    break
+                MediaGCService._sweep_batch(folder, objects, stats)
+                after = objects[-1].key[len(prefix):]
+                checkpoint[folder] = after
+                MediaGCService._save_checkpoint(checkpoint_path, checkpoint)
+                batches_left -= 1
+                if len(objects) < batch_size:
+                    finished = True
+                    break
+
+            if finished:
+                # Pass over this folder finished; start from the top next time
+                checkpoint[folder] = ''
+                MediaGCService._save_checkpoint(checkpoint_path, checkpoint)
+                stats['passes_completed'] += 1
+
+        MediaGCService.purge_quarantine(stats)
+
+        from app.services.upload_service import UploadService
+        uploads = UploadService.purge_expired()
+        stats['expired_uploads'] = uploads['sessions']
+
+        logger.info(
+            f"🧹 Media GC: scanned {stats['scanned']}, quarantined {stats['quarantined']}, "
+            f"purged {stats['purged']}, restored {stats['restored']}"
+        )
+        return stats
@@ -1,8 +1,9 @@
 # app/services/meeting_service.py
 from app.extensions import db
+from app.models.calendar_sync import CalendarSyncJob
 from app.models.meeting import Meeting
 from app.models.user import User
-from app.services.calendar_service import CalendarService
+from app.services.calendar_sync_service import CalendarSyncService
 from app.services.email_service import EmailService
 from app.services.file_service import FileService
 from datetime import datetime, date, timedelta
@@ -12,6 +13,31 @@ from sqlalchemy import and_, or_
 class MeetingService:
     """Business logic for meeting management"""
     
+    @staticmethod
+    def _save_new_agenda(meeting: Meeting, data: Dict, files: Optional[Dict]) -> Optional[str]:
+        """
+        Store the agenda sent with a request, if any
+        
+        Either a finished chunked upload (data['agenda_upload_id'], owned by
+        data['uploaded_by']) or a multipart 'agenda' file.
+        
+        Returns:
+            Relative path of the stored agenda, or None if none was sent
+        
+        Raises:
+            ValueError: If the agenda could not be stored
+        """
+        if data.get('agenda_upload_id'):
+            relative_path, error = FileService.save_agenda_from_upload(data['agenda_upload_id'], data.get('uploaded_by'))
+        elif files and 'agenda' in files and files['agenda'].filename:
+            relative_path, error = FileService.save_agenda(files['agenda'], meeting.id)
+        else:
+            return None
+        
+        if error:
+            raise ValueError(f"Agenda upload failed: {error}")
+        return relative_path
+    
     @staticmethod
     def create_meeting(data: Dict, files: Dict) -> Meeting:
         """
@@ -19,6 +45,7 @@ class MeetingService:
         
         Args:
             data: Dictionary with title, date, time, attendee_ids
+                  (optionally agenda_upload_id and uploaded_by)
             files: Dictionary with uploaded files
         
         Returns:
@@ -58,30 +85,26 @@ class MeetingService:
         db.session.flush()
         
         # Handle agenda upload
-        if 'agenda' in files and files['agenda'].filename:
-            agenda_file = files['agenda']
-            relative_path, error = FileService.save_agenda(agenda_file, meeting.id)
-            
-            if error:
-                db.session.rollback()
-                raise ValueError(f"Agenda upload failed: {error}")
-            
+        try:
+            relative_path = MeetingService._save_new_agenda(meeting, data, files)
+        except ValueError:
+            db.session.rollback()
+            raise
+        
+        if relative_path:
             meeting.agenda = relative_path
         
+        # Google Calendar event is created by the sync worker
+        CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_CREATE)
+        
         db.session.commit()
         
-        # Background integrations (don't fail the meeting creation)
-        try:
-            # Create Google Calendar event
-            google_event_id = CalendarService.create_event(meeting)
-            if google_event_id:
-                meeting.google_event_id = google_event_id
-                db.session.commit()
-        except Exception as e:
-            print(f"⚠️  Google Calendar sync failed: {e}")
+        if meeting.agenda:
+            FileService.process_agenda(meeting.agenda)
         
+        # Background integrations (don't fail the meeting creation)
         try:
-            # Send email notifications
+            # Send email notifications (saves the delivery summary)
             EmailService.send_meeting_created(meeting)
         except Exception as e:
             print(f"⚠️  Email notification failed: {e}")
@@ -127,29 +150,22 @@ class MeetingService:
             meeting.attendees.extend(attendees)
         
         # Update agenda if new file provided
-        if files and 'agenda' in files and files['agenda'].filename:
-            # Delete old agenda
+        relative_path = MeetingService._save_new_agenda(meeting, data, files)
+        if relative_path:
+            # Release old agenda (only once the new one is stored)
             if meeting.agenda:
                 FileService.delete_file(meeting.agenda)
             
-            # Save new agenda
-            agenda_file = files['agenda']
-            relative_path, error = FileService.save_agenda(agenda_file, meeting.id)
-            
-            if error:
-                raise ValueError(f"Agenda upload failed: {error}")
-            
             meeting.agenda = relative_path
+            meeting.agenda_preview = None
+            meeting.agenda_page_count = None
         
         meeting.updated_at = datetime.utcnow()
+        CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
         db.session.commit()
         
-        # Update Google Calendar event
-        try:
-            if meeting.google_event_id:
-                CalendarService.update_event(meeting)
-        except Exception as e:
-            print(f"⚠️  Google Calendar update failed: {e}")
+        if meeting.agenda and not meeting.agenda_preview:
+            FileService.process_agenda(meeting.agenda)
         
         return meeting
     
@@ -173,11 +189,7 @@ class MeetingService:
             FileService.delete_file(meeting.agenda)
         
         # Delete Google Calendar event
-        try:
-            if meeting.google_event_id:
-                CalendarService.delete_event(meeting.google_event_id)
-        except Exception as e:
-            print(f"⚠️  Google Calendar deletion failed: {e}")
+        CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_DELETE)
         
         # Delete from database
         db.session.delete(meeting)
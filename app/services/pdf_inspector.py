@@ -0,0 +1,120 @@
+# app/services/pdf_inspector.py
+import re
+from typing import Optional
+
+# Page tree node: /Type /Pages ... /Count N (either order, no nested dicts between)
+PAGES_COUNT_RE = re.compile(
+    rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b'
+)
+# Leaf page objects (/Type /Page, not /Pages)
+PAGE_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+# Indirect object header ("12 0 obj")
+OBJ_RE = re.compile(rb'(?<![0-9])(\d+)\s+\d+\s+obj\b')
+# Document catalog and the page tree root it points at
+CATALOG_PAGES_RE = re.compile(
+    rb'/Type\s*/Catalog\b[^>]*?/Pages\s+(\d+)\s+\d+\s+R|/Pages\s+(\d+)\s+\d+\s+R[^>]*?/Type\s*/Catalog\b'
+)
+STARTXREF_RE = re.compile(rb'startxref\s+(\d+)\s+%%EOF')
+XREF_TARGET_RE = re.compile(rb'\s*(xref|\d+\s+\d+\s+obj)')
+
+
+class PdfInspector:
+    """
+    Incremental PDF sanity checker fed while an upload is streamed
+
+    Checks the header magic, the trailer (startxref pointing at an xref
+    table or stream) and counts pages from the page tree, without building
+    an object graph. Incremental updates re-emit objects, so the last
+    definition of each page tree node wins. PDFs whose page tree lives in
+    compressed object streams report page_count as None.
+    """
+
+    HEADER_WINDOW = 1024  # Spec allows leading junk before %PDF-
+    # Kept from the end of the data: searched for the trailer and carried
+    # into the next chunk so tokens split across chunks are found (a
+    # /Pages node with a long /Kids array spans a few KiB)
+    TAIL_WINDOW = 4096
+
+    def __init__(self):
+        self.size = 0
+        self.header_ok = False
+        self._head = b''
+        self._tail = b''
+        self._object = None  # Number of the object being read
+        self._tree_counts = {}  # Page tree node object number -> /Count
+        self._root = None  # Page tree root named by the (last) catalog
+        self._leaf_pages = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Inspect the next chunk of the file"""
+        if not self.header_ok and len(self._head) < self.HEADER_WINDOW:
+            self._head += chunk[:self.HEADER_WINDOW]
+            self.header_ok = b'%PDF-' in self._head[:self.HEADER_WINDOW]
+
+        # Carry the end of the previous data so tokens split across chunks
+        # are found; only use matches that end in the new data
+        window = self._tail + chunk
+        carried = len(window) - len(chunk)
+
+        tokens = sorted(
+            [(m.start(), 'obj', m) for m in OBJ_RE.finditer(window) if m.end() > carried]
+            + [(m.start(), 'pages', m) for m in PAGES_COUNT_RE.finditer(window) if m.end() > carried]
+            + [(m.start(), 'catalog', m) for m in CATALOG_PAGES_RE.finditer(window) if m.end() > carried],
+            key=lambda token: token[0]
+        )
+        for _, kind, match in tokens:
+            if kind == 'obj':
+                self._object = int(match.group(1))
+            elif kind == 'pages':
+                self._tree_counts[self._object] = int(match.group(1) or match.group(2))
+            else:
+                self._root = int(match.group(1) or match.group(2))
+
+        self._leaf_pages += sum(1 for m in PAGE_RE.finditer(window) if m.end() > carried)
+
+        self._tail = (self._tail + chunk)[-self.TAIL_WINDOW:]
+        self.size += len(chunk)
+
+    @property
+    def startxref(self) -> Optional[int]:
+        """Offset of the cross-reference section from the trailer"""
+        matches = STARTXREF_RE.findall(self._tail)
+        return int(matches[-1]) if matches else None
+
+    @property
+    def page_count(self) -> Optional[int]:
+        """
+        Page count from the page tree root's /Count
+
+        Falls back to the largest node /Count when the catalog wasn't
+        found, and to counting leaf page objects only when no page tree
+        node was seen at all.
+        """
+        if self._root in self._tree_counts:
+            return self._tree_counts[self._root] or None
+        if self._tree_counts:
+            return max(self._tree_counts.values()) or None
+        return self._leaf_pages or None
+
+    def validate(self, path: str) -> Optional[str]:
+        """
+        Finish validation against the stored file
+
+        Reads only the few bytes at the startxref offset.
+
+        Returns:
+            Error message, or None if the file looks like a valid PDF
+        """
+        if not self.header_ok:
+            return "Not a PDF file"
+
+        offset = self.startxref
+        if offset is None or offset >= self.size:
+            return "Invalid PDF file"
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            if not XREF_TARGET_RE.match(f.read(64)):
+                return "Invalid PDF file"
+
+        return None
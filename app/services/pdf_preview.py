@@ -0,0 +1,153 @@
+# app/services/pdf_preview.py
+"""
+First-page previews for agenda PDFs, run in worker processes.
+
+There is no PDF rasterizer in the dependency set, so pages are
+approximated with PyPDF2 + Pillow: a page that is mostly one embedded
+image (a scanned agenda) is previewed by that image; otherwise the text
+runs are drawn at their positions on a blank page. Kept free of
+Flask/app imports like image_processing.
+"""
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+import math
+
+from PIL import Image, ImageDraw, ImageFont
+from PyPDF2 import PdfReader
+
+from app.services.image_processing import _atomic_save, to_rgb
+
+TEXT_COLOR = (40, 40, 40)
+MIN_FONT_PX = 4
+
+
+def _multiply(m: List[float], n: List[float]) -> List[float]:
+    """Product of two PDF affine matrices [a b c d e f]"""
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+def _text_runs(page) -> List[Tuple[float, float, float, str]]:
+    """(x, y, size, text) for each text run on the page; position and size in page units"""
+    runs = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        text = text.strip()
+        if not text:
+            return
+        m = _multiply(tm, cm)
+        size = (font_size or 12) * (math.hypot(m[2], m[3]) or 1)
+        runs.append((m[4], m[5], size, text))
+
+    try:
+        page.extract_text(visitor_text=visitor)
+    except Exception:  # Broken content stream or no /Resources: draw what was read
+        pass
+    return runs
+
+
+def _largest_image(page, min_area: float) -> Optional[Image.Image]:
+    """The page's biggest embedded image if it covers at least min_area pixels"""
+    try:
+        image_files = page.images
+    except Exception:  # No /Resources, or a broken XObject dictionary
+        return None
+    best = None
+    for image_file in image_files:
+        try:
+            image = Image.open(BytesIO(image_file.data))
+            image.load()
+        except Exception:
+            continue
+        if image.width * image.height >= min_area and (
+            best is None or image.width * image.height > best.width * best.height
+        ):
+            best = image
+    return best
+
+
+def _render_preview(reader: PdfReader, dest_path: str, width: int) -> Dict[str, int]:
+    """Write a PNG preview of the first page of an open PDF"""
+    page_count = len(reader.pages)
+    page = reader.pages[0]
+
+    box = page.mediabox
+    page_width, page_height = float(box.width) or 612.0, float(box.height) or 792.0
+    scale = width / page_width
+    canvas = Image.new('RGB', (width, max(1, round(page_height * scale))), (255, 255, 255))
+
+    scan = _largest_image(page, min_area=(width * canvas.height) / 4)
+    if scan is not None:
+        scan = to_rgb(scan)
+        scan.thumbnail(canvas.size, Image.Resampling.LANCZOS)
+        canvas.paste(scan, ((canvas.width - scan.width) // 2, (canvas.height - scan.height) // 2))
+    else:
+        draw = ImageDraw.Draw(canvas)
+        fonts: Dict[int, ImageFont.ImageFont] = {}
+        for x, y, size, text in _text_runs(page):
+            px = max(MIN_FONT_PX, round(size * scale))
+            if px not in fonts:
+                try:
+                    fonts[px] = ImageFont.load_default(size=px)
+                except (TypeError, OSError):  # Bitmap fallback without FreeType
+                    fonts[px] = ImageFont.load_default()
+            top = (page_height - (y - float(box.bottom))) * scale - px
+            draw.text(((x - float(box.left)) * scale, top), text, fill=TEXT_COLOR, font=fonts[px])
+
+    rotation = (page.get('/Rotate') or 0) % 360
+    if rotation:
+        canvas = canvas.rotate(-rotation, expand=True)
+
+    _atomic_save(canvas, dest_path, format='PNG', optimize=True)
+    return {'page_count': page_count, 'width': canvas.width, 'height': canvas.height}
+
+
+def extract_text(reader: PdfReader, max_chars: int) -> str:
+    """Text of all pages, in order, stopping once max_chars is reached"""
+    parts = []
+    total = 0
+    for page in reader.pages:
+        try:
+            text = page.extract_text() or ''
+        except Exception:  # Broken content stream on one page
+            continue
+        parts.append(text)
+        total += len(text)
+        if total >= max_chars:
+            break
+    # NUL is valid in PDF strings but not in Postgres text
+    return '\n'.join(parts)[:max_chars].replace('\x00', '')
+
+
+def render_first_page(src_path: str, dest_path: str, width: int = 320) -> Dict[str, int]:
+    """
+    Write a PNG preview of a PDF's first page
+
+    Args:
+        src_path: Stored agenda PDF
+        dest_path: Where to write the preview
+        width: Preview width in pixels; height follows the page aspect ratio
+
+    Returns:
+        {'page_count': n, 'width': w, 'height': h}
+    """
+    return _render_preview(PdfReader(src_path), dest_path, width)
+
+
+def inspect_agenda(src_path: str, dest_path: str, width: int = 320, max_chars: int = 200_000) -> Dict:
+    """
+    Render the first-page preview and extract the text of an agenda in one parse
+
+    Returns:
+        {'page_count': n, 'width': w, 'height': h, 'text': str}
+    """
+    reader = PdfReader(src_path)
+    info: Dict = _render_preview(reader, dest_path, width)
+    info['text'] = extract_text(reader, max_chars)
+    return info
@@ -0,0 +1,168 @@
+# app/services/reference_cache.py
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Callable, Dict
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.utils.compression import attach_precompressed
+from app.utils.msgpack_support import MSGPACK_MIMETYPE, packb, wants_msgpack
+from app.models.department import (
+    Faculty,
+    AcademicDepartment,
+    AdminCategory,
+    AdministrativeDepartment,
+    Title
+)
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_MODELS = (Faculty, AcademicDepartment, AdminCategory, AdministrativeDepartment, Title)
+MAX_ENTRIES = 256  # Keys include query filters; bounds what odd ids can pile up
+
+# Per-process cache: key -> CachedPayload, valid while its version is current
+_entries: Dict[str, "CachedPayload"] = {}
+_version = 0
+_lock = threading.Lock()
+_events_registered = False
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """A serialized success_response body, its strong ETag and encoded copies"""
+    body: bytes
+    etag: str
+    mimetype: str
+    version: int
+    built_at: float
+    compressed: Dict[str, bytes] = field(default_factory=dict)  # Filled by compress_response
+
+
+class ReferenceCache:
+    """
+    Per-process cache of serialized reference data (faculties, departments, titles)
+
+    Bodies are built once per version with the same JSON provider as
+    success_response and kept as bytes. Commits that touch a reference
+    model bump the version in this process; writes made by other
+    processes are picked up after REFERENCE_CACHE_TTL.
+    """
+
+    @staticmethod
+    def init_app(app) -> None:
+        """Hook SQLAlchemy session events that invalidate the cache"""
+        global _events_registered
+        with _lock:
+            if _events_registered:
+                return
+            event.listen(Session, 'after_flush', ReferenceCache._after_flush)
+            event.listen(Session, 'after_bulk_update', ReferenceCache._after_bulk)
+            event.listen(Session, 'after_bulk_delete', ReferenceCache._after_bulk)
+            event.listen(Session, 'after_commit', ReferenceCache._after_commit)
+            event.listen(Session, 'after_soft_rollback', ReferenceCache._after_rollback)
+            _events_registered = True
+
+    @staticmethod
+    def _after_flush(session: Session, flush_context) -> None:
+        changed = any(
+            isinstance(obj, REFERENCE_MODELS)
+            for obj in chain(session.new, session.deleted)
+        ) or any(
+            # Relationship-only changes (e.g. a profile gaining a title) don't count
+            isinstance(obj, REFERENCE_MODELS) and session.is_modified(obj, include_collections=False)
+            for obj in session.dirty
+        )
+        if changed:
+            session.info['reference_data_changed'] = True
+
+    @staticmethod
+    def _after_bulk(context) -> None:
+        if issubclass(context.mapper.class_, REFERENCE_MODELS):
+            context.session.info['reference_data_changed'] = True
+
+    @staticmethod
+    def _after_commit(session: Session) -> None:
+        if session.info.pop('reference_data_changed', False):
+            ReferenceCache.invalidate()
+
+    @staticmethod
+    def _after_rollback(session: Session, previous_transaction) -> None:
+        session.info.pop('reference_data_changed', None)
+
+    @staticmethod
+    def version() -> int:
+        return _version
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop every cached body (bumps the version)"""
+        global _version
+        with _lock:
+            _version += 1
+            _entries.clear()
+        logger.info(f"🧹 Reference data cache invalidated (version {_version})")
+
+    @staticmethod
+    def get(key: str, build: Callable[[], Any], as_msgpack: bool = False) -> CachedPayload:
+        """
+        Cached body for key, building it from build() on a miss
+
+        Args:
+            key: Cache key, including any query filters
+            build: Returns the response data (called at most once per version and format)
+            as_msgpack: Cache the MessagePack body instead of the JSON one
+        """
+        if as_msgpack:
+            key = f"{key}:msgpack"
+        ttl = current_app.config['REFERENCE_CACHE_TTL']
+        entry = _entries.get(key)
+        if entry and entry.version == _version and time.monotonic() - entry.built_at < ttl:
+            return entry
+
+        version = _version
+        # Same bytes success_response would send
+        payload = {'success': True, 'data': build()}
+        if as_msgpack:
+            body, mimetype = packb(payload), MSGPACK_MIMETYPE
+        else:
+            body, mimetype = current_app.json.response(payload).get_data(), current_app.json.mimetype
+        entry = CachedPayload(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            mimetype=mimetype,
+            version=version,
+            built_at=time.monotonic(),
+        )
+
+        with _lock:
+            if version == _version:
+                if len(_entries) >= MAX_ENTRIES:
+                    _entries.clear()
+                _entries[key] = entry
+        return entry
+
+    @staticmethod
+    def response(key: str, build: Callable[[], Any]):
+        """
+        Cached JSON (or MessagePack) response for key with a strong ETag
+
+        A cache hit answers If-None-Match with 304 without querying or
+        serializing anything (beyond the route's active-user check). A miss (TTL expiry, new worker process,
+        invalidation) runs build() first, even when the client's ETag
+        turns out to match. gzip/brotli bodies are compressed once per
+        entry.
+        """
+        entry = ReferenceCache.get(key, build, as_msgpack=wants_msgpack())
+        response = current_app.response_class(entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        response.vary.add('Accept')
+        # Clients may keep it but must revalidate; a 304 costs no reference queries
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        # Compressed once per entry and encoding, then reused
+        attach_precompressed(response, entry.compressed)
+        return response.make_conditional(request)
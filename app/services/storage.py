@@ -0,0 +1,326 @@
+# app/services/storage.py
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import IO, List, Optional
+from flask import current_app
+from app.services.disk_cache import DiskCache
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+_storage_lock = threading.Lock()
+
+
+@dataclass
+class StoredObject:
+    """One stored file as returned by StorageBackend.list/stat"""
+    key: str
+    size: int
+    modified: float  # epoch seconds
+
+
+class StorageBackend(ABC):
+    """
+    Where uploaded media lives
+
+    Keys are the relative paths kept in the database (e.g.
+    "profile_pics/abc123.jpg", "agendas/<sha256>.pdf"). Uploads are
+    streamed to a local temp file first, because they are hashed and
+    validated before their key is known; variants and previews are
+    rendered to scratch files. Both are handed over with put_file, which
+    consumes the source. Code that needs a real path (Pillow, PyPDF2)
+    asks for local_path; serving streams with open.
+    """
+
+    is_local = False
+
+    @abstractmethod
+    def put_file(self, key: str, src_path: str) -> None:
+        """Store a local file under key; src_path is moved or removed"""
+
+    @abstractmethod
+    def open(self, key: str) -> IO[bytes]:
+        """
+        Streaming read handle for a stored file
+
+        Raises:
+            FileNotFoundError: No such key
+        """
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[StoredObject]:
+        """Size and modification time, or None if missing"""
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a stored file (missing keys are ignored)"""
+
+    @abstractmethod
+    def move(self, src_key: str, dst_key: str) -> None:
+        """Rename a stored file; the destination's modified time is reset"""
+
+    @abstractmethod
+    def list(self, prefix: str, start_after: str = '', limit: int = 1000) -> List[StoredObject]:
+        """Files whose key starts with prefix, in key order, after start_after"""
+
+    @abstractmethod
+    def local_path(self, key: str) -> Optional[str]:
+        """Path of the file on this host (fetched if needed), or None if missing"""
+
+    def cached_path(self, key: str) -> Optional[str]:
+        """Path of the file if it is already on this host, without fetching it"""
+        return None
+
+    def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """Time-limited direct download URL, if the backend has them"""
+        return None
+
+
+class LocalStorage(StorageBackend):
+    """Files under a directory on this host (UPLOAD_FOLDER)"""
+
+    is_local = True
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_file(self, key: str, src_path: str) -> None:
+        dest = self.path(key)
+        if os.path.abspath(src_path) == dest:
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # Rename when on the same filesystem, copy otherwise
+        shutil.move(src_path, dest)
+
+    def open(self, key: str) -> IO[bytes]:
+        return open(self.path(key), 'rb')
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            st = os.stat(self.path(key))
+        except FileNotFoundError:
+            return None
+        return StoredObject(key=key, size=st.st_size, modified=st.st_mtime)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def move(self, src_key: str, dst_key: str) -> None:
+        dest = self.path(dst_key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.move(self.path(src_key), dest)
+        os.utime(dest)
+
+    def list(self, prefix: str, start_after: str = '', limit: int = 1000) -> List[StoredObject]:
+        # Prefixes are folder-shaped ("profile_pics/"), as everywhere in the app
+        directory = self.path(prefix) if prefix.strip('/') else self.root
+        if not os.path.isdir(directory):
+            return []
+
+        after = start_after[len(prefix):] if start_after.startswith(prefix) else ''
+        objects = []
+        for entry in os.scandir(directory):
+            if entry.name > after and entry.is_file():
+                objects.append(entry)
+        objects.sort(key=lambda entry: entry.name)
+
+        result = []
+        for entry in objects[:limit]:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            result.append(StoredObject(key=prefix + entry.name, size=st.st_size, modified=st.st_mtime))
+        return result
+
+    def local_path(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        return path if os.path.exists(path) else None
+
+    def cached_path(self, key: str) -> Optional[str]:
+        return self.local_path(key)
+
+
+class S3Storage(StorageBackend):
+    """
+    Files in an S3-compatible bucket (AWS S3, MinIO, Ceph, ...)
+
+    Uploads and downloads are streamed by boto3's transfer manager
+    (multipart above its threshold); open streams the object body
+    without touching the disk. local_path downloads through a
+    size-capped read-through DiskCache, so repeated processing or
+    serving of the same file hits the network once; files this process
+    just stored are seeded into the cache instead of being re-downloaded.
+    Set S3_ENDPOINT_URL to point at a local stand-in (MinIO, moto server)
+    during development.
+    """
+
+    def __init__(self, bucket: str, cache: DiskCache, key_prefix: str = '', endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, access_key: Optional[str] = None, secret_key: Optional[str] = None):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+
+        self.bucket = bucket
+        self.key_prefix = key_prefix
+        self.cache = cache
+        self._client_error = ClientError
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+        )
+
+    def _key(self, key: str) -> str:
+        return self.key_prefix + key
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = error.response.get('Error', {}).get('Code')
+        return code in ('404', 'NoSuchKey', 'NotFound')
+
+    def _extra_args(self, key: str) -> dict:
+        content_type = mimetypes.guess_type(key)[0]
+        return {'ContentType': content_type} if content_type else {}
+
+    def put_file(self, key: str, src_path: str) -> None:
+        self.client.upload_file(src_path, self.bucket, self._key(key), ExtraArgs=self._extra_args(key))
+
+        # Keep the bytes as the cached copy; processing usually reads them next
+        size = os.path.getsize(src_path)
+        cached = self.cache.path_for(key)
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        shutil.move(src_path, cached)
+        self.cache.add(key, size)
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))['Body']
+        except self._client_error as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except self._client_error as e:
+            if self._is_missing(e):
+                return None
+            raise
+        return StoredObject(key=key, size=head['ContentLength'], modified=head['LastModified'].timestamp())
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        self.cache.discard(key)
+
+    def move(self, src_key: str, dst_key: str) -> None:
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=self._key(dst_key),
+            CopySource={'Bucket': self.bucket, 'Key': self._key(src_key)},
+        )
+        self.delete(src_key)
+
+    def list(self, prefix: str, start_after: str = '', limit: int = 1000) -> List[StoredObject]:
+        params = {'Bucket': self.bucket, 'Prefix': self._key(prefix), 'MaxKeys': limit}
+        if start_after:
+            params['StartAfter'] = self._key(start_after)
+        response = self.client.list_objects_v2(**params)
+        return [
+            StoredObject(
+                key=item['Key'][len(self.key_prefix):],
+                size=item['Size'],
+                modified=item['LastModified'].timestamp(),
+            )
+            for item in response.get('Contents', [])
+        ]
+
+    def cached_path(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+
+        path = self.cache.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            self.client.download_file(self.bucket, self._key(key), tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except self._client_error as e:
+            if self._is_missing(e):
+                return None
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self.cache.add(key, size)
+        return path
+
+    def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': self._key(key)},
+            ExpiresIn=expires_in,
+        )
+
+
+def create_storage(config) -> StorageBackend:
+    """Build the backend selected by STORAGE_BACKEND"""
+    backend = config['STORAGE_BACKEND'].lower()
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 's3':
+        return S3Storage(
+            bucket=config['S3_BUCKET'],
+            cache=DiskCache(config['STORAGE_CACHE_FOLDER'], config['STORAGE_CACHE_MAX_BYTES']),
+            key_prefix=config['S3_KEY_PREFIX'],
+            endpoint_url=config['S3_ENDPOINT_URL'],
+            region=config['S3_REGION'],
+            access_key=config['S3_ACCESS_KEY_ID'],
+            secret_key=config['S3_SECRET_ACCESS_KEY'],
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {config['STORAGE_BACKEND']}")
+
+
+def get_storage() -> StorageBackend:
+    """The current app's storage backend, created on first use"""
+    app = current_app._get_current_object()
+    storage = app.extensions.get('storage')
+    if storage is None:
+        with _storage_lock:
+            storage = app.extensions.get('storage')
+            if storage is None:
+                storage = app.extensions['storage'] = create_storage(app.config)
+                logger.info(f"✅ Storage backend: {type(storage).__name__}")
+    return storage
@@ -0,0 +1,184 @@
+# app/services/upload_service.py
+from datetime import datetime, timedelta
+from typing import IO, Dict, Optional
+from flask import current_app
+from app.extensions import db
+from app.models.media import UploadSession
+from app.services.file_service import FileService
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+CHUNK_READ_SIZE = 64 * 1024
+
+
+class UploadConflict(ValueError):
+    """Chunk offset does not match the bytes received so far"""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+
+class UploadService:
+    """
+    Resumable chunked uploads (init / append / complete)
+
+    Chunks are streamed from the request body straight into a temp file at
+    their offset, so nothing is spooled by Werkzeug and an interrupted
+    upload resumes from the last stored offset. The file is validated once
+    on completion and then attached by id (e.g. agenda_upload_id).
+    """
+
+    @staticmethod
+    def temp_path(upload_id: str) -> str:
+        return os.path.join(current_app.config['UPLOAD_SESSIONS_FOLDER'], f"{upload_id}.part")
+
+    @staticmethod
+    def create_session(user_id: int, filename: str, total_size: int,
+                       purpose: str = UploadSession.PURPOSE_AGENDA) -> UploadSession:
+        """
+        Start an upload session
+
+        Raises:
+            ValueError: Unsupported purpose/file type or size out of range
+        """
+        config = current_app.config
+        if purpose != UploadSession.PURPOSE_AGENDA:
+            raise ValueError(f"Unsupported upload purpose: {purpose}")
+        if not filename or not FileService.allowed_file(filename, config['ALLOWED_AGENDA_EXTENSIONS']):
+            raise ValueError("Only PDF files are allowed for agendas")
+        if total_size <= 0:
+            raise ValueError("size must be positive")
+        if total_size > config['MAX_AGENDA_SIZE']:
+            raise ValueError(f"File too large. Max size: {config['MAX_AGENDA_SIZE'] // (1024*1024)} MB")
+
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            purpose=purpose,
+            filename=filename,
+            total_size=total_size,
+            received=0,
+            status=UploadSession.STATUS_UPLOADING,
+            expires_at=datetime.utcnow() + timedelta(seconds=config['UPLOAD_SESSION_TTL']),
+        )
+
+        os.makedirs(config['UPLOAD_SESSIONS_FOLDER'], exist_ok=True)
+        open(UploadService.temp_path(session.id), 'wb').close()
+
+        db.session.add(session)
+        db.session.commit()
+        return session
+
+    @staticmethod
+    def get_session(upload_id: str, user_id: int, for_update: bool = False) -> Optional[UploadSession]:
+        """Unexpired session owned by the user"""
+        query = UploadSession.query.filter(
+            UploadSession.id == upload_id,
+            UploadSession.user_id == user_id,
+            UploadSession.expires_at > datetime.utcnow()
+        )
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    @staticmethod
+    def append_chunk(session: UploadSession, offset: int, stream: IO[bytes]) -> UploadSession:
+        """
+        Write a chunk at offset, streaming it from the request body
+
+        Raises:
+            UploadConflict: offset is not the current end of the upload
+            ValueError: Upload already complete or chunk overruns the declared size
+        """
+        if session.status != UploadSession.STATUS_UPLOADING:
+            raise ValueError("Upload is already complete")
+        if offset != session.received:
+            raise UploadConflict("Offset does not match received bytes", session.received)
+
+        written = 0
+        limit = session.total_size - offset
+        with open(UploadService.temp_path(session.id), 'r+b') as f:
+            f.seek(offset)
+            while True:
+                chunk = stream.read(CHUNK_READ_SIZE)
+                if not chunk:
+                    break
+                if written + len(chunk) > limit:
+                    raise ValueError("Chunk exceeds the declared upload size")
+                f.write(chunk)
+                written += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        session.received = offset + written
+        session.expires_at = datetime.utcnow() + timedelta(seconds=current_app.config['UPLOAD_SESSION_TTL'])
+        db.session.commit()
+        return session
+
+    @staticmethod
+    def complete(session: UploadSession) -> UploadSession:
+        """
+        Validate the assembled file; on failure the session is discarded
+
+        Raises:
+            ValueError: Upload incomplete or file invalid
+        """
+        if session.status == UploadSession.STATUS_COMPLETE:
+            return session
+        if session.received != session.total_size:
+            raise ValueError(f"Upload incomplete: {session.received} of {session.total_size} bytes received")
+
+        path = UploadService.temp_path(session.id)
+        # Drop anything written past the declared size by an interrupted chunk
+        os.truncate(path, session.total_size)
+
+        digest, page_count, error = FileService.inspect_agenda_file(path)
+        if error:
+            UploadService.discard(session)
+            raise ValueError(error)
+
+        session.sha256 = digest
+        session.page_count = page_count
+        session.status = UploadSession.STATUS_COMPLETE
+        db.session.commit()
+        logger.info(f"✅ Upload {session.id} complete ({session.total_size} bytes, {page_count} pages)")
+        return session
+
+    @staticmethod
+    def discard(session: UploadSession) -> None:
+        """Delete a session and its temp file"""
+        path = UploadService.temp_path(session.id)
+        db.session.delete(session)
+        db.session.commit()
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def purge_expired() -> Dict[str, int]:
+        """Remove expired sessions and temp files no session owns"""
+        folder = current_app.config['UPLOAD_SESSIONS_FOLDER']
+        expired = UploadSession.query.filter(UploadSession.expires_at <= datetime.utcnow()).all()
+        for session in expired:
+            db.session.delete(session)
+        db.session.commit()
+
+        removed = 0
+        if os.path.isdir(folder):
+            # Only files idle past the TTL, so sessions being created keep theirs
+            cutoff = time.time() - current_app.config['UPLOAD_SESSION_TTL']
+            names = [
+                entry.name for entry in os.scandir(folder)
+                if entry.name.endswith('.part') and entry.stat().st_mtime < cutoff
+            ]
+            live = {session_id for (session_id,) in db.session.query(UploadSession.id)}
+            for name in names:
+                if name[:-len('.part')] not in live:
+                    os.remove(os.path.join(folder, name))
+                    removed += 1
+
+        return {'sessions': len(expired), 'files': removed}
@@ -0,0 +1,15 @@
+# app/tasks/calendar_tasks.py
+from app.tasks.celery_app import celery
+from app.services.calendar_sync_service import CalendarSyncService
+
+
+@celery.task(ignore_result=True)
+def process_calendar_sync_queue():
+    """Drain due Google Calendar sync jobs"""
+    return CalendarSyncService.process_pending()
+
+
+@celery.task(ignore_result=True)
+def reconcile_calendar():
+    """Repair drift between meetings and Google Calendar events"""
+    return CalendarSyncService.reconcile()
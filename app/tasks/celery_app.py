@@ -0,0 +1,42 @@
+# app/tasks/celery_app.py
+from celery import Celery
+from app import create_app
+import os
+
+
+def make_celery(app):
+    """Create Celery instance bound to the Flask app context"""
+    celery = Celery(
+        app.import_name,
+        broker=app.config['CELERY_BROKER_URL'],
+        backend=app.config['CELERY_RESULT_BACKEND'],
+        include=['app.tasks.calendar_tasks', 'app.tasks.media_tasks'],
+    )
+
+    class ContextTask(celery.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery.Task = ContextTask
+
+    celery.conf.beat_schedule = {
+        'process-calendar-sync-queue': {
+            'task': 'app.tasks.calendar_tasks.process_calendar_sync_queue',
+            'schedule': app.config['CALENDAR_SYNC_INTERVAL'],
+        },
+        'reconcile-calendar': {
+            'task': 'app.tasks.calendar_tasks.reconcile_calendar',
+            'schedule': app.config['CALENDAR_RECONCILE_INTERVAL'],
+        },
+        'collect-orphaned-media': {
+            'task': 'app.tasks.media_tasks.collect_orphaned_media',
+            'schedule': app.config['MEDIA_GC_INTERVAL'],
+        },
+    }
+
+    return celery
+
+
+flask_app = create_app(os.getenv('FLASK_ENV', 'development'))
+celery = make_celery(flask_app)
@@ -0,0 +1,9 @@
+# app/tasks/media_tasks.py
+from app.tasks.celery_app import celery
+from app.services.media_gc_service import MediaGCService
+
+
+@celery.task(ignore_result=True)
+def collect_orphaned_media():
+    """Sweep the next batches of unreferenced media files"""
+    return MediaGCService.run()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Dict, Iterable, Iterator
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+
+def available_encodings() -> list:
+    """Encodings this process can produce, in order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Compress a body with gzip or brotli.
+
+    best: Use the highest level (for bodies compressed once and reused).
+    """
+    config = current_app.config
+    if encoding == "br":
+        quality = 11 if best else config["COMPRESS_BROTLI_QUALITY"]
+        return brotli.compress(data, quality=quality)
+    # mtime=0 keeps the output identical for identical input
+    level = 9 if best else config["COMPRESS_LEVEL"]
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks: Iterable, encoding: str) -> Iterator[bytes]:
+    """
+    Compress a streamed body incrementally.
+
+    Each chunk is flushed so the client can start decoding (and the first
+    bytes go out) without waiting for the whole body.
+    """
+    config = current_app.config
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=config["COMPRESS_BROTLI_QUALITY"])
+        flush, finish = compressor.flush, compressor.finish
+        process = compressor.process
+    else:
+        # wbits=31: gzip container
+        compressor = zlib.compressobj(config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)
+        process = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+        finish = compressor.flush
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+def attach_precompressed(response: Response, variants: Dict[str, bytes]) -> Response:
+    """
+    Let compress_response reuse (and fill) a shared per-encoding cache.
+
+    variants maps encoding -> compressed body and should live as long as
+    the body it belongs to (e.g. a ReferenceCache entry).
+    """
+    response.compressed_variants = variants
+    return response
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook: gzip/brotli-encode eligible responses."""
+    config = current_app.config
+    if not config["COMPRESS_ENABLED"] or response.mimetype not in config["COMPRESS_MIMETYPES"]:
+        return response
+
+    # The body depends on Accept-Encoding, even when this one isn't compressed
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206)
+        or response.direct_passthrough  # send_file: range requests, binary media
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    if response.status_code == 304:
+        # Nothing to encode, but send the validator the 200 would have carried
+        # (make_conditional keeps the body, so its size is known)
+        if response.is_streamed or len(response.get_data()) >= config["COMPRESS_MIN_SIZE"]:
+            _weaken_etag(response)
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers["Content-Encoding"] = encoding
+        response.headers.pop("Content-Length", None)
+        _weaken_etag(response)
+        return response
+
+    data = response.get_data()
+    if len(data) < config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    variants = getattr(response, "compressed_variants", None)
+    if variants is not None:
+        body = variants.get(encoding)
+        if body is None:
+            body = variants[encoding] = compress(data, encoding, best=True)
+    else:
+        body = compress(data, encoding)
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+
+    _weaken_etag(response)
+    return response
+
+
+def _weaken_etag(response: Response) -> None:
+    """
+    Mark a strong ETag weak.
+
+    A strong ETag names exact bytes; the encoded body is a different
+    representation (If-None-Match still matches it weakly).
+    """
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_compression(app: Flask) -> None:
+    """Register response compression on the app."""
+    app.after_request(compress_response)
@@ -6,6 +6,7 @@ from typing import Callable, TypeVar, Any, cast
 from flask import g
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+from app.extensions import db
 from app.models.user import User, UserProfile
 from app.utils.response import error_response
 
@@ -49,6 +50,41 @@ def jwt_required_with_user(fn: F) -> F:
     return cast(F, wrapper)
 
 
+def jwt_required_active(fn: F) -> F:
+    """
+    Like jwt_required_with_user, but only checks that the user is still
+    active (one primary-key lookup, no User object loaded or attached to g)
+
+    For routes whose response doesn't depend on who is asking, e.g. the
+    cached reference data.
+    """
+
+    @jwt_required()
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any):
+        try:
+            user_id = int(get_jwt_identity())
+        except (TypeError, ValueError):
+            return error_response(
+                "Invalid token subject",
+                code="INVALID_TOKEN_SUBJECT",
+                status=422,
+            )
+
+        is_active = db.session.query(User.is_active).filter(User.id == user_id).scalar()
+
+        if not is_active:
+            return error_response(
+                "User not found or inactive",
+                code="INVALID_USER",
+                status=401,
+            )
+
+        return fn(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
 def admin_required(fn: F) -> F:
     """
     Require an authenticated user with admin role.
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from flask import Request, current_app, request
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+from app.utils.json_provider import _default
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional
+    msgpack = None
+
+MSGPACK_MIMETYPE = "application/msgpack"
+# Older clients still send the unregistered x- form
+MSGPACK_MIMETYPES = {MSGPACK_MIMETYPE, "application/x-msgpack"}
+
+
+def wants_msgpack() -> bool:
+    """
+    True if the client prefers MessagePack over JSON.
+
+    JSON stays the default: msgpack is only chosen when it is listed with
+    a higher quality than JSON (or JSON is not acceptable at all) and the
+    msgpack package is installed.
+    """
+    if msgpack is None or not current_app.config.get("MSGPACK_ENABLED", True):
+        return False
+    accept = request.accept_mimetypes
+    best = accept.best_match(["application/json", MSGPACK_MIMETYPE, "application/x-msgpack"])
+    return best in MSGPACK_MIMETYPES
+
+
+def packb(obj: Any) -> bytes:
+    """Encode like the JSON provider: dates/times become ISO 8601 strings."""
+    return msgpack.packb(obj, default=_default, datetime=False)
+
+
+def packer() -> "msgpack.Packer":
+    """Packer with the same encoding as packb, for writing a body piece by piece."""
+    return msgpack.Packer(default=_default, datetime=False)
+
+
+def msgpack_response(obj: Any):
+    """MessagePack counterpart of app.json.response()."""
+    return current_app.response_class(packb(obj), mimetype=MSGPACK_MIMETYPE)
+
+
+class MsgpackRequest(Request):
+    """Request whose get_json() also decodes MessagePack bodies."""
+
+    def get_json(self, force: bool = False, silent: bool = False, cache: bool = True) -> Optional[Any]:
+        if self.mimetype not in MSGPACK_MIMETYPES:
+            return super().get_json(force=force, silent=silent, cache=cache)
+
+        if cache and self._cached_json[silent] is not Ellipsis:
+            return self._cached_json[silent]
+
+        if msgpack is None:
+            if silent:
+                return None
+            raise UnsupportedMediaType("MessagePack request bodies are not supported on this server.")
+
+        try:
+            data = msgpack.unpackb(self.get_data(cache=cache), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            if not silent:
+                raise BadRequest(f"Failed to decode MessagePack object: {str(e) or type(e).__name__}") from e
+            # Same caching as Request.get_json: only the silent slot holds the failure
+            if cache:
+                self._cached_json = (self._cached_json[0], None)
+            return None
+
+        if cache:
+            self._cached_json = (data, data)
+        return data
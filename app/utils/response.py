@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from flask import jsonify
+from flask import current_app, jsonify, stream_with_context
+
+from app.utils.msgpack_support import MSGPACK_MIMETYPE, msgpack_response, packer, wants_msgpack
+
+logger = logging.getLogger(__name__)
 
 
 def _build_response(
@@ -25,7 +30,10 @@ def _build_response(
         if code:
             payload["code"] = code
 
-    return jsonify(payload), status
+    # Accept: application/msgpack gets the same payload as MessagePack
+    response = msgpack_response(payload) if wants_msgpack() else jsonify(payload)
+    response.vary.add("Accept")
+    return response, status
 
 
 def success_response(
@@ -58,20 +66,129 @@ def paginated_response(
     total: int,
 ):
     """Helper for paginated list responses."""
+    data = {
+        "items": items,
+        "pagination": _pagination(page, per_page, total),
+    }
+
+    return success_response(data)
+
+
+def _pagination(page: int, per_page: int, total: int) -> Dict[str, Any]:
     pages = (total + per_page - 1) // per_page if per_page else 1
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": pages,
+        "has_next": page < pages,
+        "has_prev": page > 1,
+    }
 
+
+def streaming_paginated_response(
+    query: Any,
+    serialize: Callable[[Any], Any],
+    page: int,
+    per_page: int,
+    total: int,
+    chunk_size: int = 100,
+):
+    """
+    Paginated list response streamed from a query.
+
+    Same body as paginated_response, but rows are fetched with yield_per
+    and items are encoded and sent chunk_size at a time, so memory stays
+    flat however large per_page is and the first bytes go out as soon as
+    the first chunk is ready. Eager loads on the query must be
+    yield_per-compatible (selectinload, not joinedload of collections).
+    MessagePack clients get the same streaming; see _stream_msgpack.
+    """
+    page = max(page, 1)
+    provider = current_app.json
+    offset = (page - 1) * per_page
+    rows = query.offset(offset).limit(per_page).yield_per(chunk_size)
+
+    if wants_msgpack():
+        count = min(per_page, max(total - offset, 0))
+        body = _stream_msgpack(rows, serialize, count, _pagination(page, per_page, total), chunk_size)
+        response = current_app.response_class(stream_with_context(body), mimetype=MSGPACK_MIMETYPE)
+        response.vary.add("Accept")
+        return response, 200
+
+    def generate() -> Iterator[str]:
+        # Keys in the order _build_response writes them
+        yield '{"success":true,"data":{"items":['
+        separator = ""
+        batch: List[str] = []
+        for row in rows:
+            batch.append(provider.dumps(serialize(row)))
+            if len(batch) >= chunk_size:
+                yield separator + ",".join(batch)
+                separator = ","
+                batch = []
+        if batch:
+            yield separator + ",".join(batch)
+        yield '],"pagination":' + provider.dumps(_pagination(page, per_page, total)) + "}}\n"
+
+    response = current_app.response_class(stream_with_context(generate()), mimetype=provider.mimetype)
+    response.vary.add("Accept")
+    return response, 200
+
+
+def _stream_msgpack(
+    rows: Any,
+    serialize: Callable[[Any], Any],
+    count: int,
+    pagination: Dict[str, Any],
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """
+    MessagePack body of streaming_paginated_response.
+
+    MessagePack arrays are length-prefixed, so the items array header is
+    written from the page size implied by total. If rows were added or
+    deleted between the count and the fetch, extra rows are left out and
+    missing ones are sent as nil so the body stays well-formed.
+    """
+    pack = packer()
+    # Keys in the order _build_response writes them
+    yield (
+        pack.pack_map_header(2) + pack.pack("success") + pack.pack(True)
+        + pack.pack("data") + pack.pack_map_header(2)
+        + pack.pack("items") + pack.pack_array_header(count)
+    )
+    sent = 0
+    batch: List[bytes] = []
+    for row in rows:
+        if sent == count:
+            break
+        batch.append(pack.pack(serialize(row)))
+        sent += 1
+        if len(batch) >= chunk_size:
+            yield b"".join(batch)
+            batch = []
+    if sent < count:
+        logger.warning(f"⚠️ Streamed page has {sent} of {count} counted rows; padding with nil")
+        batch.extend(pack.pack(None) for _ in range(count - sent))
+    yield b"".join(batch) + pack.pack("pagination") + pack.pack(pagination)
+
+
+def keyset_response(
+    items: List[Any],
+    per_page: int,
+    next_cursor: Optional[Any],
+    total: Optional[int] = None,
+):
+    """Helper for cursor (keyset) paginated list responses."""
     data = {
         "items": items,
         "pagination": {
-            "page": page,
             "per_page": per_page,
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None,
             "total": total,
-            "pages": pages,
-            "has_next": page < pages,
-            "has_prev": page > 1,
         },
     }
 
     return success_response(data)
-
-
@@ -0,0 +1,90 @@
+"""
+Agenda search benchmark: in-process index vs a LIKE scan (non-PostgreSQL)
+
+Fills an in-memory SQLite database with N synthetic agendas, then times
+the index build (what start_warm_up does when the server starts), repeated
+GET /api/meetings?search_agenda=... requests, and the LIKE scan the index
+replaces.
+
+    python benchmarks/agenda_search.py --agendas 30000 --words 400
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('UPLOAD_FOLDER', tempfile.mkdtemp(prefix='rsdd-bench-media-'))
+
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import AgendaText, Meeting  # noqa: E402
+from app.services.agenda_search_service import AgendaSearchService  # noqa: E402
+from app.utils.seed import seed_database  # noqa: E402
+
+
+def fill(agendas, words, vocabulary=20000):
+    random.seed(1)
+    vocab = [f'w{i}' for i in range(vocabulary)]
+    now = datetime.datetime.utcnow()
+    texts, meetings = [], []
+    for i in range(agendas):
+        # Every 1000th agenda mentions the budget
+        content = ' '.join(random.choices(vocab, k=words)) + (' budget' if i % 1000 == 0 else '')
+        path = f'agendas/{i:064x}.pdf'
+        texts.append({'path': path, 'content': content})
+        meetings.append({
+            'title': f'Meeting {i}', 'date': datetime.date(2027, 1, 1), 'time': datetime.time(9),
+            'agenda': path, 'created_at': now, 'updated_at': now,
+        })
+    db.session.bulk_insert_mappings(AgendaText, texts)
+    db.session.bulk_insert_mappings(Meeting, meetings)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--agendas', type=int, default=30000)
+    parser.add_argument('--words', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        seed_database()
+        client = app.test_client()
+        login = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+        headers = {'Authorization': 'Bearer ' + login.json['data']['access_token']}
+
+        started = time.perf_counter()
+        fill(args.agendas, args.words)
+        print(f'{args.agendas} agendas x {args.words} words inserted in {time.perf_counter() - started:.1f}s')
+
+        started = time.perf_counter()
+        AgendaSearchService._get_index().refresh()
+        print(f'index build (server start):  {time.perf_counter() - started:8.2f} s')
+
+        for search in ('budget', 'w5 w17', 'w123'):
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                response = client.get(f'/api/meetings?search_agenda={search}&per_page=5', headers=headers)
+            elapsed = (time.perf_counter() - started) / args.repeat * 1000
+            total = response.json['data']['pagination']['total']
+            print(f'search {search!r:12} {elapsed:8.1f} ms/request  ({total} matches)')
+
+        started = time.perf_counter()
+        matches = db.session.execute(text(
+            "SELECT count(*) FROM meetings m JOIN agenda_texts a ON a.path = m.agenda "
+            "WHERE a.content LIKE '%w123 %'"
+        )).scalar()
+        print(f"LIKE scan 'w123'   {(time.perf_counter() - started) * 1000:8.1f} ms          ({matches} matches)")
+
+
+if __name__ == '__main__':
+    main()
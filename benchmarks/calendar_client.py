@@ -0,0 +1,59 @@
+"""
+Google Calendar client benchmark: cached credentials and API client
+
+Runs CalendarService against the local Calendar stand-in from
+tests/fake_calendar.py and times, per call:
+
+- get_calendar_service() cold (reset_client() first: credentials loaded
+  and the discovery client built, as on every call before caching) and
+  warm (cached per thread)
+- create_event() cold (also fetches a new access token) and warm
+
+    python benchmarks/calendar_client.py [--repeat 50]
+"""
+import argparse
+import tempfile
+from datetime import date, time as dtime
+
+from payloads import make_app, timed
+
+from app.models.meeting import Meeting
+from app.services.calendar_service import CalendarService
+from tests.fake_calendar import FakeCalendar, write_service_account
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app()
+    fake = FakeCalendar().start()
+    app.config['GOOGLE_CREDENTIALS_PATH'] = write_service_account(
+        f'{tempfile.mkdtemp(prefix="rsdd-bench-")}/sa.json', fake.url + '/token'
+    )
+    app.config['GOOGLE_CALENDAR_API_ENDPOINT'] = fake.url
+    meeting = Meeting(title='Faculty board', date=date(2030, 1, 1), time=dtime(10, 30))
+
+    def cold(fn):
+        def call():
+            CalendarService.reset_client()
+            return fn()
+        return call
+
+    try:
+        for label, fn in (
+            ('get_calendar_service()', CalendarService.get_calendar_service),
+            ('create_event()', lambda: CalendarService.create_event(meeting)),
+        ):
+            CalendarService.reset_client()
+            cold_ms, _ = timed(cold(fn), args.repeat)
+            warm_ms, _ = timed(fn, args.repeat)
+            print(f'{label:24s} cold {cold_ms:8.3f} ms  warm {warm_ms:8.3f} ms')
+        print(f'token requests: {fake.token_requests}, events created: {len(fake.events)}')
+    finally:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
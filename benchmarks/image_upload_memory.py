@@ -0,0 +1,93 @@
+"""
+Profile picture processing benchmark: peak memory of render_variants
+
+Writes a large JPEG (6000x4000 by default) and renders the profile
+picture variants (64/256/800 px, WebP + JPEG) from it:
+
+- full decode: the original opened and copied at full resolution before
+  downscaling, as render_variants did before draft-mode decoding
+- render_variants: decoded at a reduced DCT scale with Image.draft
+
+Each run happens in a fresh process and reports how far it raised the
+peak RSS (VmHWM, reset before the run; Linux only). Pillow allocates image memory outside the Python allocator, so
+tracemalloc would not see it.
+
+    python benchmarks/image_upload_memory.py [--width 6000 --height 4000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from app.services.image_processing import _atomic_save, render_variants, to_rgb  # noqa: E402
+
+SIZES = (64, 256, 800)
+
+
+def render_full_decode(src_path, dest_dir, stem, sizes, quality=85):
+    """render_variants without draft mode (full-resolution decode)"""
+    with Image.open(src_path) as original:
+        image = to_rgb(original)
+        for size in sorted(set(sizes), reverse=True):
+            if image.width > size or image.height > size:
+                image = image.copy()
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            _atomic_save(image, os.path.join(dest_dir, f'{stem}_{size}.jpg'), format='JPEG', optimize=True, quality=quality)
+            _atomic_save(image, os.path.join(dest_dir, f'{stem}_{size}.webp'), format='WEBP', quality=quality, method=4)
+
+
+def _rss_kib(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def measure(render, src_path, dest_dir, results):
+    """Run in a child process: (peak RSS growth in MiB, seconds)"""
+    # Reset the peak left by interpreter start-up and imports (Linux)
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    before = _rss_kib('VmRSS')
+    started = time.perf_counter()
+    render(src_path, dest_dir, 'bench', SIZES)
+    elapsed = time.perf_counter() - started
+    results.put(((_rss_kib('VmHWM') - before) / 1024, elapsed))
+
+
+def write_jpeg(path, width, height):
+    """A photo-like JPEG (gradient plus noise, so it doesn't compress to nothing)"""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    Image.merge('RGB', (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT))).save(path, quality=90)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--width', type=int, default=6000)
+    parser.add_argument('--height', type=int, default=4000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='rsdd-bench-images-')
+    src_path = os.path.join(workdir, 'original.jpg')
+    write_jpeg(src_path, args.width, args.height)
+    print(f'{args.width}x{args.height} JPEG, {os.path.getsize(src_path) / 1024 / 1024:.1f} MiB')
+
+    context = multiprocessing.get_context('spawn')
+    for label, render in (('full decode', render_full_decode), ('render_variants', render_variants)):
+        results = context.Queue()
+        process = context.Process(target=measure, args=(render, src_path, workdir, results))
+        process.start()
+        peak, elapsed = results.get()
+        process.join()
+        print(f'  {label:16s} peak RSS +{peak:6.1f} MiB  {elapsed * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+JSON serialization benchmark: FastJSONProvider (orjson / stdlib) vs Flask's default
+
+Encodes a 100-item meetings page (30 attendees each) and users page the
+way paginated_response does, with:
+
+- Flask's DefaultJSONProvider on the payload as to_dict() used to return
+  it (dates already ISO strings); the isoformat() pass those to_dict()
+  calls made is timed separately, since it was part of every request
+- FastJSONProvider with JSON_USE_ORJSON=False (stdlib json, dates handled
+  by the default= hook)
+- FastJSONProvider with orjson
+
+    python benchmarks/json_serialization.py [--repeat 50]
+"""
+import argparse
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+from payloads import build_pages, make_app, timed
+
+from app.utils.response import paginated_response
+
+
+def isoformat_dates(value):
+    """What to_dict() returned before the provider handled dates itself"""
+    if isinstance(value, dict):
+        return {key: isoformat_dates(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [isoformat_dates(item) for item in value]
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app()
+    meetings, users = build_pages(app)
+
+    for name, items in (('meetings page (100 x 30 attendees)', meetings), ('users page (100 with profiles)', users)):
+        print(name)
+        with app.test_request_context():
+            default = DefaultJSONProvider(app)
+            converted = isoformat_dates(items)
+            body = {'success': True, 'data': {'items': converted, 'pagination': {}}}
+
+            ms, _ = timed(lambda: isoformat_dates(items), args.repeat)
+            print(f'  isoformat() in to_dict (before)      {ms:7.2f} ms')
+            ms, response = timed(lambda: default.response(body), args.repeat)
+            print(f'  DefaultJSONProvider (before)         {ms:7.2f} ms  {len(response.get_data()) / 1024:7.1f} KiB')
+
+            app.config['JSON_USE_ORJSON'] = False
+            ms, response = timed(lambda: paginated_response(items, 1, 100, 1000)[0], args.repeat)
+            print(f'  FastJSONProvider, stdlib fallback    {ms:7.2f} ms  {len(response.get_data()) / 1024:7.1f} KiB')
+
+            app.config['JSON_USE_ORJSON'] = True
+            ms, response = timed(lambda: paginated_response(items, 1, 100, 1000)[0], args.repeat)
+            print(f'  FastJSONProvider, orjson             {ms:7.2f} ms  {len(response.get_data()) / 1024:7.1f} KiB')
+
+            same = json.loads(default.response(converted).get_data()) == json.loads(app.json.response(items).get_data())
+            print(f'  same content: {same}')
+
+
+if __name__ == '__main__':
+    main()
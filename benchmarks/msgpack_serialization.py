@@ -0,0 +1,59 @@
+"""
+MessagePack vs JSON benchmark: encode time and payload size
+
+Encodes the same 100-item meetings and users pages as
+json_serialization.py through paginated_response with Accept:
+application/json (stdlib and orjson) and Accept: application/msgpack, and
+reports the body size raw and gzipped (COMPRESS_LEVEL 6).
+
+Requires the msgpack package:
+
+    python benchmarks/msgpack_serialization.py [--repeat 50]
+"""
+import argparse
+import gzip
+import json
+import sys
+
+from payloads import build_pages, make_app, timed
+
+from app.utils.msgpack_support import msgpack
+from app.utils.response import paginated_response
+
+VARIANTS = (
+    ('JSON, stdlib', 'application/json', False),
+    ('JSON, orjson', 'application/json', True),
+    ('MessagePack', 'application/msgpack', True),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    if msgpack is None:
+        sys.exit("msgpack is not installed (pip install msgpack)")
+
+    app = make_app()
+    meetings, users = build_pages(app)
+
+    for name, items in (('meetings page (100 x 30 attendees)', meetings), ('users page (100 with profiles)', users)):
+        print(name)
+        bodies = {}
+        for label, accept, use_orjson in VARIANTS:
+            app.config['JSON_USE_ORJSON'] = use_orjson
+            with app.test_request_context(headers={'Accept': accept}):
+                ms, response = timed(lambda: paginated_response(items, 1, 100, 1000)[0], args.repeat)
+            body = bodies[label] = response.get_data()
+            print(
+                f'  {label:14s} {ms:7.2f} ms  {len(body) / 1024:7.1f} KiB'
+                f'  gzip {len(gzip.compress(body, 6, mtime=0)) / 1024:6.1f} KiB'
+            )
+
+        same = msgpack.unpackb(bodies['MessagePack']) == json.loads(bodies['JSON, orjson'])
+        print(f'  same content: {same}')
+
+
+if __name__ == '__main__':
+    main()
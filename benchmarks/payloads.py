@@ -0,0 +1,64 @@
+"""
+Realistic API payloads shared by the serialization benchmarks
+
+Builds an in-memory app with 60 users and 200 meetings (30 attendees each)
+and returns what list_meetings / list_users put in a 100-item page.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('UPLOAD_FOLDER', tempfile.mkdtemp(prefix='rsdd-bench-media-'))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.meeting import Meeting  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.seed import seed_database  # noqa: E402
+
+
+def make_app():
+    """Testing app with seeded reference data, inside a pushed app context"""
+    app = create_app('testing')
+    app.app_context().push()
+    db.create_all()
+    seed_database()
+    return app
+
+
+def build_pages(app, per_page=100):
+    """(meetings page items, users page items) as the list endpoints build them"""
+    users = []
+    for i in range(60):
+        user = User(username=f'bench{i}', email=f'bench{i}@example.org', first_name='First', last_name=f'Last{i}')
+        user.password_hash = 'x'
+        users.append(user)
+        db.session.add(user)
+    db.session.flush()
+    for i in range(200):
+        meeting = Meeting(
+            title=f'Faculty board meeting {i}',
+            date=date.today() + timedelta(days=i),
+            time=dtime(10, 30),
+            notification_summary={'invitation': {'sent_at': '2026-01-01T00:00:00', 'delivered': 30, 'failed': 0}},
+        )
+        meeting.attendees = users[i % 30:i % 30 + 30]
+        db.session.add(meeting)
+    db.session.commit()
+
+    with app.test_request_context():
+        meetings = [m.to_dict() for m in Meeting.query.limit(per_page).all()]
+        people = [u.to_dict() for u in User.query.limit(per_page).all()]
+    return meetings, people
+
+
+def timed(fn, repeat=50):
+    """(mean milliseconds per call, last result)"""
+    result = fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
@@ -0,0 +1,8 @@
+# gunicorn.conf.py
+# Loaded automatically by gunicorn when started from the project root
+
+
+def post_fork(server, worker):
+    """Give each request worker its own agenda search index (non-PostgreSQL)"""
+    from app.services.agenda_search_service import AgendaSearchService
+    AgendaSearchService.post_fork()
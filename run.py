@@ -1,10 +1,14 @@
 # run.py
 from app import create_app
 from app.extensions import db
+from app.services.agenda_search_service import AgendaSearchService
 import os
 
 app = create_app(os.getenv('FLASK_ENV', 'development'))
 
+# Index agenda text now rather than on the first search (non-PostgreSQL)
+AgendaSearchService.start_warm_up(app)
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()  # Create tables if they don't exist
@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+# Config folders are resolved at import time, so point them at a scratch
+# directory before the app is imported
+os.environ.setdefault('UPLOAD_FOLDER', tempfile.mkdtemp(prefix='rsdd-test-media-'))
+
+import pytest
+
+from app import create_app
+from app.extensions import db as _db
+from app.services import calendar_service
+from app.services.calendar_service import CalendarService
+from app.services.storage import LocalStorage
+from tests.fake_calendar import FakeCalendar, write_service_account
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app, db, client):
+    """Authorization header of the seeded admin"""
+    from app.utils.seed import seed_database
+    seed_database()
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+    return {'Authorization': 'Bearer ' + response.json['data']['access_token']}
+
+
+@pytest.fixture
+def storage(app, tmp_path):
+    """Local media storage in a per-test directory"""
+    storage = LocalStorage(str(tmp_path / 'media'))
+    app.extensions['storage'] = storage
+    app.config['UPLOAD_FOLDER'] = storage.root
+    app.config['PROFILE_PICS_FOLDER'] = os.path.join(storage.root, 'profile_pics')
+    app.config['AGENDAS_FOLDER'] = os.path.join(storage.root, 'agendas')
+    app.config['IMAGE_CACHE_FOLDER'] = os.path.join(storage.root, 'cache')
+    app.config['UPLOAD_SESSIONS_FOLDER'] = str(tmp_path / 'uploads')
+    return storage
+
+
+def put_media(storage, key, data=b'data'):
+    """Write a file straight into local storage"""
+    path = storage.path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return key
+
+
+@pytest.fixture
+def calendar(app, tmp_path, monkeypatch):
+    """CalendarService pointed at a local FakeCalendar"""
+    fake = FakeCalendar().start()
+    app.config['GOOGLE_CREDENTIALS_PATH'] = write_service_account(tmp_path / 'sa.json', fake.url + '/token')
+    app.config['GOOGLE_CALENDAR_API_ENDPOINT'] = fake.url
+    # No backoff between retry rounds
+    monkeypatch.setattr(calendar_service.time, 'sleep', lambda seconds: None)
+    yield fake
+    CalendarService.reset_client()
+    fake.stop()
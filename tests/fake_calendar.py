@@ -0,0 +1,212 @@
+"""
+Local stand-in for the Google Calendar API
+
+Serves the events endpoints, the batch endpoint and the OAuth token
+endpoint used by service account credentials, so CalendarService can run
+against it unchanged via GOOGLE_CALENDAR_API_ENDPOINT. Failures can be
+scripted per event summary (sub-request statuses) or per batch round-trip.
+"""
+import itertools
+import json
+import re
+import threading
+from collections import defaultdict, deque
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+EVENT_PATH_RE = re.compile(r'^/calendar/v3/calendars/[^/]+/events(?:/([^/?]+))?(?:\?.*)?$')
+
+
+class FakeCalendar:
+    """In-memory calendar behind a threaded HTTP server"""
+
+    def __init__(self):
+        self.events = {}
+        self.cancelled = {}  # Deleted events, listed with status "cancelled"
+        self.log = []  # (method, path) of every request and sub-request
+        self.token_requests = 0
+        self.batch_failures = deque()  # Statuses for whole batch round-trips
+        self.failures = defaultdict(deque)  # Event summary -> sub-request statuses
+        self._ids = itertools.count(1)
+        self._etags = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = None
+
+    # Scripting
+
+    def fail_batch(self, *statuses):
+        """Answer the next batch round-trips with these statuses"""
+        self.batch_failures.extend(statuses)
+
+    def fail(self, summary, *statuses):
+        """Answer the next requests touching the event with this summary with these statuses"""
+        self.failures[summary].extend(statuses)
+
+    def touch(self, event_id, **fields):
+        """Simulate an edit made in Calendar (changes the ETag)"""
+        self.events[event_id].update(fields)
+        self.events[event_id]['etag'] = '"%d"' % next(self._etags)
+
+    def add(self, **fields):
+        """Simulate an event created in Calendar"""
+        event = dict(fields, id='e%d' % next(self._ids), etag='"%d"' % next(self._etags), status='confirmed')
+        self.events[event['id']] = event
+        return event['id']
+
+    def remove(self, event_id):
+        """Simulate an event deleted in Calendar"""
+        del self.events[event_id]
+        self.cancelled[event_id] = {'id': event_id, 'status': 'cancelled'}
+
+    def requests(self, method=None):
+        return [entry for entry in self.log if method is None or entry[0] == method]
+
+    # Server
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_address[1]
+
+    def start(self):
+        fake = self
+
+        class Handler(_Handler):
+            calendar = fake
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Events API
+
+    def handle(self, method, path, body, headers):
+        with self._lock:
+            self.log.append((method, path))
+            match = EVENT_PATH_RE.match(path)
+            if not match:
+                return 404, _error(404, 'Not Found')
+            event_id = match.group(1)
+            event = self.events.get(event_id) if event_id else None
+            payload = json.loads(body) if body else {}
+
+            summary = payload.get('summary') or (event or {}).get('summary')
+            if summary and self.failures.get(summary):
+                status = self.failures[summary].popleft()
+                return status, _error(status, 'Scripted failure')
+
+            if method == 'POST' and not event_id:
+                payload.update(id='e%d' % next(self._ids), etag='"%d"' % next(self._etags), status='confirmed')
+                self.events[payload['id']] = payload
+                return 200, payload
+            if method == 'GET' and not event_id:
+                # Every event on each list call (sync tokens are not tracked)
+                items = list(self.events.values()) + list(self.cancelled.values())
+                return 200, {'items': items, 'nextSyncToken': 'token'}
+            if event is None:
+                return 404, _error(404, 'Not Found')
+            if method == 'GET':
+                return 200, event
+            if method == 'DELETE':
+                self.remove(event_id)
+                return 204, None
+            if headers.get('If-Match') not in (None, event['etag']):
+                return 412, _error(412, 'Precondition Failed')
+            if method == 'PATCH':
+                event.update(payload)
+            else:
+                payload['id'] = event_id
+                event = self.events[event_id] = payload
+            event['etag'] = '"%d"' % next(self._etags)
+            return 200, event
+
+    def handle_batch(self, content_type, body):
+        with self._lock:
+            self.log.append(('BATCH', '/batch/calendar/v3'))
+            if self.batch_failures:
+                status = self.batch_failures.popleft()
+                return status, 'application/json', json.dumps(_error(status, 'Scripted batch failure')).encode()
+
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + body
+        )
+        boundary = 'batch_response'
+        parts = []
+        for part in message.iter_parts():
+            content_id = part['Content-ID'].strip('<>')
+            raw = part.get_payload(decode=False)
+            head, _, sub_body = raw.partition('\r\n\r\n') if '\r\n\r\n' in raw else raw.partition('\n\n')
+            lines = head.splitlines()
+            method, url, _ = lines[0].split(' ', 2)
+            headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+            status, payload = self.handle(method, url, sub_body.strip(), headers)
+            data = json.dumps(payload) if payload is not None else ''
+            parts.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} Status\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\n\r\n{data}\r\n'
+            )
+        body = (''.join(parts) + f'--{boundary}--\r\n').encode()
+        return 200, f'multipart/mixed; boundary={boundary}', body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    calendar: FakeCalendar
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_any(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path.startswith('/token'):
+            self.calendar.token_requests += 1
+            token = {'access_token': 'test-token', 'expires_in': 3600, 'token_type': 'Bearer'}
+            return self._send(200, json.dumps(token).encode())
+        if self.path.startswith('/batch'):
+            status, content_type, payload = self.calendar.handle_batch(self.headers['Content-Type'], body)
+            return self._send(status, payload, content_type)
+
+        headers = {'If-Match': self.headers['If-Match']} if self.headers['If-Match'] else {}
+        status, payload = self.calendar.handle(self.command, self.path, body.decode(), headers)
+        self._send(status, b'' if payload is None else json.dumps(payload).encode())
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_any
+
+
+def _error(status, message):
+    return {'error': {'code': status, 'message': message}}
+
+
+def write_service_account(path, token_uri):
+    """Write a service account key file whose token endpoint is token_uri"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    with open(path, 'w') as f:
+        json.dump({
+            'type': 'service_account',
+            'project_id': 'test',
+            'private_key_id': '1',
+            'private_key': pem,
+            'client_email': 'calendar@test.iam.gserviceaccount.com',
+            'client_id': '1',
+            'token_uri': token_uri,
+        }, f)
+    return path
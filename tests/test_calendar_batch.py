@@ -0,0 +1,101 @@
+from datetime import date, time
+
+from app.models.meeting import Meeting
+from app.services.calendar_service import CalendarService
+
+
+def make_meeting(db, title):
+    meeting = Meeting(title=title, date=date(2030, 1, 1), time=time(10, 0))
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
+
+
+def synced_meeting(db, calendar, title):
+    """A meeting whose event exists and whose ETag/snapshot are stored"""
+    meeting = make_meeting(db, title)
+    meeting.google_event_id = CalendarService.batch_execute([('m', 'insert', meeting)])['m']['event_id']
+    db.session.commit()
+    calendar.log.clear()
+    return meeting
+
+
+def test_partial_failure_retries_only_retryable_sub_requests(db, calendar):
+    ok, flaky, bad = (make_meeting(db, title) for title in ('Ok', 'Flaky', 'Bad'))
+    calendar.fail('Flaky', 503)
+    calendar.fail('Bad', 400)
+
+    results = CalendarService.batch_execute([
+        ('ok', 'insert', ok),
+        ('flaky', 'insert', flaky),
+        ('bad', 'insert', bad),
+    ])
+
+    assert results['ok']['ok'] and results['flaky']['ok']
+    assert not results['bad']['ok']
+    # One round-trip for all three, one more for the 503 only
+    assert len(calendar.requests('BATCH')) == 2
+    assert len(calendar.requests('POST')) == 4
+    assert sorted(event['summary'] for event in calendar.events.values()) == ['Flaky', 'Ok']
+
+
+def test_precondition_failure_falls_back_to_get_and_update(db, calendar):
+    meeting = synced_meeting(db, calendar, 'Board')
+    calendar.touch(meeting.google_event_id)  # Edited in Calendar since our write
+    meeting.title = 'Board (moved)'
+
+    results = CalendarService.batch_execute([('board', 'update', meeting)])
+
+    assert results['board'] == {'ok': True, 'event_id': meeting.google_event_id, 'error': None}
+    assert [method for method, _ in calendar.log] == ['BATCH', 'PATCH', 'GET', 'PUT']
+    assert calendar.events[meeting.google_event_id]['summary'] == 'Board (moved)'
+
+
+def test_whole_batch_failure_retries_every_sub_request(db, calendar):
+    meetings = [make_meeting(db, f'M{i}') for i in range(3)]
+    calendar.fail_batch(503)
+
+    results = CalendarService.batch_execute([(f'm{i}', 'insert', m) for i, m in enumerate(meetings)])
+
+    assert all(result['ok'] for result in results.values())
+    assert len(calendar.requests('BATCH')) == 2
+    # The failed round-trip never reached the events API
+    assert len(calendar.requests('POST')) == 3
+    assert len(calendar.events) == 3
+
+
+def test_failed_round_trip_does_not_resend_answered_sub_requests(db, calendar, monkeypatch):
+    conflicted = synced_meeting(db, calendar, 'Conflict')
+    calendar.touch(conflicted.google_event_id)
+    conflicted.title = 'Conflict (renamed)'
+    rejected = make_meeting(db, 'Rejected')
+    crashing = make_meeting(db, 'Crashing')
+    calendar.fail('Rejected', 400)
+
+    # A callback failing makes batch.execute() raise after earlier
+    # sub-requests were already answered
+    remember_event = CalendarService.remember_event
+
+    def failing_remember_event(meeting, event, body):
+        if meeting is crashing:
+            raise RuntimeError('boom')
+        remember_event(meeting, event, body)
+
+    monkeypatch.setattr(CalendarService, 'remember_event', staticmethod(failing_remember_event))
+
+    results = CalendarService.batch_execute([
+        ('conflicted', 'update', conflicted),
+        ('rejected', 'insert', rejected),
+        ('crashing', 'insert', crashing),
+    ])
+
+    # The 412 goes through get + update once, not a second PATCH
+    assert results['conflicted']['ok']
+    assert len(calendar.requests('PATCH')) == 1
+    assert len(calendar.requests('GET')) == 1
+    assert len(calendar.requests('PUT')) == 1
+    # The permanent 400 and the answered-but-failed insert are not re-sent
+    assert not results['rejected']['ok']
+    assert not results['crashing']['ok']
+    assert len(calendar.requests('BATCH')) == 1
+    assert len(calendar.requests('POST')) == 2
@@ -0,0 +1,145 @@
+from datetime import date, time
+
+from sqlalchemy import text
+
+from app.models.calendar_sync import CalendarSyncJob
+from app.models.meeting import Meeting
+from app.services.calendar_service import CalendarService
+from app.services.calendar_sync_service import CalendarSyncService
+
+
+def queued_meeting(db, title, day=date(2030, 1, 1)):
+    meeting = Meeting(title=title, date=day, time=time(10, 0))
+    db.session.add(meeting)
+    db.session.flush()
+    CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_CREATE)
+    db.session.commit()
+    return meeting
+
+
+def delete_elsewhere(db, meeting_id):
+    """Delete a meeting row from another connection, as a concurrent request would"""
+    with db.engine.connect() as connection:
+        connection.execute(text('DELETE FROM meetings WHERE id = :id'), {'id': meeting_id})
+        connection.commit()
+
+
+def test_process_pending_stores_event_ids(db, calendar):
+    first, second = queued_meeting(db, 'First'), queued_meeting(db, 'Second')
+
+    stats = CalendarSyncService.process_pending()
+
+    assert stats == {'processed': 2, 'succeeded': 2, 'failed': 0}
+    assert CalendarSyncJob.query.count() == 0
+    for meeting in (first, second):
+        assert calendar.events[meeting.google_event_id]['summary'] == meeting.title
+        assert meeting.sync_status == Meeting.SYNC_SYNCED
+        assert meeting.google_event_etag and meeting.google_event_snapshot
+
+
+def test_pending_creates_are_coalesced_and_dropped_by_delete(db, calendar):
+    meeting = queued_meeting(db, 'Board')
+    CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_UPDATE)
+    assert CalendarSyncJob.query.count() == 1
+
+    CalendarSyncService.enqueue(meeting, CalendarSyncJob.ACTION_DELETE)
+    db.session.commit()
+
+    assert CalendarSyncJob.query.count() == 0
+    assert CalendarSyncService.process_pending()['processed'] == 0
+    assert calendar.events == {}
+
+
+def test_meeting_deleted_during_batch_does_not_lose_other_results(db, calendar, monkeypatch):
+    kept, deleted = queued_meeting(db, 'Kept'), queued_meeting(db, 'Deleted')
+    deleted_id = deleted.id
+    batch_execute = CalendarService.batch_execute
+
+    def batch_then_delete(operations):
+        results = batch_execute(operations)
+        # The meeting is deleted while the Google call is in flight; its
+        # create job was already processing, so enqueue(DELETE) can't drop it
+        CalendarSyncService.enqueue(deleted, CalendarSyncJob.ACTION_DELETE)
+        delete_elsewhere(db, deleted_id)
+        return results
+
+    monkeypatch.setattr(CalendarService, 'batch_execute', staticmethod(batch_then_delete))
+    stats = CalendarSyncService.process_pending()
+    monkeypatch.undo()
+
+    assert stats['succeeded'] == 2
+    assert db.session.get(Meeting, kept.id).google_event_id in calendar.events
+    assert db.session.get(Meeting, deleted_id) is None
+    # The event created for the deleted meeting is queued for deletion...
+    orphan = CalendarSyncJob.query.one()
+    assert orphan.action == CalendarSyncJob.ACTION_DELETE and orphan.meeting_id == deleted_id
+
+    CalendarSyncService.process_pending()
+
+    # ...and removed, leaving only the kept meeting's event
+    assert [event['summary'] for event in calendar.events.values()] == ['Kept']
+    assert CalendarSyncJob.query.count() == 0
+
+
+def test_failed_job_is_retried_with_backoff(app, db, calendar):
+    meeting = queued_meeting(db, 'Flaky')
+    calendar.fail('Flaky', 400)
+
+    stats = CalendarSyncService.process_pending()
+
+    assert stats == {'processed': 1, 'succeeded': 0, 'failed': 1}
+    job = CalendarSyncJob.query.one()
+    assert job.status == CalendarSyncJob.STATUS_PENDING and job.attempts == 1
+    # Not due yet
+    assert CalendarSyncService.process_pending()['processed'] == 0
+
+    job.next_attempt_at = job.created_at
+    db.session.commit()
+    assert CalendarSyncService.process_pending()['succeeded'] == 1
+    assert db.session.get(Meeting, meeting.id).google_event_id in calendar.events
+
+
+def synced_meetings(db, *titles):
+    meetings = [queued_meeting(db, title) for title in titles]
+    CalendarSyncService.process_pending()
+    return meetings
+
+
+def test_reconcile_repairs_drift(db, calendar):
+    deleted, edited, untouched = synced_meetings(db, 'Deleted', 'Edited', 'Untouched')
+    deleted_event, edited_event = deleted.google_event_id, edited.google_event_id
+    calendar.remove(deleted_event)
+    calendar.touch(edited_event, summary='Renamed in Calendar')
+    orphan = calendar.add(
+        summary='Gone', extendedProperties={'private': {CalendarService.MEETING_ID_PROPERTY: '999'}}
+    )
+
+    stats = CalendarSyncService.reconcile()
+
+    assert (stats['missing'], stats['stale'], stats['orphaned']) == (1, 1, 1)
+    # Deleted in Calendar: recreated under a new ID
+    assert deleted.google_event_id not in (None, deleted_event)
+    assert calendar.events[deleted.google_event_id]['summary'] == 'Deleted'
+    # Edited in Calendar: patched back
+    assert calendar.events[edited_event]['summary'] == 'Edited'
+    # No meeting owns it any more: deleted
+    assert orphan not in calendar.events
+    assert sorted(event['summary'] for event in calendar.events.values()) == ['Deleted', 'Edited', 'Untouched']
+    assert CalendarSyncJob.query.count() == 0
+
+
+def test_reconcile_queues_unsynced_meetings_with_a_time_only(db, calendar):
+    undated = Meeting(title='No time yet', date=date(2030, 1, 1))
+    unsynced = Meeting(title='Never synced', date=date(2030, 1, 2), time=time(9, 0))
+    db.session.add_all([undated, unsynced])
+    db.session.commit()
+
+    stats = CalendarSyncService.reconcile()
+
+    assert stats['unsynced'] == 1
+    assert calendar.events[unsynced.google_event_id]['summary'] == 'Never synced'
+    assert undated.google_event_id is None
+
+    # Nothing left to queue on the next run
+    assert CalendarSyncService.reconcile()['unsynced'] == 0
+    assert CalendarSyncJob.query.count() == 0
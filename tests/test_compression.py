@@ -0,0 +1,46 @@
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def compress_all(app):
+    app.config['COMPRESS_MIN_SIZE'] = 0
+
+
+def test_compressed_response_revalidates_with_the_same_weak_etag(client, auth_headers, compress_all):
+    headers = {**auth_headers, 'Accept-Encoding': 'gzip'}
+    first = client.get('/api/departments/bootstrap', headers=headers)
+    assert first.headers['Content-Encoding'] == 'gzip'
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+    assert gzip.decompress(first.data).startswith(b'{')
+
+    response = client.get('/api/departments/bootstrap', headers={**headers, 'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b''
+
+
+def test_uncompressed_response_keeps_a_strong_etag(client, auth_headers, compress_all):
+    headers = {**auth_headers, 'Accept-Encoding': 'identity'}
+    first = client.get('/api/departments/bootstrap', headers=headers)
+    etag = first.headers['ETag']
+    assert 'Content-Encoding' not in first.headers
+    assert not etag.startswith('W/')
+
+    response = client.get('/api/departments/bootstrap', headers={**headers, 'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_small_body_is_sent_as_is(app, client, auth_headers):
+    app.config['COMPRESS_MIN_SIZE'] = 1 << 20
+    response = client.get('/api/departments/titles', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert not response.headers['ETag'].startswith('W/')
+    assert 'Accept-Encoding' in response.headers['Vary']
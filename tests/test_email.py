@@ -0,0 +1,113 @@
+import threading
+from datetime import date, time as dtime
+
+import flask_mail
+import pytest
+
+from app.extensions import mail
+from app.models.meeting import Meeting
+from app.models.user import User
+from app.services.email_service import EmailService
+
+
+@pytest.fixture
+def mail_config(app):
+    app.config['MAIL_DEFAULT_SENDER'] = 'meetings@example.org'
+    app.config['MAIL_RECIPIENTS_PER_MESSAGE'] = 3
+    app.config['MAIL_SEND_CONCURRENCY'] = 2
+    app.config['MAIL_SEND_RETRIES'] = 1
+    app.config['MAIL_USE_BCC'] = True
+    return app.config
+
+
+@pytest.fixture
+def flaky_send(monkeypatch):
+    """Make Connection.send fail for the envelopes whose first BCC is in failing"""
+    failing = {}
+    lock = threading.Lock()
+    send = flask_mail.Connection.send
+
+    def flaky(self, message, envelope_from=None):
+        with lock:
+            remaining = failing.get(message.bcc[0], 0)
+            if remaining:
+                failing[message.bcc[0]] = remaining - 1
+                raise ConnectionResetError('connection dropped')
+        return send(self, message, envelope_from)
+
+    monkeypatch.setattr(flask_mail.Connection, 'send', flaky)
+    return failing
+
+
+def addresses(n):
+    return [f'user{i}@example.org' for i in range(n)]
+
+
+def make_meeting(db, n):
+    users = []
+    for i, email in enumerate(addresses(n)):
+        user = User(username=f'user{i}', email=email, first_name='First', last_name='Last')
+        user.password_hash = 'x'
+        users.append(user)
+    meeting = Meeting(title='Board', date=date(2030, 1, 1), time=dtime(10, 0))
+    meeting.attendees = users
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
+
+
+def test_chunk_recipients_drops_duplicates_and_blanks():
+    chunks = EmailService.chunk_recipients(['a', 'b', '', 'a', 'c', None, 'd'], 2)
+
+    assert chunks == [['a', 'b'], ['c', 'd']]
+    assert EmailService.chunk_recipients(['a', 'b'], 0) == [['a'], ['b']]
+
+
+def test_bulk_email_sends_bcc_envelopes(app, mail_config):
+    with mail.record_messages() as outbox:
+        summary = EmailService.send_bulk_email(addresses(7), 'Hello', 'Body')
+
+    assert len(outbox) == 3
+    assert sorted(len(m.bcc) for m in outbox) == [1, 3, 3]
+    assert all(m.recipients == [] for m in outbox)
+    assert sorted(a for m in outbox for a in m.bcc) == sorted(addresses(7))
+    assert summary['chunks'] == 3
+    assert summary['delivered'] == 7
+    assert summary['chunks_failed'] == 0
+
+
+def test_failed_chunk_is_retried_without_sleeping(app, mail_config, flaky_send, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: pytest.fail('slept while sending'))
+    flaky_send['user0@example.org'] = 1
+
+    with mail.record_messages() as outbox:
+        summary = EmailService.send_bulk_email(addresses(6), 'Hello', 'Body')
+
+    assert len(outbox) == 2
+    assert summary['delivered'] == 6
+    assert summary['attempts'] == 3
+
+
+def test_summary_has_counts_but_no_addresses(app, mail_config, flaky_send):
+    flaky_send['user0@example.org'] = 2  # Exhausts the retry
+
+    summary = EmailService.send_bulk_email(addresses(5), 'Hello', 'Body')
+
+    assert summary['chunks_failed'] == 1
+    assert summary['failed'] == 3
+    assert summary['delivered'] == 2
+    assert 'example.org' not in repr(summary)
+
+
+def test_reminder_keeps_the_invitation_summary(app, db, mail_config):
+    meeting = make_meeting(db, 4)
+
+    assert EmailService.send_meeting_created(meeting)
+    assert EmailService.send_meeting_reminder(meeting, 1)
+
+    db.session.expire_all()
+    saved = db.session.get(Meeting, meeting.id).notification_summary
+    assert set(saved) == {'invitation', 'reminder'}
+    assert saved['invitation']['subject'] == 'Meeting Invitation: Board'
+    assert saved['reminder']['delivered'] == 4
+    assert 'example.org' not in repr(saved)
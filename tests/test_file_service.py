@@ -0,0 +1,138 @@
+import hashlib
+import io
+import os
+import threading
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from app.models.media import StoredFile
+from app.models.user import User
+from app.services import file_service
+from app.services.file_service import FileService
+
+
+@pytest.fixture
+def image_pool(app, monkeypatch):
+    """A real image process pool, shut down after the test"""
+    app.config['IMAGE_PROCESS_WORKERS'] = 1
+    monkeypatch.setattr(file_service, '_image_pool', None)
+    monkeypatch.setattr(file_service, '_finish_pool', None)
+    yield
+    if file_service._image_pool is not None:
+        file_service._image_pool.shutdown()
+        file_service._finish_pool.shutdown()
+
+
+def store(tmp_path, data):
+    """Hand a temp file with data to content-addressed storage, as an upload does"""
+    src = tmp_path / f'{len(os.listdir(tmp_path))}.tmp'
+    src.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+    return FileService._store_content_addressed(str(src), digest, len(data), 'agendas', 'pdf')
+
+
+def ref_count(db, relative_path):
+    db.session.expire_all()
+    stored = StoredFile.query.filter_by(path=relative_path).first()
+    return stored.ref_count if stored else 0
+
+
+@pytest.fixture
+def shared_agenda(db, storage, tmp_path):
+    """The same agenda uploaded twice (two references, committed)"""
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+    first = store(scratch, b'%PDF-1.4 same bytes')
+    db.session.commit()
+    second = store(scratch, b'%PDF-1.4 same bytes')
+    db.session.commit()
+    assert first == second
+    return first
+
+
+def upload_picture(db, user):
+    buffer = io.BytesIO()
+    Image.new('RGB', (900, 600), 'navy').save(buffer, 'PNG')
+    buffer.seek(0)
+    relative_path, error = FileService.save_profile_picture(FileStorage(buffer, 'me.png'), user.id)
+    assert error is None
+    user.profile.profile_picture = relative_path
+    db.session.commit()
+    return relative_path
+
+
+def test_profile_variants_are_stored_off_the_pool_thread(app, db, storage, auth_headers, image_pool, monkeypatch):
+    user = User.query.filter_by(username='admin').one()
+    relative_path = upload_picture(db, user)
+
+    threads = []
+    apply = FileService._apply_profile_variants
+    monkeypatch.setattr(FileService, '_apply_profile_variants', staticmethod(
+        lambda *args: threads.append(threading.current_thread().name) or apply(*args)
+    ))
+
+    FileService.process_profile_picture(user.id, relative_path).result(timeout=30)
+
+    assert threads[0].startswith('media-finish')
+    db.session.expire_all()
+    variants = user.profile.profile_picture_variants
+    assert set(variants) == {'64', '256', '800'}
+    assert user.profile.profile_picture == variants['800']['jpeg']
+    assert storage.exists(variants['64']['webp'])
+    assert not storage.exists(relative_path)
+
+
+def test_failed_pool_job_fails_the_returned_future(app, db, storage, auth_headers, image_pool):
+    user = User.query.filter_by(username='admin').one()
+    relative_path = upload_picture(db, user)
+    with open(storage.path(relative_path), 'wb') as f:
+        f.write(b'not an image any more')
+
+    future = FileService.process_profile_picture(user.id, relative_path)
+
+    assert future.exception(timeout=30) is not None
+    db.session.expire_all()
+    assert user.profile.profile_picture == relative_path
+
+
+def test_same_content_is_stored_once_with_two_references(db, storage, tmp_path, shared_agenda):
+    assert ref_count(db, shared_agenda) == 2
+    assert os.listdir(storage.path('agendas')) == [os.path.basename(shared_agenda)]
+    assert os.listdir(tmp_path / 'scratch') == []
+
+
+def test_releasing_one_reference_keeps_the_file(db, storage, shared_agenda):
+    assert FileService.delete_file(shared_agenda)
+    db.session.commit()
+
+    assert ref_count(db, shared_agenda) == 1
+    assert storage.exists(shared_agenda)
+
+
+def test_rolled_back_release_keeps_the_file(db, storage, shared_agenda):
+    FileService.delete_file(shared_agenda)
+    db.session.commit()
+
+    FileService.delete_file(shared_agenda)
+    db.session.rollback()
+
+    assert ref_count(db, shared_agenda) == 1
+    assert storage.exists(shared_agenda)
+    # Nothing left queued for the next commit either
+    db.session.commit()
+    assert storage.exists(shared_agenda)
+
+
+def test_last_release_deletes_the_file_after_commit(db, storage, shared_agenda):
+    FileService.delete_file(shared_agenda)
+    db.session.commit()
+
+    FileService.delete_file(shared_agenda)
+    db.session.flush()
+    assert storage.exists(shared_agenda)
+
+    db.session.commit()
+    assert ref_count(db, shared_agenda) == 0
+    assert not storage.exists(shared_agenda)
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import time
+from datetime import date, datetime, timedelta, time as dtime
+
+import pytest
+
+from app.models.media import AgendaText, StoredFile
+from app.models.meeting import Meeting
+from app.services.file_service import FileService
+from app.services.media_gc_service import MediaGCService
+from tests.conftest import put_media
+
+DAY = 86400
+
+
+@pytest.fixture(autouse=True)
+def gc_periods(app):
+    app.config['MEDIA_GC_GRACE_PERIOD'] = DAY
+    app.config['MEDIA_GC_QUARANTINE_PERIOD'] = 7 * DAY
+
+
+def put(storage, key, data=b'data', age=2 * DAY):
+    """Store a file with its mtime age seconds in the past"""
+    put_media(storage, key, data)
+    mtime = time.time() - age
+    os.utime(storage.path(key), (mtime, mtime))
+    return key
+
+
+def store_agenda(storage, tmp_path, data):
+    """Content-addressed agenda as an upload stores it (one reference)"""
+    src = tmp_path / f'{len(os.listdir(tmp_path))}.tmp'
+    src.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+    return FileService._store_content_addressed(str(src), digest, len(data), 'agendas', 'pdf')
+
+
+def make_old(db, storage, key, age=2 * DAY):
+    """Backdate a stored file's mtime and last use"""
+    StoredFile.query.filter_by(path=key).update({'last_used_at': datetime.utcnow() - timedelta(seconds=age)})
+    db.session.commit()
+    mtime = time.time() - age
+    os.utime(storage.path(key), (mtime, mtime))
+
+
+def make_meeting(db, agenda=None):
+    meeting = Meeting(title='Board', date=date(2030, 1, 1), time=dtime(10, 0), agenda=agenda)
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
+
+
+def quarantined(storage, key):
+    return storage.exists(MediaGCService.QUARANTINE_PREFIX + key)
+
+
+def test_unreferenced_old_files_are_quarantined(db, storage):
+    orphan = put(storage, 'profile_pics/' + 'a' * 32 + '.jpg')
+    young = put(storage, 'profile_pics/' + 'b' * 32 + '.jpg', age=60)
+    agenda = put(storage, 'agendas/' + 'c' * 64 + '.pdf')
+    preview = put(storage, 'agendas/' + 'c' * 64 + '_preview.png')
+    make_meeting(db, agenda=agenda)
+
+    stats = MediaGCService.run()
+
+    assert stats['quarantined'] == 1
+    assert quarantined(storage, orphan) and not storage.exists(orphan)
+    assert storage.exists(young) and storage.exists(agenda) and storage.exists(preview)
+
+
+def test_deduplicated_agenda_without_meeting_is_kept(db, storage, tmp_path):
+    # Two uploads of the same bytes whose meetings haven't committed yet
+    key = store_agenda(storage, tmp_path, b'%PDF-1.4 shared')
+    assert store_agenda(storage, tmp_path, b'%PDF-1.4 shared') == key
+    db.session.add(AgendaText(path=key, content='shared agenda'))
+    db.session.commit()
+    make_old(db, storage, key)
+
+    assert StoredFile.query.filter_by(path=key).one().ref_count == 2
+    MediaGCService.run()
+
+    assert storage.exists(key) and not quarantined(storage, key)
+    assert AgendaText.query.filter_by(path=key).count() == 1
+
+
+def test_recently_used_stored_file_is_kept_regardless_of_mtime(db, storage, tmp_path):
+    key = store_agenda(storage, tmp_path, b'%PDF-1.4 reused')
+    db.session.commit()
+    make_old(db, storage, key)
+    # Last reference dropped a moment ago (row not yet removed)
+    StoredFile.query.filter_by(path=key).update({'ref_count': 0, 'last_used_at': datetime.utcnow()})
+    db.session.commit()
+
+    MediaGCService.run()
+    assert storage.exists(key)
+
+    make_old(db, storage, key)
+    MediaGCService.run()
+    assert quarantined(storage, key)
+
+
+def test_quarantine_keeps_records_and_restore_brings_file_back(app, db, storage, tmp_path):
+    key = store_agenda(storage, tmp_path, b'%PDF-1.4 restored')
+    StoredFile.query.filter_by(path=key).update({'ref_count': 0})
+    db.session.add(AgendaText(path=key, content='restored agenda'))
+    db.session.commit()
+    make_old(db, storage, key)
+
+    MediaGCService.run()
+    assert quarantined(storage, key)
+    assert StoredFile.query.filter_by(path=key).count() == 1
+    assert AgendaText.query.filter_by(path=key).count() == 1
+
+    # Referenced again before the quarantine period ends
+    make_meeting(db, agenda=key)
+    app.config['MEDIA_GC_QUARANTINE_PERIOD'] = 0
+    stats = MediaGCService.run()
+
+    assert stats['restored'] == 1
+    assert storage.exists(key) and not quarantined(storage, key)
+    assert AgendaText.query.filter_by(path=key).one().content == 'restored agenda'
+
+
+def test_purge_deletes_file_and_releases_records(app, db, storage, tmp_path):
+    key = store_agenda(storage, tmp_path, b'%PDF-1.4 purged')
+    StoredFile.query.filter_by(path=key).update({'ref_count': 0})
+    db.session.add(AgendaText(path=key, content='purged agenda'))
+    db.session.commit()
+    make_old(db, storage, key)
+    MediaGCService.run()
+
+    app.config['MEDIA_GC_QUARANTINE_PERIOD'] = 0
+    stats = MediaGCService.run()
+
+    assert stats['purged'] == 1
+    assert not storage.exists(key) and not quarantined(storage, key)
+    assert StoredFile.query.filter_by(path=key).count() == 0
+    assert AgendaText.query.filter_by(path=key).count() == 0
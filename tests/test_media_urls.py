@@ -0,0 +1,93 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.services.file_service import FileService
+from tests.conftest import put_media
+
+PICTURE = 'profile_pics/' + 'a' * 32 + '_256.jpg'
+AGENDA = 'agendas/' + 'b' * 64 + '.pdf'
+
+
+@pytest.fixture
+def media(storage):
+    put_media(storage, PICTURE, b'jpeg bytes')
+    put_media(storage, AGENDA, b'%PDF-1.4 agenda')
+    return storage
+
+
+def signed_url(app, path):
+    with app.test_request_context():
+        url = urlsplit(FileService.get_file_url(path))
+    return url.path, {key: values[0] for key, values in parse_qs(url.query).items()}
+
+
+def test_signed_url_needs_no_jwt(app, client, media):
+    path, params = signed_url(app, AGENDA)
+
+    response = client.get(path, query_string=params)
+
+    assert response.status_code == 200
+    assert response.data == b'%PDF-1.4 agenda'
+    # Unsigned requests still need a token
+    assert client.get(path).status_code == 401
+
+
+def test_signed_agenda_is_private(app, client, media):
+    path, params = signed_url(app, AGENDA)
+
+    cache_control = client.get(path, query_string=params).cache_control
+
+    assert cache_control.private and not cache_control.public
+    assert not cache_control.immutable
+    assert 0 < cache_control.max_age <= int(params['expires']) - int(time.time())
+
+
+def test_signed_profile_picture_is_public_until_expiry(app, client, media):
+    path, params = signed_url(app, PICTURE)
+
+    cache_control = client.get(path, query_string=params).cache_control
+
+    assert cache_control.public and not cache_control.private
+    assert 0 < cache_control.max_age <= int(params['expires']) - int(time.time())
+
+
+def test_authenticated_immutable_file_is_cached_privately(client, media, auth_headers):
+    cache_control = client.get('/media/' + AGENDA, headers=auth_headers).cache_control
+
+    assert cache_control.private and cache_control.immutable
+    assert cache_control.max_age == 31536000
+
+
+def test_expired_signature_is_rejected(app, client, media):
+    expires = int(time.time()) - 1
+    with app.app_context():
+        sig = FileService.sign_media_path(AGENDA, expires)
+
+    response = client.get('/media/' + AGENDA, query_string={'expires': expires, 'sig': sig})
+
+    assert response.status_code == 403
+    assert response.json['code'] == 'INVALID_MEDIA_SIGNATURE'
+
+
+def test_signature_does_not_carry_over_to_another_path(app, client, media):
+    _, params = signed_url(app, PICTURE)
+
+    response = client.get('/media/' + AGENDA, query_string=params)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize('change', ['sig', 'expires'])
+def test_wrong_signature_is_rejected(app, client, media, change):
+    path, params = signed_url(app, AGENDA)
+    if change == 'sig':
+        params['sig'] = 'A' * 24  # Well-formed but wrong
+    else:
+        params['expires'] = str(int(params['expires']) + 1)  # Extended expiry
+
+    response = client.get(path, query_string=params)
+
+    assert response.status_code == 403
+    assert response.json['code'] == 'INVALID_MEDIA_SIGNATURE'
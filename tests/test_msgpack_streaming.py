@@ -0,0 +1,45 @@
+import pytest
+
+msgpack = pytest.importorskip('msgpack')
+
+from app.models.user import User
+from app.utils.response import streaming_paginated_response
+
+
+@pytest.fixture
+def users(db):
+    for i in range(25):
+        user = User(username=f'user{i:02d}', email=f'user{i:02d}@example.org', first_name='First', last_name=f'Last{i:02d}')
+        user.password_hash = 'x'
+        db.session.add(user)
+    db.session.commit()
+    return User.query.order_by(User.username)
+
+
+def stream(app, query, accept, page=1, per_page=10, total=None):
+    with app.test_request_context(headers={'Accept': accept}):
+        response, status = streaming_paginated_response(
+            query, lambda user: user.to_dict(), page=page, per_page=per_page,
+            total=query.count() if total is None else total, chunk_size=4,
+        )
+        assert response.is_streamed
+        return response.mimetype, response.get_data()
+
+
+@pytest.mark.parametrize('page', [1, 3, 4])
+def test_msgpack_stream_matches_json_stream(app, users, page):
+    json_type, json_body = stream(app, users, 'application/json', page=page)
+    msgpack_type, msgpack_body = stream(app, users, 'application/msgpack', page=page)
+
+    assert (json_type, msgpack_type) == ('application/json', 'application/msgpack')
+    assert msgpack.unpackb(msgpack_body) == app.json.loads(json_body)
+
+
+def test_msgpack_stream_stays_well_formed_when_rows_change(app, users):
+    # Counted before rows were added: the page is cut at the counted size
+    _, body = stream(app, users, 'application/msgpack', page=3, total=22)
+    assert [item['username'] for item in msgpack.unpackb(body)['data']['items']] == ['user20', 'user21']
+
+    # Counted before rows were deleted: missing items are nil
+    _, body = stream(app, users, 'application/msgpack', page=3, total=28)
+    assert msgpack.unpackb(body)['data']['items'][5:] == [None] * 3
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+from PyPDF2 import PdfReader
+
+from app.services.pdf_inspector import PdfInspector
+
+
+def build_pdf(pages, revisions=0):
+    """A minimal PDF, optionally with incremental updates re-emitting page 1"""
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+
+    def write(number, body):
+        offsets[number] = len(out)
+        out.extend(f'{number} 0 obj\n{body}\nendobj\n'.encode())
+
+    def write_xref(numbers, size, prev=None):
+        xref = len(out)
+        out.extend(b'xref\n0 1\n0000000000 65535 f \n' if prev is None else b'xref\n')
+        for number in numbers:
+            out.extend(f'{number} 1\n{offsets[number]:010d} 00000 n \n'.encode())
+        trailer = f'/Size {size} /Root 1 0 R' + (f' /Prev {prev}' if prev is not None else '')
+        out.extend(f'trailer\n<< {trailer} >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+        return xref
+
+    kids = ' '.join(f'{3 + i} 0 R' for i in range(pages))
+    write(1, '<< /Type /Catalog /Pages 2 0 R >>')
+    write(2, f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>')
+    for i in range(pages):
+        write(3 + i, '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>')
+    xref = write_xref(range(1, 3 + pages), 3 + pages)
+
+    for revision in range(revisions):
+        write(3, f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Rotate {90 * (revision + 1)} >>')
+        xref = write_xref([3], 3 + pages, prev=xref)
+    return bytes(out)
+
+
+def inspect(data, chunk_size):
+    inspector = PdfInspector()
+    for start in range(0, len(data), chunk_size):
+        inspector.feed(data[start:start + chunk_size])
+    return inspector
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64 * 1024])
+@pytest.mark.parametrize('pages, revisions', [(1, 0), (1, 3), (5, 2), (300, 0)])
+def test_page_count_matches_pypdf(pages, revisions, chunk_size):
+    data = build_pdf(pages, revisions)
+
+    assert inspect(data, chunk_size).page_count == len(PdfReader(io.BytesIO(data)).pages) == pages
+
+
+def test_trailer_is_found_after_chunked_feed(tmp_path):
+    data = build_pdf(2, revisions=1)
+    path = tmp_path / 'agenda.pdf'
+    path.write_bytes(data)
+
+    inspector = inspect(data, 13)
+
+    assert inspector.header_ok
+    assert inspector.validate(str(path)) is None
@@ -0,0 +1,85 @@
+import pytest
+from PIL import Image
+from PyPDF2 import PdfReader
+
+from app.services.pdf_preview import _text_runs, extract_text, inspect_agenda, render_first_page
+from tests.test_pdf_inspector import build_pdf
+
+
+def build_text_pdf(pages_lines):
+    """A PDF with one Helvetica text line per entry (the first 24pt, the rest 12pt)"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>']
+    font = 3 + 2 * len(pages_lines)
+    kids = ' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages_lines)))
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(pages_lines)} >>')
+    for i, lines in enumerate(pages_lines):
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+            f'/Resources << /Font << /F1 {font} 0 R >> >> >>'
+        )
+        content = ''.join(
+            f'BT /F1 {24 if j == 0 else 12} Tf 72 {720 - 30 * j} Td ({line}) Tj ET\n'
+            for j, line in enumerate(lines)
+        )
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}endstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out.extend(f'{number} 0 obj\n{body}\nendobj\n'.encode())
+    xref = len(out)
+    out.extend(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode())
+    out.extend(''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode())
+    out.extend(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return bytes(out)
+
+
+@pytest.fixture
+def agenda(tmp_path):
+    path = tmp_path / 'agenda.pdf'
+    path.write_bytes(build_text_pdf([['Faculty Board', 'Budget review'], ['Any other business']]))
+    return str(path)
+
+
+def test_text_runs_have_position_size_and_text(agenda):
+    runs = _text_runs(PdfReader(agenda).pages[0])
+
+    assert [(x, y, size, text) for x, y, size, text in runs] == [
+        (72, 720, 24, 'Faculty Board'),
+        (72, 690, 12, 'Budget review'),
+    ]
+
+
+def test_extract_text_reads_every_page_up_to_max_chars(agenda):
+    reader = PdfReader(agenda)
+
+    text = extract_text(reader, 10_000)
+    assert 'Faculty Board' in text and 'Budget review' in text
+    assert 'Any other business' in text
+    assert extract_text(reader, 7) == 'Faculty'
+
+
+def test_inspect_agenda_renders_preview_and_text(agenda, tmp_path):
+    dest = tmp_path / 'preview.png'
+
+    info = inspect_agenda(agenda, str(dest), width=306)
+
+    assert info['page_count'] == 2
+    assert (info['width'], info['height']) == (306, 396)
+    assert 'Budget review' in info['text']
+    with Image.open(dest) as preview:
+        assert preview.size == (306, 396)
+        # Text was drawn near the top left, not a blank page
+        lo, hi = preview.convert('L').crop((0, 0, 153, 80)).getextrema()
+        assert lo < 128 and hi == 255
+
+
+def test_preview_follows_page_rotation(tmp_path):
+    src = tmp_path / 'rotated.pdf'
+    src.write_bytes(build_pdf(1, revisions=1))  # Page 1 re-emitted with /Rotate 90
+
+    info = render_first_page(str(src), str(tmp_path / 'preview.png'), width=306)
+
+    assert (info['width'], info['height']) == (396, 306)
@@ -0,0 +1,34 @@
+from sqlalchemy import event
+
+from app.models.user import User
+
+
+def count_queries(db):
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_cached_reference_data_revalidates_with_only_the_active_check(db, client, auth_headers):
+    first = client.get('/api/departments/faculties', headers=auth_headers)
+    assert first.status_code == 200
+
+    statements = count_queries(db)
+    response = client.get(
+        '/api/departments/faculties', headers={**auth_headers, 'If-None-Match': first.headers['ETag']}
+    )
+
+    assert response.status_code == 304
+    assert len(statements) == 1
+
+
+def test_deactivated_user_cannot_read_reference_data(db, client, auth_headers):
+    assert client.get('/api/departments/titles', headers=auth_headers).status_code == 200
+
+    User.query.filter_by(username='admin').update({'is_active': False})
+    db.session.commit()
+
+    for path in ('/api/departments/titles', '/api/departments/faculties', '/api/departments/bootstrap'):
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 401
+        assert response.json['code'] == 'INVALID_USER'
@@ -0,0 +1,163 @@
+import os
+import urllib.request
+
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto_server = pytest.importorskip('moto.server')
+
+from app.services.disk_cache import DiskCache
+from app.services.file_service import FileService
+from app.services.storage import LocalStorage, S3Storage, StorageBackend
+
+CREDENTIALS = {'region': 'us-east-1', 'access_key': 'test', 'secret_key': 'test'}
+
+
+@pytest.fixture(scope='module')
+def s3_endpoint():
+    """A moto S3 server on localhost (a local stand-in for the bucket)"""
+    server = moto_server.ThreadedMotoServer(ip_address='127.0.0.1', port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f'http://{host}:{port}'
+    server.stop()
+
+
+@pytest.fixture
+def bucket(s3_endpoint, request):
+    name = request.node.name.replace('_', '-')[:63].lower()
+    client = boto3.client(
+        's3', endpoint_url=s3_endpoint, region_name=CREDENTIALS['region'],
+        aws_access_key_id=CREDENTIALS['access_key'], aws_secret_access_key=CREDENTIALS['secret_key'],
+    )
+    client.create_bucket(Bucket=name)
+    return client, name
+
+
+@pytest.fixture
+def storage(bucket, s3_endpoint, tmp_path):
+    _, name = bucket
+    cache = DiskCache(str(tmp_path / 'cache'), 10 * 1024 * 1024)
+    return S3Storage(name, cache, key_prefix='media/', endpoint_url=s3_endpoint, **CREDENTIALS)
+
+
+def scratch_file(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_partial_backend_fails_at_construction():
+    class WriteOnly(StorageBackend):
+        def put_file(self, key, src_path):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnly()
+
+
+def test_put_file_uploads_and_seeds_cache(storage, bucket, tmp_path):
+    client, name = bucket
+    src = scratch_file(tmp_path, 'upload.tmp', b'%PDF-1.4 agenda')
+
+    storage.put_file('agendas/a.pdf', src)
+
+    assert not os.path.exists(src)
+    head = client.head_object(Bucket=name, Key='media/agendas/a.pdf')
+    assert head['ContentType'] == 'application/pdf'
+    # Served from the seeded cache: still readable after the object is gone
+    client.delete_object(Bucket=name, Key='media/agendas/a.pdf')
+    path = storage.cached_path('agendas/a.pdf')
+    assert path is not None and storage.local_path('agendas/a.pdf') == path
+    with open(path, 'rb') as f:
+        assert f.read() == b'%PDF-1.4 agenda'
+
+
+def test_local_path_reads_through_cache(storage, bucket):
+    client, name = bucket
+    client.put_object(Bucket=name, Key='media/profile_pics/p.jpg', Body=b'jpeg bytes')
+
+    assert storage.cached_path('profile_pics/p.jpg') is None
+    path = storage.local_path('profile_pics/p.jpg')
+    with open(path, 'rb') as f:
+        assert f.read() == b'jpeg bytes'
+    assert storage.cached_path('profile_pics/p.jpg') == path
+    assert storage.local_path('profile_pics/missing.jpg') is None
+
+
+def test_open_streams_object_body(storage, tmp_path):
+    storage.put_file('agendas/b.pdf', scratch_file(tmp_path, 'b.tmp', b'x' * 200_000))
+
+    with storage.open('agendas/b.pdf') as body:
+        assert body.read() == b'x' * 200_000
+    with pytest.raises(FileNotFoundError):
+        storage.open('agendas/missing.pdf')
+
+
+def test_list_pages_by_key(storage, tmp_path):
+    for name in ('c.jpg', 'a.jpg', 'b.jpg'):
+        storage.put_file(f'profile_pics/{name}', scratch_file(tmp_path, name, name.encode()))
+    storage.put_file('agendas/x.pdf', scratch_file(tmp_path, 'x.pdf', b'pdf'))
+
+    first = storage.list('profile_pics/', limit=2)
+    rest = storage.list('profile_pics/', start_after=first[-1].key)
+
+    assert [o.key for o in first] == ['profile_pics/a.jpg', 'profile_pics/b.jpg']
+    assert [o.key for o in rest] == ['profile_pics/c.jpg']
+    assert first[0].size == len(b'a.jpg')
+
+
+def test_move_and_delete(storage, tmp_path):
+    storage.put_file('profile_pics/old.jpg', scratch_file(tmp_path, 'old.jpg', b'img'))
+
+    storage.move('profile_pics/old.jpg', '.quarantine/profile_pics/old.jpg')
+
+    assert not storage.exists('profile_pics/old.jpg')
+    assert storage.cached_path('profile_pics/old.jpg') is None
+    assert storage.stat('.quarantine/profile_pics/old.jpg').size == 3
+
+    storage.delete('.quarantine/profile_pics/old.jpg')
+    storage.delete('.quarantine/profile_pics/old.jpg')  # Missing keys are ignored
+    assert not storage.exists('.quarantine/profile_pics/old.jpg')
+
+
+def test_presigned_url_downloads_object(storage, tmp_path):
+    storage.put_file('agendas/c.pdf', scratch_file(tmp_path, 'c.pdf', b'%PDF-1.4 c'))
+
+    url = storage.presigned_url('agendas/c.pdf', 60)
+
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == b'%PDF-1.4 c'
+
+
+def test_media_is_streamed_or_redirected(app, storage, tmp_path):
+    app.extensions['storage'] = storage
+    storage.put_file('agendas/' + 'd' * 64 + '.pdf', scratch_file(tmp_path, 'd.pdf', b'%PDF-1.4 d'))
+    storage.cache.discard('agendas/' + 'd' * 64 + '.pdf')
+    with app.test_request_context():
+        url = FileService.get_file_url('agendas/' + 'd' * 64 + '.pdf')
+    path = url.split('localhost', 1)[1]
+    client = app.test_client()
+
+    app.config['S3_PRESIGNED_DOWNLOADS'] = True
+    response = client.get(path)
+    assert response.status_code == 302
+    assert storage.bucket in response.headers['Location']
+
+    app.config['S3_PRESIGNED_DOWNLOADS'] = False
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.data == b'%PDF-1.4 d'
+    assert response.mimetype == 'application/pdf'
+    # Streamed, not downloaded into the cache
+    assert storage.cached_path('agendas/' + 'd' * 64 + '.pdf') is None
+
+    response = client.get(path, headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+
+def test_local_storage_rejects_traversal(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        storage.path('../outside.txt')
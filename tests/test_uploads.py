@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from app.models.media import UploadSession
+from app.models.user import User
+from app.services.file_service import FileService
+from app.services.upload_service import UploadService
+from tests.test_pdf_inspector import build_pdf
+
+PDF = build_pdf(3)
+
+
+@pytest.fixture
+def upload(client, auth_headers, storage):
+    """Start an agenda upload and return its id"""
+    response = client.post('/api/uploads', json={'filename': 'agenda.pdf', 'size': len(PDF)}, headers=auth_headers)
+    assert response.status_code == 201
+    assert response.json['data']['offset'] == 0
+    return response.json['data']['upload_id']
+
+
+def put_chunk(client, auth_headers, upload_id, offset, data):
+    return client.put(
+        f'/api/uploads/{upload_id}?offset={offset}', data=data,
+        headers={**auth_headers, 'Content-Type': 'application/octet-stream'}
+    )
+
+
+def send_all(client, auth_headers, upload_id):
+    assert put_chunk(client, auth_headers, upload_id, 0, PDF).status_code == 200
+    response = client.post(f'/api/uploads/{upload_id}/complete', headers=auth_headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_wrong_offset_returns_409_with_the_offset_to_resume_from(client, auth_headers, upload):
+    half = len(PDF) // 2
+    assert put_chunk(client, auth_headers, upload, 0, PDF[:half]).json['data']['offset'] == half
+
+    response = put_chunk(client, auth_headers, upload, 0, PDF[:half])
+
+    assert response.status_code == 409
+    assert response.json['code'] == 'OFFSET_MISMATCH'
+    assert response.headers['Upload-Offset'] == str(half)
+
+
+def test_interrupted_upload_resumes_and_completes(client, auth_headers, upload):
+    half = len(PDF) // 2
+    put_chunk(client, auth_headers, upload, 0, PDF[:half])
+
+    status = client.get(f'/api/uploads/{upload}', headers=auth_headers).json['data']
+    response = put_chunk(client, auth_headers, upload, status['offset'], PDF[status['offset']:])
+    assert response.json['data']['offset'] == len(PDF)
+
+    response = client.post(f'/api/uploads/{upload}/complete', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json['data']['status'] == UploadSession.STATUS_COMPLETE
+    assert response.json['data']['page_count'] == 3
+    with open(UploadService.temp_path(upload), 'rb') as f:
+        assert f.read() == PDF
+
+
+def test_complete_rejects_missing_bytes(client, auth_headers, upload):
+    put_chunk(client, auth_headers, upload, 0, PDF[:10])
+
+    response = client.post(f'/api/uploads/{upload}/complete', headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_delete_discards_session_and_data(client, auth_headers, upload):
+    response = client.delete(f'/api/uploads/{upload}', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert client.get(f'/api/uploads/{upload}', headers=auth_headers).status_code == 404
+    assert not os.path.exists(UploadService.temp_path(upload))
+
+
+def test_attached_upload_is_kept_until_the_transaction_commits(app, db, client, auth_headers, storage, upload):
+    send_all(client, auth_headers, upload)
+    user_id = User.query.filter_by(username='admin').one().id
+
+    relative_path, error = FileService.save_agenda_from_upload(upload, user_id)
+    assert error is None
+    db.session.rollback()
+
+    # Still there to attach again
+    assert os.path.exists(UploadService.temp_path(upload))
+    relative_path, error = FileService.save_agenda_from_upload(upload, user_id)
+    assert error is None
+    assert os.path.exists(UploadService.temp_path(upload))
+    db.session.commit()
+
+    assert not os.path.exists(UploadService.temp_path(upload))
+    assert db.session.get(UploadSession, upload) is None
+    with storage.open(relative_path) as f:
+        assert f.read() == PDF
+    assert os.listdir(app.config['UPLOAD_SESSIONS_FOLDER']) == []